@@ -0,0 +1,14 @@
+-- CreateTable
+CREATE TABLE "public"."IndicatorSeriesFingerprint" (
+    "indicatorMetadataId" INTEGER NOT NULL,
+    "fingerprint" VARCHAR(64) NOT NULL,
+    "rowCount" INTEGER NOT NULL,
+    "firstDate" DATE,
+    "lastDate" DATE,
+    "updatedAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "IndicatorSeriesFingerprint_pkey" PRIMARY KEY ("indicatorMetadataId")
+);
+
+-- AddForeignKey
+ALTER TABLE "public"."IndicatorSeriesFingerprint" ADD CONSTRAINT "IndicatorSeriesFingerprint_indicatorMetadataId_fkey" FOREIGN KEY ("indicatorMetadataId") REFERENCES "public"."IndicatorMetadata"("id") ON DELETE CASCADE ON UPDATE CASCADE;
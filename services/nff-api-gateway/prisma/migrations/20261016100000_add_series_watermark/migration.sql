@@ -0,0 +1,10 @@
+-- CreateTable
+CREATE TABLE "public"."SeriesWatermark" (
+    "source" VARCHAR(50) NOT NULL,
+    "seriesId" VARCHAR(100) NOT NULL,
+    "lastObservationDate" DATE,
+    "upstreamLastUpdated" VARCHAR(50),
+    "updatedAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "SeriesWatermark_pkey" PRIMARY KEY ("source","seriesId")
+);
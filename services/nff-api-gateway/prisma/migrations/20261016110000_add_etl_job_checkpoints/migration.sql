@@ -0,0 +1,20 @@
+-- AlterTable
+ALTER TABLE "public"."ETLJob" ADD COLUMN     "heartbeatAt" TIMESTAMP(3),
+ADD COLUMN     "ownerId" VARCHAR(100);
+
+-- CreateTable
+CREATE TABLE "public"."ETLJobItem" (
+    "jobId" VARCHAR(50) NOT NULL,
+    "indicatorId" INTEGER NOT NULL,
+    "status" VARCHAR(20) NOT NULL DEFAULT 'PENDING',
+    "attempts" INTEGER NOT NULL DEFAULT 0,
+    "errorMessage" TEXT,
+    "startedAt" TIMESTAMP(3),
+    "completedAt" TIMESTAMP(3),
+    "updatedAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "ETLJobItem_pkey" PRIMARY KEY ("jobId","indicatorId")
+);
+
+-- CreateIndex
+CREATE INDEX "ETLJobItem_jobId_status_idx" ON "public"."ETLJobItem"("jobId", "status");
@@ -0,0 +1,3 @@
+-- AlterTable
+ALTER TABLE "public"."ETLJobItem" ADD COLUMN     "leaseExpiresAt" TIMESTAMP(3),
+ADD COLUMN     "leaseOwner" VARCHAR(100);
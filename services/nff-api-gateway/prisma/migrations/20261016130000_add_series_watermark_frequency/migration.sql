@@ -0,0 +1,2 @@
+-- AlterTable
+ALTER TABLE "public"."SeriesWatermark" ADD COLUMN     "frequency" VARCHAR(10);
@@ -0,0 +1,14 @@
+-- CreateTable
+CREATE TABLE "public"."UpstreamSeriesCache" (
+    "source" VARCHAR(50) NOT NULL,
+    "seriesId" VARCHAR(100) NOT NULL,
+    "startDate" DATE NOT NULL,
+    "endDate" DATE NOT NULL,
+    "upstreamLastUpdated" VARCHAR(50) NOT NULL,
+    "contentHash" VARCHAR(64) NOT NULL,
+    "recordCount" INTEGER NOT NULL,
+    "payload" BYTEA NOT NULL,
+    "fetchedAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "UpstreamSeriesCache_pkey" PRIMARY KEY ("source","seriesId","startDate","endDate")
+);
@@ -0,0 +1,14 @@
+-- CreateTable
+CREATE TABLE "public"."CalculationState" (
+    "indicatorId" INTEGER NOT NULL,
+    "calculationKey" VARCHAR(64) NOT NULL,
+    "lastOutputDate" DATE NOT NULL,
+    "lastOutputValue" DOUBLE PRECISION NOT NULL,
+    "payload" BYTEA NOT NULL,
+    "updatedAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "CalculationState_pkey" PRIMARY KEY ("indicatorId")
+);
+
+-- AddForeignKey
+ALTER TABLE "public"."CalculationState" ADD CONSTRAINT "CalculationState_indicatorId_fkey" FOREIGN KEY ("indicatorId") REFERENCES "public"."IndicatorMetadata"("id") ON DELETE CASCADE ON UPDATE CASCADE;
@@ -0,0 +1,137 @@
+"""
+API latency under a running ETL job
+
+Probes a running service at a steady rate and compares request latency while it is idle
+with latency while a full category job runs in the same process. With ETL I/O and CPU
+work off the event loop, p99 should stay flat.
+
+Needs a running service with its database (the job really fetches and saves data).
+
+Usage:
+    python benchmarks/api_latency_benchmark.py --category Macro [--base-url http://localhost:8000]
+        [--rate 20] [--idle-seconds 20] [--max-job-seconds 900]
+        [--endpoint /api/v1/health --endpoint /api/v1/indicators?limit=50]
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Dict, List
+
+import httpx
+import numpy as np
+
+DEFAULT_ENDPOINTS = ['/api/v1/health/live', '/api/v1/health', '/api/v1/indicators?limit=50']
+
+# Job statuses that mean it is still running
+RUNNING_STATUSES = ('PENDING', 'PROCESSING', 'RUNNING')
+
+
+async def probe(client: httpx.AsyncClient, endpoints: List[str], rate: float,
+                samples: Dict[str, List[float]], stop: asyncio.Event) -> None:
+    """Request every endpoint `rate` times per second (each on its own task) until stopped"""
+    interval = 1.0 / rate
+
+    async def timed(endpoint: str) -> None:
+        started = time.perf_counter()
+        try:
+            response = await client.get(endpoint)
+            response.raise_for_status()
+        except Exception:
+            samples.setdefault(f"{endpoint} (errors)", []).append(time.perf_counter() - started)
+            return
+        samples.setdefault(endpoint, []).append(time.perf_counter() - started)
+
+    pending = set()
+    next_tick = time.perf_counter()
+    while not stop.is_set():
+        for endpoint in endpoints:
+            task = asyncio.create_task(timed(endpoint))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+        next_tick += interval
+        await asyncio.sleep(max(0.0, next_tick - time.perf_counter()))
+
+    if pending:
+        await asyncio.gather(*pending)
+
+
+async def run_phase(client: httpx.AsyncClient, endpoints: List[str], rate: float, until) -> Dict[str, List[float]]:
+    samples: Dict[str, List[float]] = {}
+    stop = asyncio.Event()
+    prober = asyncio.create_task(probe(client, endpoints, rate, samples, stop))
+    try:
+        await until()
+    finally:
+        stop.set()
+        await prober
+    return samples
+
+
+async def wait_for_job(client: httpx.AsyncClient, job_id: str, max_seconds: float) -> str:
+    deadline = time.monotonic() + max_seconds
+    status = 'UNKNOWN'
+    while time.monotonic() < deadline:
+        await asyncio.sleep(2)
+        response = await client.get(f"/api/v1/etl/jobs/{job_id}")
+        if response.status_code == 200:
+            status = response.json().get('status', 'UNKNOWN')
+            if status.upper() not in RUNNING_STATUSES:
+                return status
+    return f"{status} (still running after {max_seconds:.0f}s)"
+
+
+def report(phase: str, samples: Dict[str, List[float]]) -> Dict[str, float]:
+    print(f"\n{phase}")
+    print(f"  {'endpoint':45} {'n':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    p99 = {}
+    for endpoint, timings in sorted(samples.items()):
+        ms = np.array(timings) * 1000
+        p50, p95, p99[endpoint] = np.percentile(ms, [50, 95, 99])
+        print(f"  {endpoint:45} {len(ms):6d} {p50:9.1f} {p95:9.1f} {p99[endpoint]:9.1f} {ms.max():9.1f}")
+    return p99
+
+
+async def main_async(args) -> None:
+    endpoints = args.endpoint or DEFAULT_ENDPOINTS
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60) as client:
+        idle = await run_phase(client, endpoints, args.rate, lambda: asyncio.sleep(args.idle_seconds))
+
+        response = await client.post(f"/api/v1/etl/category/{args.category}/fetch-all")
+        response.raise_for_status()
+        job = response.json()
+        print(f"Started job {job['job_id']} ({job.get('estimated_indicators')} indicators in '{args.category}')")
+
+        outcome = {}
+
+        async def job_finished():
+            outcome['status'] = await wait_for_job(client, job['job_id'], args.max_job_seconds)
+
+        busy = await run_phase(client, endpoints, args.rate, job_finished)
+        print(f"Job finished with status {outcome['status']}")
+
+    idle_p99 = report(f"Idle ({args.idle_seconds:.0f}s)", idle)
+    busy_p99 = report("During the category job", busy)
+
+    print("\np99 during job / idle p99")
+    for endpoint in endpoints:
+        if endpoint in idle_p99 and endpoint in busy_p99:
+            print(f"  {endpoint:45} {busy_p99[endpoint] / idle_p99[endpoint]:6.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--category', required=True, help='Category whose full fetch runs during the measurement')
+    parser.add_argument('--base-url', default='http://localhost:8000')
+    parser.add_argument('--endpoint', action='append', help='Endpoint to probe (repeatable)')
+    parser.add_argument('--rate', type=float, default=20, help='Requests per second per endpoint')
+    parser.add_argument('--idle-seconds', type=float, default=20)
+    parser.add_argument('--max-job-seconds', type=float, default=900)
+    args = parser.parse_args()
+
+    asyncio.run(main_async(args))
+
+
+if __name__ == '__main__':
+    main()
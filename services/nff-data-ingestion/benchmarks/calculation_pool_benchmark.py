@@ -0,0 +1,148 @@
+"""
+Calculation throughput benchmark: worker thread vs. process pool
+
+Runs one synthetic category's calculations (YoY, moving averages, z-scores, volatility,
+spreads and formulas over daily and monthly series) the ways the ETL can run them, and
+reports calculations per second:
+
+  thread          one calculate_series per indicator via asyncio.to_thread (CALCULATION_EXECUTION_MODE=thread)
+  pool            one calculate_series per indicator in the process pool (CALCULATION_EXECUTION_MODE=process)
+  batch thread    CalculationEngine.calculate_batch over the whole category in a worker thread
+  batch pool      the same batch split across the process pool's workers
+
+Results of every mode are checked against the in-process calculation. The pool only pays
+off with more than one core; run it on the target machine with --workers set to its cores.
+
+Usage:
+    python benchmarks/calculation_pool_benchmark.py [--workers 8] [--indicators 200] [--observations 6000]
+        [--repeat 3]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import numpy as np
+
+from core.calculation_engine import CalculationEngine
+from core.calculation_pool import CalculationPool
+from core.columnar import ColumnarSeries
+
+CALCULATIONS = [
+    'YoY %', '20D z-score', '3-month average', '1Y volatility', 'MA20', 'ΔMoM = t - t-1',
+    'yoy({a})', 'zscore({a}, 60)', '{a} - {b}', 'ratio',
+]
+
+
+def build_requests(indicators: int, observations: int):
+    """Indicator calculations over a shared set of daily and monthly series, as in a category"""
+    rng = np.random.default_rng(7)
+    series = {}
+    for i in range(max(2, indicators // 3)):
+        if i % 2:
+            dates = (np.datetime64('1950-01', 'M') + np.arange(observations // 20)).astype('datetime64[D]')
+        else:
+            dates = np.busday_offset(np.datetime64('2000-01-03', 'D'), np.arange(observations), roll='forward')
+        series[f'S{i}'] = ColumnarSeries(f'S{i}', dates, 100 + np.cumsum(rng.normal(size=len(dates))))
+
+    names = list(series)
+    requests = []
+    for i in range(indicators):
+        a, b = names[i % len(names)], names[(i * 7 + 1) % len(names)]
+        template = CALCULATIONS[i % len(CALCULATIONS)]
+        inputs = {a: series[a], b: series[b]} if '{b}' in template or template == 'ratio' else {a: series[a]}
+        requests.append((template.format(a=a, b=b), inputs, f'I{i}'))
+    return requests
+
+
+def run_single(engine: CalculationEngine, request):
+    try:
+        return engine.calculate_series(request[0], request[1], 'indicator', request[2])
+    except Exception as e:
+        return e
+
+
+async def run_mode(mode: str, pool: CalculationPool, engine: CalculationEngine, requests, workers: int):
+    if mode == 'thread':
+        # The service runs one calculation per ETL worker at a time
+        semaphore = asyncio.Semaphore(workers)
+
+        async def one(request):
+            async with semaphore:
+                return await asyncio.to_thread(run_single, engine, request)
+
+        return await asyncio.gather(*(one(request) for request in requests))
+
+    if mode == 'pool':
+        async def one(request):
+            try:
+                return await pool.calculate(request[1], request[0], request[2])
+            except Exception as e:
+                return e
+
+        return await asyncio.gather(*(one(request) for request in requests))
+
+    if mode == 'batch thread':
+        return await asyncio.to_thread(engine.calculate_batch, requests)
+
+    return await pool.calculate_batch(requests)
+
+
+def same(expected, actual) -> bool:
+    if isinstance(expected, Exception) or isinstance(actual, Exception):
+        return type(expected) is type(actual)
+    return np.array_equal(expected.dates, actual.dates) and np.allclose(
+        expected.values, actual.values, rtol=1e-12, atol=1e-12, equal_nan=True
+    )
+
+
+async def main_async(args) -> None:
+    requests = build_requests(args.indicators, args.observations)
+    engine = CalculationEngine()
+    expected = [run_single(engine, request) for request in requests]
+
+    pool = CalculationPool(size=args.workers)
+    # Start the workers before timing, as the service does at startup
+    await pool.calculate(requests[0][1], requests[0][0], requests[0][2])
+    await asyncio.gather(*(pool.calculate(request[1], request[0], request[2]) for request in requests[:args.workers]))
+
+    print(f"{len(requests)} calculations, {args.workers} workers, {os.cpu_count()} CPUs, best of {args.repeat}")
+    baseline = None
+    try:
+        for mode in ('thread', 'pool', 'batch thread', 'batch pool'):
+            timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                results = await run_mode(mode, pool, engine, requests, args.workers)
+                timings.append(time.perf_counter() - started)
+
+            mismatches = sum(not same(e, r) for e, r in zip(expected, results))
+            best = min(timings)
+            baseline = baseline or best
+            print(
+                f"  {mode:13} {best * 1000:9.1f} ms  {len(requests) / best:9.1f} calc/s  "
+                f"{baseline / best:5.2f}x{'' if not mismatches else f'  ({mismatches} results differ!)'}"
+            )
+    finally:
+        pool.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--indicators', type=int, default=200)
+    parser.add_argument('--observations', type=int, default=6000, help='Observations per daily series')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    asyncio.run(main_async(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+FRED observation parsing microbenchmark
+
+Compares the bulk columnar parser against the former per-observation dict parser on a
+synthetic FRED payload (daily series, every 20th value missing as '.').
+
+Usage:
+    python benchmarks/fred_parsing_benchmark.py [--observations 100000] [--repeat 5] [--skip-baseline]
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pandas as pd
+
+from core.data_fetcher import parse_fred_observations
+
+
+def build_observations(count: int):
+    start = date(1900, 1, 1)
+    return [
+        {
+            'realtime_start': '2026-10-16',
+            'realtime_end': '2026-10-16',
+            'date': (start + timedelta(days=i)).isoformat(),
+            'value': '.' if i % 20 == 0 else f"{100 + (i % 997) * 0.137:.4f}",
+        }
+        for i in range(count)
+    ]
+
+
+def parse_per_observation(observations, sid):
+    """The parser FREDDataFetcher used before: one pd.to_datetime call and one dict per observation"""
+    series_data = []
+    for obs in observations:
+        try:
+            obs_date = pd.to_datetime(obs['date']).date()
+            obs_value = float(obs['value']) if obs['value'] != '.' else None
+
+            if obs_value is not None:
+                series_data.append({'date': obs_date, 'value': obs_value, 'series_id': sid})
+        except (ValueError, KeyError):
+            continue
+    return series_data
+
+
+def best_of(repeat: int, fn, *args):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(*args)
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--observations', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--skip-baseline', action='store_true', help='Only time the columnar parser')
+    args = parser.parse_args()
+
+    observations = build_observations(args.observations)
+    print(f"{args.observations} observations, best of {args.repeat}")
+
+    columnar_time, series = best_of(args.repeat, parse_fred_observations, observations, 'BENCH')
+    print(f"  columnar parser:        {columnar_time * 1000:10.1f} ms  ({len(series)} observations kept)")
+
+    if args.skip_baseline:
+        return
+
+    # The per-observation parser is slow; a single run is enough to compare
+    baseline_time, records = best_of(1, parse_per_observation, observations, 'BENCH')
+    print(f"  per-observation parser: {baseline_time * 1000:10.1f} ms  ({len(records)} observations kept)")
+    print(f"  speed-up:               {baseline_time / columnar_time:10.1f}x")
+
+    assert len(records) == len(series), "parsers disagree on the number of observations"
+
+
+if __name__ == '__main__':
+    main()
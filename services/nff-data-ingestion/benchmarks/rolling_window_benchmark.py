@@ -0,0 +1,144 @@
+"""
+Rolling window benchmark: RollingWindow vs. pandas offset windows
+
+Evaluates the calendar windows the calculations use ("20D", "12W", "3M", "1Y") on
+business-daily, weekly and monthly series, once with core.windows.RollingWindow and once
+with pandas rolling windows over the same spans:
+
+  D on a daily series   pandas.offsets.BDay lower bounds (business days)
+  D, W                  pandas' own offset windows (rolling("<n>D"))
+  M, Y                  pandas.DateOffset(months=...) lower bounds, MonthEnd(...) on month ends
+
+For each series and window it reports the time for mean, std and z-score together and the
+largest difference between the two per statistic. Windows are (start, date] on both sides,
+so the results agree to rounding - z-scores over windows of a few nearly equal values
+amplify that rounding the most.
+
+Usage:
+    python benchmarks/rolling_window_benchmark.py [--years 60] [--series 1] [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import numpy as np
+import pandas as pd
+from pandas.api.indexers import BaseIndexer
+
+from core.windows import RollingWindow, WindowSpec
+
+WINDOWS = [WindowSpec(20, 'D'), WindowSpec(12, 'W'), WindowSpec(3, 'M'), WindowSpec(1, 'Y')]
+
+
+class OffsetIndexer(BaseIndexer):
+    """Windows (lower, date] for lower bounds pandas cannot roll over directly (months, business days)"""
+
+    def __init__(self, index: pd.DatetimeIndex, lower: pd.DatetimeIndex):
+        super().__init__()
+        self.index = index
+        self.lower = lower
+
+    def get_window_bounds(self, num_values=0, min_periods=None, center=None, closed=None, step=None):
+        start = np.minimum(self.index.searchsorted(self.lower, side='right'), np.arange(num_values))
+        return start.astype(np.int64), np.arange(1, num_values + 1, dtype=np.int64)
+
+
+def build_series(frequency: str, years: int, rng) -> pd.Series:
+    """A random walk with gaps, observed on the given frequency's dates"""
+    end = pd.Timestamp('2024-12-31')
+    start = end - pd.DateOffset(years=years)
+    dates = {
+        'business daily': pd.bdate_range(start, end),
+        'weekly': pd.date_range(start, end, freq='W-FRI'),
+        'monthly': pd.date_range(start, end, freq='ME'),
+    }[frequency]
+    values = 100 + np.cumsum(rng.normal(size=len(dates)))
+    values[rng.random(len(dates)) < 0.02] = np.nan
+    return pd.Series(values, index=dates)
+
+
+def pandas_rolling(series: pd.Series, spec: WindowSpec, business_days: bool):
+    index = series.index
+    if spec.unit == 'D' and business_days:
+        return series.rolling(OffsetIndexer(index, index - pd.offsets.BDay(spec.count)), min_periods=1)
+    if spec.unit in ('D', 'W'):
+        return series.rolling(f"{spec.count * (7 if spec.unit == 'W' else 1)}D")
+    months = spec.count * (12 if spec.unit == 'Y' else 1)
+    # Calendar month ends go back to month ends, as core.windows does (is_month_end follows the index frequency)
+    month_end = index.day == index.days_in_month
+    lower = (index - pd.DateOffset(months=months)).where(~month_end, index - pd.offsets.MonthEnd(months))
+    return series.rolling(OffsetIndexer(index, lower), min_periods=1)
+
+
+def with_pandas(series: pd.Series, spec: WindowSpec, business_days: bool):
+    rolling = pandas_rolling(series, spec, business_days)
+    mean, std = rolling.mean(), rolling.std()
+    zscore = (series - mean) / std.where(std != 0, 1.0)
+    return mean.to_numpy(), std.to_numpy(), zscore.to_numpy()
+
+
+def with_rolling_window(dates: np.ndarray, values: np.ndarray, spec: WindowSpec):
+    window = RollingWindow(dates, values, spec)
+    return window.mean(), window.std(), window.zscore()
+
+
+def best_of(repeat: int, fn, *args):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(*args)
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def max_difference(expected: np.ndarray, actual: np.ndarray) -> float:
+    if not np.array_equal(np.isnan(expected), np.isnan(actual)):
+        return float('inf')
+    both = ~np.isnan(expected)
+    return float(np.max(np.abs(expected[both] - actual[both]), initial=0.0))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--years', type=int, default=60, help='History length of each series')
+    parser.add_argument('--series', type=int, default=1, help='Series per frequency, evaluated as one matrix by RollingWindow')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(11)
+    print(
+        f"{'series':>15} {'obs':>7} {'window':>7} {'pandas ms':>10} {'window ms':>10} {'speedup':>8} "
+        f"{'mean diff':>10} {'std diff':>10} {'z diff':>10}"
+    )
+    for frequency in ('business daily', 'weekly', 'monthly'):
+        columns = [build_series(frequency, args.years, rng) for _ in range(args.series)]
+        dates = columns[0].index.to_numpy().astype('datetime64[D]')
+        matrix = np.vstack([column.to_numpy() for column in columns])
+
+        for spec in WINDOWS:
+            rolling_time, computed = best_of(args.repeat, with_rolling_window, dates, matrix, spec)
+            # The reference follows RollingWindow's documented convention for D
+            business_days = RollingWindow(dates[:30], matrix[0, :30], spec).frequency == 'D'
+
+            pandas_time, differences = 0.0, [0.0, 0.0, 0.0]
+            for row, column in enumerate(columns):
+                elapsed, expected = best_of(args.repeat, with_pandas, column, spec, business_days)
+                pandas_time += elapsed
+                differences = [
+                    max(difference, max_difference(e, c[row]))
+                    for difference, e, c in zip(differences, expected, computed)
+                ]
+
+            print(
+                f"{frequency:>15} {len(dates):7d} {str(spec):>7} {pandas_time * 1000:10.2f} "
+                f"{rolling_time * 1000:10.2f} {pandas_time / rolling_time:7.1f}x "
+                + ' '.join(f"{difference:10.2e}" for difference in differences)
+            )
+
+
+if __name__ == '__main__':
+    main()
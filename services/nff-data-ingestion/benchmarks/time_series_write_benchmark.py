@@ -0,0 +1,129 @@
+"""
+IndicatorTimeSeries write-path benchmark
+
+Times the ways a batch of rows reaches IndicatorTimeSeries:
+
+  legacy  the former full-width execute_values upsert (20 columns bound on every row)
+  values  the current INSERT ... VALUES upsert (constant columns bound once per statement)
+  copy    binary COPY into a temp staging table, merged with one INSERT ... SELECT
+
+each for a fresh insert and for an upsert over existing rows. Everything runs in one
+transaction that is rolled back at the end, so the indicator's stored data is untouched.
+Commit time is not included (it is the same for every path).
+
+Needs DATABASE_URL and an existing IndicatorMetadata id.
+
+Usage:
+    python benchmarks/time_series_write_benchmark.py --indicator-id 1 [--rows 10000 --rows 100000]
+        [--repeat 3] [--features]
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import psycopg2
+from psycopg2.extras import execute_values
+
+from config import settings
+from services.etl_service import TIME_SERIES_FEATURE_COLUMNS, ETLService
+
+
+def build_rows(count: int, features: bool):
+    """Rows as ETLService._prepare_time_series_rows builds them: (date, value, original, calculated, *features)"""
+    start = date(1900, 1, 1)
+    feature_columns = TIME_SERIES_FEATURE_COLUMNS if features else []
+    rows = []
+    for i in range(count):
+        value = 100 + (i % 997) * 0.137
+        feature_values = [
+            ('up' if i % 2 else 'down') if column.stage_type == 'text'
+            else (i % 50 == 0) if column.stage_type == 'bool'
+            else value / 100
+            for column in feature_columns
+        ]
+        rows.append((start + timedelta(days=i), value, value - 1, value, *feature_values))
+    return feature_columns, rows
+
+
+def write_legacy(cur, indicator_id, has_calculation, feature_columns, rows, written_at):
+    """The upsert the service used before the COPY path: every column on every row"""
+    populated = {column.key: index for index, column in enumerate(feature_columns, start=4)}
+    values = [
+        (
+            indicator_id, row[0], row[1], row[2], row[3], has_calculation,
+            *(row[populated[column.key]] if column.key in populated else column.default for column in TIME_SERIES_FEATURE_COLUMNS),
+            written_at, written_at
+        )
+        for row in rows
+    ]
+    feature_names = [column.name for column in TIME_SERIES_FEATURE_COLUMNS]
+    execute_values(cur, f"""
+        INSERT INTO "IndicatorTimeSeries" (
+            "indicatorMetadataId", date, value, "originalValue", "calculatedValue", "hasCalculation",
+            {', '.join(f'"{name}"' for name in feature_names)}, "createdAt", "updatedAt"
+        ) VALUES %s
+        ON CONFLICT ("indicatorMetadataId", date)
+        DO UPDATE SET
+            value = EXCLUDED.value,
+            "originalValue" = EXCLUDED."originalValue",
+            "calculatedValue" = EXCLUDED."calculatedValue",
+            "hasCalculation" = EXCLUDED."hasCalculation",
+            {', '.join(f'"{name}" = EXCLUDED."{name}"' for name in feature_names)},
+            "updatedAt" = EXCLUDED."updatedAt"
+    """, values)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--indicator-id', type=int, required=True, help='Existing IndicatorMetadata id to write under')
+    parser.add_argument('--rows', type=int, action='append', help='Batch size (repeatable), default 2000, 20000 and 100000')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--features', action='store_true', help='Populate every AI feature column')
+    args = parser.parse_args()
+
+    # The write methods only use the SQL helpers, not the service's pools and clients
+    service = ETLService.__new__(ETLService)
+    paths = {
+        'legacy': write_legacy,
+        'values': service._insert_time_series_rows,
+        'copy': service._copy_time_series_rows,
+    }
+
+    conn = psycopg2.connect(settings.DATABASE_URL)
+    try:
+        with conn.cursor() as cur:
+            print(f"{'rows':>8} {'path':>8} {'insert ms':>11} {'upsert ms':>11} {'rows/s (insert)':>16}")
+            for count in args.rows or [2000, 20000, 100000]:
+                feature_columns, rows = build_rows(count, args.features)
+                for name, write in paths.items():
+                    insert_times, upsert_times = [], []
+                    for _ in range(args.repeat):
+                        cur.execute('SAVEPOINT bench')
+                        cur.execute('DELETE FROM "IndicatorTimeSeries" WHERE "indicatorMetadataId" = %s', (args.indicator_id,))
+
+                        started = time.perf_counter()
+                        write(cur, args.indicator_id, True, feature_columns, rows, datetime.now())
+                        insert_times.append(time.perf_counter() - started)
+
+                        # The COPY path's staging table lives until commit - drop it as a new transaction would
+                        cur.execute('DROP TABLE IF EXISTS "_IndicatorTimeSeriesStage"')
+                        started = time.perf_counter()
+                        write(cur, args.indicator_id, True, feature_columns, rows, datetime.now())
+                        upsert_times.append(time.perf_counter() - started)
+
+                        cur.execute('ROLLBACK TO SAVEPOINT bench')
+
+                    insert_time, upsert_time = min(insert_times), min(upsert_times)
+                    print(f"{count:8d} {name:>8} {insert_time * 1000:11.1f} {upsert_time * 1000:11.1f} {count / insert_time:16,.0f}")
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
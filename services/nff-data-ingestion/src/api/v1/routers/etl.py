@@ -32,6 +32,9 @@ class ETLResult(BaseModel):
     started_at: str
     completed_at: Optional[str]
     duration_seconds: Optional[float]
+    series_store: Optional[Dict[str, Any]] = None
+    items: Optional[Dict[str, Any]] = None
+    plan: Optional[Dict[str, Any]] = None
 
 @router.post("/etl/jobs", response_model=ETLJobResponse)
 async def create_etl_job(
@@ -122,6 +125,43 @@ async def get_etl_job_status(
             detail=f"Failed to fetch job status: {str(e)}"
         )
 
+@router.post("/etl/jobs/{job_id}/resume", response_model=ETLJobResponse)
+async def resume_etl_job(
+    background_tasks: BackgroundTasks,
+    job_id: str = Path(..., description="ETL Job ID")
+):
+    """
+    Resume an interrupted or failed job; indicators that already finished are not fetched again
+    """
+    try:
+        service = ETLService()
+        resumed = await service.prepare_resume(job_id)
+        
+        if resumed is None:
+            raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+        
+        job = await service.get_job_result(job_id)
+        
+        background_tasks.add_task(service.run_job, job_id=job_id)
+        
+        return ETLJobResponse(
+            job_id=job_id,
+            status=resumed['status'],
+            started_at=job['started_at'],
+            total_indicators=job['total_indicators'],
+            message=f"{resumed['message']} ({resumed['unfinished_indicators']} indicators unfinished)"
+        )
+        
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to resume job: {str(e)}"
+        )
+
 @router.get("/etl/jobs")
 async def list_etl_jobs(
     status: Optional[str] = Query(None, description="Filter by job status"),
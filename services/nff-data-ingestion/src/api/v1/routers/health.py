@@ -4,8 +4,10 @@ Health Check Router
 
 from fastapi import APIRouter, Depends
 from typing import Dict, Any
-import psycopg2
 from config import settings
+from core.db_pool import db_pool
+from core.rate_limiter import rate_limiters
+from core.data_fetcher import CFTCDataFetcher, ShillerDataFetcher
 
 router = APIRouter()
 
@@ -21,13 +23,17 @@ async def health_check() -> Dict[str, Any]:
         "checks": {}
     }
     
-    # Database connectivity check
+    # Database connectivity check - on the pool's threads, so a saturated pool does not stall the event loop
+    def _ping():
+        with db_pool.get_cursor() as cur:
+            cur.execute("SELECT 1")
+    
     try:
-        conn = psycopg2.connect(settings.DATABASE_URL)
-        conn.close()
+        await db_pool.run(_ping)
         health_status["checks"]["database"] = {
             "status": "ok",
-            "message": "Database connection successful"
+            "message": "Database connection successful",
+            "pool": db_pool.get_stats()
         }
     except Exception as e:
         health_status["checks"]["database"] = {
@@ -36,6 +42,15 @@ async def health_check() -> Dict[str, Any]:
         }
         health_status["status"] = "error"
     
+    # Upstream rate limiters: token wait time and 429 back-off
+    health_status["checks"]["rate_limits"] = rate_limiters.get_stats()
+    
+    # Workbook cache: downloads vs. reads served from memory/disk
+    health_status["checks"]["workbook_cache"] = [
+        cache.get_stats()
+        for cache in (ShillerDataFetcher.workbook_cache, CFTCDataFetcher.report_cache, CFTCDataFetcher.history_cache)
+    ]
+    
     # API Keys check
     api_keys_status = {}
     import os
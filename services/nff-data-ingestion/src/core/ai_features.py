@@ -5,17 +5,26 @@ Calculates derived features for machine learning and analysis
 
 import numpy as np
 import pandas as pd
-from typing import List, Dict, Any
+from typing import Dict
 import logging
+from core.columnar import ColumnarSeries
 
 logger = logging.getLogger(__name__)
 
+NUMERIC_FEATURES = [
+    'z_score', 'normalized',
+    'pct_change_1m', 'pct_change_3m', 'pct_change_12m',
+    'ma_30d', 'ma_90d', 'ma_365d',
+    'volatility_30d', 'volatility_90d',
+    'lag_1', 'lag_3', 'lag_6', 'lag_12',
+]
+
 class AIFeaturesCalculator:
     """Calculate AI/ML features for time series data"""
     
-    def calculate_features(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def calculate_features(self, series: ColumnarSeries) -> Dict[str, np.ndarray]:
         """
-        Calculate all AI features for time series data
+        Calculate all AI features for a time series
         
         Features:
         - Z-score normalization
@@ -26,21 +35,16 @@ class AIFeaturesCalculator:
         - Lag features
         - Trend classification
         - Outlier detection
+        
+        Returns:
+            Feature name -> array aligned with series.dates (NaN where a numeric feature is
+            undefined); empty when the series is empty or the calculation fails
         """
-        if not data or len(data) == 0:
-            return []
+        if not len(series):
+            return {}
         
         try:
-            # Convert to DataFrame
-            df = pd.DataFrame(data)
-            df = df.sort_values('date')
-            
-            # Ensure value is numeric
-            df['value'] = pd.to_numeric(df['value'], errors='coerce')
-            df = df.dropna(subset=['value'])
-            
-            if len(df) == 0:
-                return []
+            df = pd.DataFrame({'value': series.values})
             
             # Calculate features
             df = self._calculate_normalization(df)
@@ -51,37 +55,19 @@ class AIFeaturesCalculator:
             df = self._classify_trend(df)
             df = self._detect_outliers(df)
             
-            # Convert back to list of dicts
-            result = []
-            for _, row in df.iterrows():
-                item = {
-                    'date': row['date'] if isinstance(row['date'], str) else row['date'].date() if hasattr(row['date'], 'date') else row['date'],
-                    'value': self._sanitize_numeric(row['value']),
-                    'z_score': self._sanitize_numeric(row.get('z_score')),
-                    'normalized': self._sanitize_numeric(row.get('normalized')),
-                    'pct_change_1m': self._sanitize_numeric(row.get('pct_change_1m')),
-                    'pct_change_3m': self._sanitize_numeric(row.get('pct_change_3m')),
-                    'pct_change_12m': self._sanitize_numeric(row.get('pct_change_12m')),
-                    'ma_30d': self._sanitize_numeric(row.get('ma_30d')),
-                    'ma_90d': self._sanitize_numeric(row.get('ma_90d')),
-                    'ma_365d': self._sanitize_numeric(row.get('ma_365d')),
-                    'volatility_30d': self._sanitize_numeric(row.get('volatility_30d')),
-                    'volatility_90d': self._sanitize_numeric(row.get('volatility_90d')),
-                    'lag_1': self._sanitize_numeric(row.get('lag_1')),
-                    'lag_3': self._sanitize_numeric(row.get('lag_3')),
-                    'lag_6': self._sanitize_numeric(row.get('lag_6')),
-                    'lag_12': self._sanitize_numeric(row.get('lag_12')),
-                    'trend': row.get('trend'),
-                    'is_outlier': bool(row.get('is_outlier', False))
-                }
-                result.append(item)
-            
-            return result
+            features = {
+                column: self._sanitize_numeric(df[column])
+                for column in NUMERIC_FEATURES
+            }
+            features['trend'] = df['trend'].to_numpy(dtype=object)
+            features['is_outlier'] = df['is_outlier'].fillna(False).to_numpy(dtype=bool)
+            
+            return features
             
         except Exception as e:
             logger.error(f"Error calculating AI features: {e}")
-            # Return original data if feature calculation fails
-            return data
+            # Save the series without features if feature calculation fails
+            return {}
     
     def _calculate_normalization(self, df: pd.DataFrame) -> pd.DataFrame:
         """Calculate z-score and min-max normalization"""
@@ -209,21 +195,7 @@ class AIFeaturesCalculator:
         
         return df
     
-    def _sanitize_numeric(self, value, max_abs=999999.0):
-        """Sanitize numeric values (remove inf, nan, too large values)"""
-        try:
-            if pd.isna(value):
-                return None
-            
-            if np.isinf(value):
-                return None
-            
-            value = float(value)
-            
-            if abs(value) > max_abs:
-                return None
-            
-            return value
-            
-        except (ValueError, TypeError):
-            return None
+    def _sanitize_numeric(self, column: pd.Series, max_abs=999999.0) -> np.ndarray:
+        """Sanitize numeric values (inf, nan and too large values become NaN)"""
+        values = pd.to_numeric(column, errors='coerce').to_numpy(dtype=np.float64)
+        return np.where(np.isfinite(values) & (np.abs(values) <= max_abs), values, np.nan)
@@ -0,0 +1,149 @@
+"""
+Series Alignment
+Puts N series on one date axis at once (inner, outer, left or as-of) for cross-sectional calculations
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from core.columnar import ColumnarSeries
+
+# Dates present in every series
+ALIGN_INNER = 'inner'
+# Dates present in any series
+ALIGN_OUTER = 'outer'
+# Dates of the first series, others only where they have the same date
+ALIGN_LEFT = 'left'
+# Dates of the first series, others at their latest observation on or before each date
+ALIGN_ASOF = 'asof'
+
+ALIGNMENTS = (ALIGN_INNER, ALIGN_OUTER, ALIGN_LEFT, ALIGN_ASOF)
+
+
+def axis_dates(date_arrays: Sequence[np.ndarray], how: str = ALIGN_INNER) -> np.ndarray:
+    """The common date axis of sorted, unique date arrays"""
+    if how not in ALIGNMENTS:
+        raise ValueError(f"Unknown alignment '{how}' (expected one of {', '.join(ALIGNMENTS)})")
+    if not date_arrays:
+        return np.empty(0, dtype='datetime64[D]')
+
+    if how in (ALIGN_LEFT, ALIGN_ASOF):
+        return date_arrays[0]
+    if how == ALIGN_OUTER:
+        return np.unique(np.concatenate(date_arrays))
+
+    dates = date_arrays[0]
+    for other in date_arrays[1:]:
+        if other is not dates:
+            dates = np.intersect1d(dates, other, assume_unique=True)
+    return dates
+
+
+def take(
+    dates: np.ndarray,
+    values: np.ndarray,
+    target: np.ndarray,
+    asof: bool = False,
+    tolerance_days: Optional[int] = None
+) -> np.ndarray:
+    """
+    Values of one series on the target dates, NaN where it has none
+
+    With asof, a target date takes the latest observation on or before it (no older than
+    tolerance_days when given) instead of requiring the same date.
+    """
+    if not len(dates):
+        return np.full(len(target), np.nan)
+    if dates is target:
+        return values
+
+    if asof:
+        positions = np.searchsorted(dates, target, side='right') - 1
+        found = positions >= 0
+        positions = np.maximum(positions, 0)
+        if tolerance_days is not None:
+            found &= (target - dates[positions]) <= np.timedelta64(tolerance_days, 'D')
+    else:
+        positions = np.minimum(np.searchsorted(dates, target), len(dates) - 1)
+        found = dates[positions] == target
+
+    return np.where(found, values[positions], np.nan)
+
+
+def forward_fill(matrix: np.ndarray, limit: Optional[int] = None) -> np.ndarray:
+    """Carry each row's last value forward over NaN (at most `limit` steps)"""
+    matrix = np.atleast_2d(matrix)
+    columns = np.arange(matrix.shape[1])
+
+    last_valid = np.where(~np.isnan(matrix), columns, -1)
+    np.maximum.accumulate(last_valid, axis=1, out=last_valid)
+
+    filled = np.take_along_axis(matrix, np.maximum(last_valid, 0), axis=1)
+    keep = last_valid >= 0
+    if limit is not None:
+        keep &= (columns - last_valid) <= limit
+    return np.where(keep, filled, np.nan)
+
+
+@dataclass(frozen=True)
+class SeriesPanel:
+    """N series on one date axis: values[i] belongs to series_ids[i], NaN where a series has no value"""
+    dates: np.ndarray
+    series_ids: Tuple[str, ...]
+    values: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def __getitem__(self, series_id: str) -> np.ndarray:
+        return self.values[self.series_ids.index(series_id)]
+
+    def complete(self) -> 'SeriesPanel':
+        """Only the dates on which every series has a value"""
+        mask = ~np.isnan(self.values).any(axis=0)
+        return SeriesPanel(self.dates[mask], self.series_ids, self.values[:, mask])
+
+    def result(self, series_id: str, values: np.ndarray) -> ColumnarSeries:
+        """A series computed from the panel, on the panel dates, without dates where it is not finite"""
+        values = np.asarray(values, dtype=np.float64)
+        finite = np.isfinite(values)
+        return ColumnarSeries(series_id, self.dates[finite], values[finite])
+
+
+def align_series(
+    series: Union[Dict[str, ColumnarSeries], Sequence[ColumnarSeries]],
+    how: str = ALIGN_INNER,
+    fill: Optional[str] = None,
+    fill_limit: Optional[int] = None,
+    tolerance_days: Optional[int] = None
+) -> SeriesPanel:
+    """
+    Build one date-indexed panel from several series
+
+    Args:
+        series: Series in panel order; the first one anchors 'left' and 'asof' alignment
+        how: inner, outer, left or asof
+        fill: 'ffill' to carry values forward over the gaps alignment leaves (mixed frequencies)
+        fill_limit: Most consecutive dates a value is carried forward
+        tolerance_days: For asof, how old an observation may be and still count
+    """
+    items: List[ColumnarSeries] = list(series.values()) if isinstance(series, dict) else list(series)
+    series_ids = tuple(series.keys()) if isinstance(series, dict) else tuple(item.series_id for item in items)
+
+    dates = axis_dates([item.dates for item in items], how)
+    if not items:
+        return SeriesPanel(dates, series_ids, np.empty((0, 0)))
+
+    values = np.vstack([
+        take(item.dates, item.values, dates, asof=(how == ALIGN_ASOF and i > 0), tolerance_days=tolerance_days)
+        for i, item in enumerate(items)
+    ])
+
+    if fill == 'ffill':
+        values = forward_fill(values, fill_limit)
+    elif fill is not None:
+        raise ValueError(f"Unknown fill rule '{fill}' (expected 'ffill')")
+
+    return SeriesPanel(dates, series_ids, values)
@@ -0,0 +1,122 @@
+"""
+Calculation Batch
+Collects the calculations of a job batch's indicators as their series arrive and evaluates them together on one panel
+"""
+
+import asyncio
+import logging
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from core.calculation_pool import calculation_pool
+from core.columnar import ColumnarSeries
+
+logger = logging.getLogger(__name__)
+
+# (calculation, series_data, result_id), as for CalculationEngine.calculate_series
+CalculationRequest = Tuple[str, Dict[str, ColumnarSeries], str]
+
+
+class CalculationBatch:
+    """
+    Rendezvous for the calculated indicators of one claimed job batch.
+
+    Each indicator submits its calculation once its series are fetched and waits for the
+    result. Pending calculations are evaluated together (CalculationEngine.calculate_batch)
+    as soon as every expected indicator has submitted or dropped out, or once no new one
+    has arrived for linger_seconds - indicators still waiting on a fetch or an executor
+    slot then join the next round instead of holding this one up.
+    """
+
+    def __init__(self, indicator_ids: Iterable[Any], linger_seconds: float):
+        self.linger_seconds = linger_seconds
+        self._outstanding: Set[Any] = set(indicator_ids)
+        self._pending: List[Tuple[CalculationRequest, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._rounds: Set[asyncio.Task] = set()
+        self.stats = {
+            'calculations': 0,
+            'rounds': 0,
+        }
+
+    async def calculate(
+        self,
+        indicator_id: Any,
+        series_data: Dict[str, ColumnarSeries],
+        calculation: str,
+        result_id: str
+    ) -> ColumnarSeries:
+        """Same result (or exception) as CalculationEngine.calculate_series for this indicator"""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(((calculation, series_data, result_id), future))
+        self._outstanding.discard(indicator_id)
+        self._schedule()
+        return await future
+
+    def release(self, indicator_id: Any) -> None:
+        """The indicator will not submit (anymore) - e.g. it finished, failed or needed no calculation"""
+        if indicator_id in self._outstanding:
+            self._outstanding.discard(indicator_id)
+            self._schedule()
+
+    def _schedule(self) -> None:
+        if not self._pending:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if not self._outstanding:
+            self._flush()
+        else:
+            self._timer = asyncio.get_running_loop().call_later(self.linger_seconds, self._flush)
+
+    def _flush(self) -> None:
+        self._timer = None
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+
+        task = asyncio.get_running_loop().create_task(self._evaluate(pending))
+        self._rounds.add(task)
+        task.add_done_callback(self._rounds.discard)
+
+    async def _evaluate(self, pending: List[Tuple[CalculationRequest, asyncio.Future]]) -> None:
+        requests = [request for request, _ in pending]
+        self.stats['calculations'] += len(requests)
+        self.stats['rounds'] += 1
+
+        try:
+            results = await self._run(requests)
+        except Exception as e:
+            # One exception per waiting indicator: raising a shared one in every task grows its traceback
+            results = [self._batch_failure(e) for _ in requests]
+
+        for (_, future), result in zip(pending, results):
+            # A waiting indicator may have been cancelled (job timeout) meanwhile
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    @staticmethod
+    def _batch_failure(error: Exception) -> RuntimeError:
+        failure = RuntimeError(f"Calculation batch failed: {error}")
+        failure.__cause__ = error
+        return failure
+
+    @staticmethod
+    async def _run(requests: List[CalculationRequest]) -> List[Any]:
+        if calculation_pool.enabled:
+            try:
+                return await calculation_pool.calculate_batch(requests)
+            except BrokenProcessPool as e:
+                logger.error(f"Calculation pool failed, running calculation batch in-process: {e}")
+
+        from core.calculation_engine import CalculationEngine
+        return await asyncio.to_thread(CalculationEngine().calculate_batch, requests)
+
+    def summary(self) -> Dict[str, int]:
+        return dict(self.stats)
@@ -5,11 +5,18 @@ Handles different types of calculations based on the calculation column
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Union
 from dataclasses import dataclass
-import re
 import logging
 from datetime import datetime, timedelta
+from functools import lru_cache
+from core.alignment import ALIGN_INNER, ALIGN_OUTER, SeriesPanel, align_series
+from core.columnar import ColumnarSeries
+from core.formula import (
+    WINDOW_FUNCTIONS, Call, FormulaError, FormulaPlan, SeriesRef, compile_formula, looks_like_formula, window_argument
+)
+from core.rolling_state import Lookback
+from core.windows import RollingWindow, WindowSpec, parse_window
 
 @dataclass
 class CalculationResult:
@@ -20,6 +27,38 @@ class CalculationResult:
     calculation_type: Optional[str] = None
     metadata: Dict[str, Any] = None
 
+@dataclass(frozen=True)
+class _BatchKernel:
+    """
+    A transform of a single series that runs on many series in one call: it maps a
+    (series x dates) matrix of series sharing their dates to their results, row for row
+    """
+    operation: str
+    window: Any = None
+    formula: bool = False
+    
+    def apply(self, dates: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+        with np.errstate(all='ignore'):
+            if self.formula:
+                return WINDOW_FUNCTIONS[self.operation].apply(dates, matrix, self.window)
+            if self.operation in ('mean', 'std', 'zscore'):
+                return getattr(RollingWindow(dates, matrix, self.window), self.operation)()
+            if self.operation == 'yoy_percentage':
+                return 100 * (matrix / WINDOW_FUNCTIONS['lag'].apply(dates, matrix, 12) - 1)
+            if self.operation == 'mom_difference':
+                return matrix - WINDOW_FUNCTIONS['lag'].apply(dates, matrix, 1)
+            return matrix
+    
+    def result(self, result_id: str, dates: np.ndarray, values: np.ndarray) -> ColumnarSeries:
+        """The rows kept by the single-indicator calculation of the same shape"""
+        if self.formula:
+            keep = np.isfinite(values)
+        elif self.operation in ('yoy_percentage', 'mom_difference'):
+            keep = ~np.isnan(values)
+        else:
+            return ColumnarSeries(result_id, dates, values)
+        return ColumnarSeries(result_id, dates[keep], values[keep])
+
 class CalculationEngine:
     """Engine for processing different types of indicator calculations"""
     
@@ -37,6 +76,149 @@ class CalculationEngine:
             'composite': self._calculate_composite
         }
     
+    def calculate_series(self, calculation: str, series_data: Dict[str, ColumnarSeries],
+                         indicator_name: str, result_id: str) -> ColumnarSeries:
+        """
+        Columnar entry point used by the ETL pipeline
+        
+        Args:
+            calculation: Calculation string from Excel
+            series_data: Dict of series_id -> ColumnarSeries
+            indicator_name: Name of the indicator for context
+            result_id: Series ID given to the calculated series
+            
+        Returns:
+            The calculated series
+            
+        Raises:
+            ValueError: When the calculation fails or produces no data
+        """
+        if calculation and not pd.isna(calculation):
+            # Formulas run directly on the arrays, without building DataFrames
+            plan = self._compile(self._normalize(calculation), series_data)
+            if plan is not None:
+                series = plan.evaluate(series_data, result_id)
+                if not len(series):
+                    raise ValueError(f"Calculation failed: Calculation '{calculation}' produced no results")
+                return series
+        
+        result = self.process_calculation(calculation, series_data, indicator_name)
+        
+        if not result.success or result.data is None:
+            raise ValueError(f"Calculation failed: {result.error_message}")
+        
+        return ColumnarSeries.from_frame(result_id, result.data)
+    
+    def calculate_batch(self, requests: List[Tuple[str, Dict[str, ColumnarSeries], str]]) -> List[Union[ColumnarSeries, Exception]]:
+        """
+        Evaluate many indicators' calculations together, e.g. every calculated indicator of a category
+        
+        Input series go into one wide date x series panel. Calculations of the same shape - the
+        same transform of one series, such as every yoy() or every "20D z-score" - run as one
+        vectorized operation over the panel columns that share their dates, and each distinct
+        series is transformed once however many indicators use it. Other calculations go
+        through calculate_series one by one.
+        
+        Args:
+            requests: (calculation, series_data, result_id) per indicator, as for calculate_series
+            
+        Returns:
+            Per request, the calculated series or the exception calculate_series raises for it
+        """
+        results: List[Union[ColumnarSeries, Exception, None]] = [None] * len(requests)
+        groups: Dict[_BatchKernel, List[Tuple[int, str]]] = {}
+        panel_series: Dict[str, ColumnarSeries] = {}
+        
+        for position, (calculation, series_data, result_id) in enumerate(requests):
+            shape = self._batch_shape(calculation, series_data)
+            if shape is not None:
+                kernel, series_id = shape
+                series = series_data[series_id]
+                known = panel_series.setdefault(series_id, series)
+                same_data = known is series or (
+                    np.array_equal(known.dates, series.dates) and np.array_equal(known.values, series.values)
+                )
+                # The panel marks missing observations with NaN, so series holding NaN values are left out
+                if same_data and not np.isnan(series.values).any():
+                    groups.setdefault(kernel, []).append((position, series_id))
+                    continue
+            results[position] = self._calculate_one(calculation, series_data, result_id)
+        
+        if groups:
+            panel = align_series(panel_series, how=ALIGN_OUTER)
+            observed = ~np.isnan(panel.values)
+            rows = {series_id: row for row, series_id in enumerate(panel.series_ids)}
+            
+            for kernel, members in groups.items():
+                # Window transforms run on each series' own observations: one block per date set
+                blocks: Dict[bytes, List[int]] = {}
+                for series_id in dict.fromkeys(series_id for _, series_id in members):
+                    blocks.setdefault(observed[rows[series_id]].tobytes(), []).append(rows[series_id])
+                
+                transformed = {}
+                for block_rows in blocks.values():
+                    columns = np.flatnonzero(observed[block_rows[0]])
+                    dates = panel.dates[columns]
+                    values = kernel.apply(dates, panel.values[np.ix_(block_rows, columns)])
+                    for row, row_values in zip(block_rows, values):
+                        transformed[panel.series_ids[row]] = (dates, row_values)
+                
+                for position, series_id in members:
+                    calculation, series_data, result_id = requests[position]
+                    series = kernel.result(result_id, *transformed[series_id])
+                    # An empty result fails - let the single calculation raise its usual error
+                    results[position] = series if len(series) else self._calculate_one(calculation, series_data, result_id)
+        
+        return results
+    
+    def _calculate_one(self, calculation: str, series_data: Dict[str, ColumnarSeries],
+                       result_id: str) -> Union[ColumnarSeries, Exception]:
+        try:
+            return self.calculate_series(calculation, series_data, "indicator", result_id)
+        except Exception as e:
+            return e
+    
+    def _batch_shape(self, calculation: str, series_data: Dict[str, ColumnarSeries]) -> Optional[Tuple[_BatchKernel, str]]:
+        """The batch kernel and input series of a single-series calculation, None for anything else"""
+        if not calculation or pd.isna(calculation) or not series_data:
+            return None
+        
+        calculation = self._normalize(calculation)
+        try:
+            plan = self._compile(calculation, series_data)
+        except FormulaError:
+            return None
+        
+        if plan is not None:
+            expression = plan.expression
+            if isinstance(expression, Call) and expression.name in WINDOW_FUNCTIONS and isinstance(expression.args[0], SeriesRef):
+                return _BatchKernel(expression.name, window_argument(expression), formula=True), expression.args[0].series_id
+            return None
+        
+        method_name, _ = _classify_calculation(
+            calculation.lower(),
+            'T10Y2Y' in str(series_data.keys()),
+            len(series_data) > 2
+        )
+        lowered = calculation.lower()
+        # Descriptive single-series calculations read the first series
+        series_id = next(iter(series_data))
+        
+        if method_name == '_calculate_moving_average':
+            return _BatchKernel('mean', self._moving_average_window(calculation)), series_id
+        if method_name == '_calculate_volatility':
+            return _BatchKernel('std', self._volatility_window(calculation)), series_id
+        if method_name == '_calculate_z_score':
+            spec = parse_window(calculation)
+            return (_BatchKernel('zscore', spec), series_id) if spec else None
+        if method_name == '_calculate_yoy_percentage':
+            return _BatchKernel('yoy_percentage'), series_id
+        if method_name == '_calculate_mom_difference':
+            return _BatchKernel('mom_difference'), series_id
+        if method_name == '_calculate_level_data' and 'ma20' not in lowered and 'ma 20' not in lowered:
+            return _BatchKernel('level'), series_id
+        return None
+    
     def process_calculation(self, calculation: str, series_data: Dict[str, pd.DataFrame], 
                           indicator_name: str) -> CalculationResult:
         """
@@ -44,7 +226,7 @@ class CalculationEngine:
         
         Args:
             calculation: Calculation string from Excel
-            series_data: Dict of series_id -> DataFrame with 'date' and 'value' columns
+            series_data: Dict of series_id -> DataFrame with 'date' and 'value' columns (or ColumnarSeries)
             indicator_name: Name of the indicator for context
             
         Returns:
@@ -53,10 +235,12 @@ class CalculationEngine:
         if not calculation or pd.isna(calculation):
             return CalculationResult(success=False, error_message="No calculation specified")
         
-        # Handle Unicode characters in calculation string
-        calculation = str(calculation).strip()
-        # Normalize Unicode characters to ASCII equivalents
-        calculation = calculation.replace('Δ', 'delta').replace('α', 'alpha').replace('β', 'beta').replace('γ', 'gamma')
+        series_data = {
+            series_id: data.to_frame() if isinstance(data, ColumnarSeries) else data
+            for series_id, data in series_data.items()
+        }
+        
+        calculation = self._normalize(calculation)
         
         try:
             # Determine calculation type and execute
@@ -84,79 +268,101 @@ class CalculationEngine:
                 metadata={'original_calculation': calculation}
             )
     
-    def _identify_and_execute(self, calculation: str, series_data: Dict[str, pd.DataFrame], 
-                            indicator_name: str) -> Tuple[str, Optional[pd.DataFrame]]:
-        """Identify calculation type and execute appropriate method"""
-        
-        calculation_lower = calculation.lower()
-        self.logger.info(f"Processing calculation for {indicator_name}: '{calculation}'")
-        
-        # Pattern 1: Month-over-month changes (ΔMoM, ?MoM) - check BEFORE percentile
-        if any(keyword in calculation_lower for keyword in ['?mom', 'deltamom', 't - t-1', 'mom =', '= t - t']):
-            self.logger.info(f"Matched MoM pattern")
-            return self._calculate_mom_difference(calculation, series_data, indicator_name)
-        
-        # Pattern 2: Level/Percent as published (check BEFORE percentile)
-        if any(keyword in calculation_lower for keyword in ['percent as published', 'level', 'as published']):
-            self.logger.info(f"Matched level_data pattern")
-            return self._calculate_level_data(calculation, series_data, indicator_name)
-        
-        # Pattern 3: Descriptive calculations (check BEFORE other patterns)
-        if any(keyword in calculation_lower for keyword in ['use target rate', 'use published', 'preferred', 'headwind', 'tailwind', 'sensitivity', 'driver for', 'monitor', 'context', 'pair with', 'utilities/chemicals', 'rolling corr']):
-            self.logger.info(f"Matched descriptive pattern, treating as level_data")
-            return self._calculate_level_data(calculation, series_data, indicator_name)
-        
-        # Pattern 4: Yield curve series (already calculated)
-        if any(keyword in calculation_lower for keyword in ['t10y2y', 'yield curve', 'curve inversion']) or 'T10Y2Y' in str(series_data.keys()):
-            self.logger.info(f"Matched yield curve pattern")
-            return self._calculate_level_data(calculation, series_data, indicator_name)
-        
-        # Pattern 5: Z-score calculations (including YoY z-score, 20D)
-        if any(keyword in calculation_lower for keyword in ['z-score', 'zscore', '12m z-score', 'optional z-score']):
-            self.logger.info(f"Matched z-score pattern")
-            return self._calculate_z_score(calculation, series_data, indicator_name)
-        
-        # Pattern 6: YoY calculations (Year-over-year percentage changes)
-        if any(pattern in calculation_lower for pattern in ['yoy', 'year-over-year', 't/t-12', '100*(t/t-12']):
-            return self._calculate_yoy_percentage(calculation, series_data, indicator_name)
+    @staticmethod
+    def _normalize(calculation: str) -> str:
+        # Handle Unicode characters in calculation string
+        calculation = str(calculation).strip()
+        # Normalize Unicode characters to ASCII equivalents
+        return calculation.replace('Δ', 'delta').replace('α', 'alpha').replace('β', 'beta').replace('γ', 'gamma')
+    
+    def _compile(self, calculation: str, series_data: Dict[str, Any]) -> Optional[FormulaPlan]:
+        """
+        Compiled plan when the calculation is a formula over these series, None for descriptive text
         
-        # Pattern 7: Moving Average calculations
-        if any(keyword in calculation_lower for keyword in ['ma', 'moving average', 'avg', '3-month', '3m']):
-            return self._calculate_moving_average(calculation, series_data, indicator_name)
+        Raises:
+            FormulaError: When the calculation is meant as a formula but does not compile
+        """
+        try:
+            return compile_formula(calculation, tuple(series_data))
+        except FormulaError:
+            if looks_like_formula(calculation):
+                raise
+            return None
+    
+    def lookback(self, calculation: str, series_ids: Tuple[str, ...]) -> Optional[Lookback]:
+        """
+        History of its inputs each output of a calculation reads, for resuming it incrementally
         
-        # Pattern 8: Spread calculations (subtraction)
-        if any(keyword in calculation_lower for keyword in ['spread', 'subtract', '-', 'dgs10 - dgs2']):
-            return self._calculate_spread(calculation, series_data, indicator_name)
+        Returns:
+            The lookback, or None when outputs depend on the full history (e.g. percentile ranks)
+            or the calculation is not one the engine can bound
+        """
+        if not calculation or pd.isna(calculation):
+            return None
         
-        # Pattern 9: Ratio calculations (division)
-        if any(keyword in calculation_lower for keyword in ['ratio', 'divide', '/', 'per']):
-            return self._calculate_ratio(calculation, series_data, indicator_name)
+        calculation = self._normalize(calculation)
+        try:
+            plan = self._compile(calculation, dict.fromkeys(series_ids))
+        except FormulaError:
+            return None
+        if plan is not None:
+            return plan.lookback()
         
-        # Pattern 10: Shiller ERP calculation
-        if 'shiller' in calculation_lower and 'erp' in calculation_lower:
-            return self._calculate_shiller_erp(calculation, series_data, indicator_name)
+        method_name, _ = _classify_calculation(
+            calculation.lower(),
+            any('T10Y2Y' in series_id for series_id in series_ids),
+            len(series_ids) > 2
+        )
+        lowered = calculation.lower()
         
-        # Pattern 11: Volatility calculations
-        if any(keyword in calculation_lower for keyword in ['vol', 'volatility', 'std']):
-            return self._calculate_volatility(calculation, series_data, indicator_name)
+        if method_name == '_calculate_moving_average':
+            return self._window_lookback(self._moving_average_window(calculation))
+        if method_name == '_calculate_volatility':
+            return self._window_lookback(self._volatility_window(calculation))
+        if method_name == '_calculate_z_score':
+            spec = parse_window(calculation)
+            return self._window_lookback(spec) if spec else None
+        if method_name == '_calculate_yoy_percentage':
+            return Lookback(observations=12)
+        if method_name in ('_calculate_mom_difference', '_calculate_weekly_changes'):
+            return Lookback(observations=1)
+        if method_name == '_calculate_level_data':
+            return Lookback(observations=19) if ('ma20' in lowered or 'ma 20' in lowered) else Lookback()
+        if method_name in ('_calculate_spread', '_calculate_ratio', '_calculate_simple_arithmetic'):
+            return Lookback()
+        return None
+    
+    @staticmethod
+    def _window_lookback(spec: WindowSpec) -> Lookback:
+        if spec.unit is None:
+            return Lookback(observations=spec.count - 1)
+        return Lookback(days=spec.span_days())
+    
+    def _identify_and_execute(self, calculation: str, series_data: Dict[str, pd.DataFrame], 
+                            indicator_name: str) -> Tuple[str, Optional[pd.DataFrame]]:
+        """Identify calculation type and execute appropriate method"""
         
-        # Pattern 12: Percentile calculations (check AFTER "percent as published")
-        if 'percentile' in calculation_lower:
-            self.logger.info(f"Matched percentile pattern")
-            return self._calculate_percentile(calculation, series_data, indicator_name)
+        self.logger.info(f"Processing calculation for {indicator_name}: '{calculation}'")
         
-        # Pattern 13: Weekly changes with Unicode (check for specific weekly patterns)
-        if any(keyword in calculation_lower for keyword in ['weekly change', 'weekly delta', 'weekly ?', 'wow', 'x_t']):
-            self.logger.info(f"Matched weekly changes pattern")
-            return self._calculate_weekly_changes(calculation, series_data, indicator_name)
+        plan = self._compile(calculation, series_data)
+        if plan is not None:
+            columns = {
+                series_id: data if isinstance(data, ColumnarSeries) else ColumnarSeries.from_frame(series_id, data)
+                for series_id, data in series_data.items()
+            }
+            return 'formula', plan.evaluate(columns).to_frame()
         
-        # Pattern 14: Composite calculations (multiple operations)
-        if len(series_data) > 2 or '+' in calculation or '*' in calculation:
-            return self._calculate_composite(calculation, series_data, indicator_name)
+        method_name, description = _classify_calculation(
+            calculation.lower(),
+            'T10Y2Y' in str(series_data.keys()),
+            len(series_data) > 2
+        )
+        if description:
+            self.logger.info(f"Matched {description} pattern")
+        elif method_name == '_calculate_simple_arithmetic':
+            self.logger.warning(f"No specific pattern matched, trying simple arithmetic")
         
-        # Default: try to parse as simple arithmetic
-        self.logger.warning(f"No specific pattern matched, trying simple arithmetic")
-        return self._calculate_simple_arithmetic(calculation, series_data, indicator_name)
+        return getattr(self, method_name)(calculation, series_data, indicator_name)
     
     def _calculate_moving_average(self, calculation: str, series_data: Dict[str, pd.DataFrame], 
                                 indicator_name: str) -> Tuple[str, Optional[pd.DataFrame]]:
@@ -172,35 +378,7 @@ class CalculationEngine:
             # Sort by date
             df = df.sort_values('date').reset_index(drop=True)
             
-            # Determine window size from calculation text
-            window = 3  # Default for "3-month average"
-            
-            # Extract period from calculation (e.g., "20D", "60M", "3m", "3-month")
-            period_match = re.search(r'(\d+)([DMWY])', calculation, re.IGNORECASE)
-            if period_match:
-                period = int(period_match.group(1))
-                unit = period_match.group(2).upper()
-                
-                # Calculate moving average based on unit
-                if unit == 'D':
-                    window = min(period, len(df))
-                elif unit == 'M':
-                    window = min(period, len(df))
-                elif unit == 'W':
-                    window = min(period * 4, len(df))  # Approximate weeks to data points
-                else:  # Y
-                    window = min(period * 12, len(df))  # Approximate years to data points
-            else:
-                # Try to extract number from text patterns
-                if '3-month' in calculation.lower() or '3m' in calculation.lower():
-                    window = min(3, len(df))
-                elif '20' in calculation.lower() or 'ma20' in calculation.lower():
-                    window = min(20, len(df))
-                elif '60' in calculation.lower():
-                    window = min(60, len(df))
-            
-            # Calculate moving average
-            df['value'] = df['value'].rolling(window=window, min_periods=1).mean()
+            df['value'] = self._rolling(df, self._moving_average_window(calculation)).mean()
             
             return 'moving_average', df
             
@@ -208,6 +386,26 @@ class CalculationEngine:
             self.logger.error(f"Moving average calculation error: {e}")
             return 'moving_average', None
     
+    @staticmethod
+    def _moving_average_window(calculation: str) -> WindowSpec:
+        # Window from the calculation text (e.g., "20D", "60M", "3m", "3-month"), as a span of time
+        spec = parse_window(calculation)
+        if spec is not None:
+            return spec
+        
+        # Bare numbers count observations (e.g., "MA20")
+        lowered = calculation.lower()
+        if '20' in lowered:
+            return WindowSpec(20)
+        if '60' in lowered:
+            return WindowSpec(60)
+        return WindowSpec(3)  # Default for "3-month average"
+    
+    @staticmethod
+    def _volatility_window(calculation: str) -> WindowSpec:
+        # Rolling volatility over a span of time, 30 days unless the text gives one
+        return parse_window(calculation) or WindowSpec(30, 'D')
+    
     def _calculate_spread(self, calculation: str, series_data: Dict[str, pd.DataFrame], 
                          indicator_name: str) -> Tuple[str, Optional[pd.DataFrame]]:
         """Calculate spreads (subtraction between two series)"""
@@ -230,19 +428,12 @@ class CalculationEngine:
                 return 'spread', None
             
             series_ids = list(series_data.keys())
-            df1 = series_data[series_ids[0]].copy()
-            df2 = series_data[series_ids[1]].copy()
-            
-            # Merge on date
-            merged = pd.merge(df1, df2, on='date', suffixes=('_1', '_2'))
-            if merged.empty:
+            panel = self._panel(series_data, series_ids[:2])
+            if not len(panel):
                 return 'spread', None
             
             # Calculate spread (series1 - series2)
-            merged['value'] = merged['value_1'] - merged['value_2']
-            result = merged[['date', 'value']].copy()
-            
-            return 'spread', result
+            return 'spread', self._panel_frame(panel, panel.values[0] - panel.values[1])
             
         except Exception as e:
             self.logger.error(f"Spread calculation error: {e}")
@@ -256,20 +447,14 @@ class CalculationEngine:
                 return 'ratio', None
             
             series_ids = list(series_data.keys())
-            df1 = series_data[series_ids[0]].copy()
-            df2 = series_data[series_ids[1]].copy()
-            
-            # Merge on date
-            merged = pd.merge(df1, df2, on='date', suffixes=('_1', '_2'))
-            if merged.empty:
+            panel = self._panel(series_data, series_ids[:2])
+            if not len(panel):
                 return 'ratio', None
             
             # Calculate ratio (series1 / series2), avoid division by zero
-            merged['value'] = merged['value_1'] / merged['value_2'].replace(0, np.nan)
-            result = merged[['date', 'value']].copy()
-            result = result.dropna()
-            
-            return 'ratio', result
+            with np.errstate(divide='ignore', invalid='ignore'):
+                ratio = panel.values[0] / np.where(panel.values[1] == 0, np.nan, panel.values[1])
+            return 'ratio', self._panel_frame(panel, ratio, drop_missing=True)
             
         except Exception as e:
             self.logger.error(f"Ratio calculation error: {e}")
@@ -298,21 +483,9 @@ class CalculationEngine:
             if df.empty:
                 return 'volatility', None
             
-            # Extract period
-            period_match = re.search(r'(\d+)([DMWY])', calculation, re.IGNORECASE)
-            period = int(period_match.group(1)) if period_match else 30
-            unit = period_match.group(2).upper() if period_match else 'D'
-            
-            # Sort by date
             df = df.sort_values('date').reset_index(drop=True)
             
-            # Calculate rolling volatility
-            if unit == 'D':
-                window = min(period, len(df))
-            else:
-                window = min(period * 4, len(df))  # Approximate
-            
-            df['value'] = df['value'].rolling(window=window, min_periods=1).std()
+            df['value'] = self._rolling(df, self._volatility_window(calculation)).std()
             
             return 'volatility', df
             
@@ -333,34 +506,10 @@ class CalculationEngine:
             # Sort by date
             df = df.sort_values('date').reset_index(drop=True)
             
-            # Extract window size from calculation (e.g., "20D", "12M")
-            window = None
-            period_match = re.search(r'(\d+)([DMY])', calculation, re.IGNORECASE)
-            if period_match:
-                period = int(period_match.group(1))
-                unit = period_match.group(2).upper()
-                
-                if unit == 'D':
-                    window = min(period, len(df))
-                elif unit == 'M':
-                    window = min(period, len(df))
-                elif unit == 'Y':
-                    window = min(period * 12, len(df))
-            
-            # Check if it's a rolling z-score (e.g., 12m z-score, 20D)
-            if '12m' in calculation.lower() or '12m' in calculation.lower():
-                window = min(12, len(df))
-            elif '20d' in calculation.lower() and window is None:
-                window = min(20, len(df))
-            
-            if window:
-                # Calculate rolling z-score
-                df['rolling_mean'] = df['value'].rolling(window=window, min_periods=1).mean()
-                df['rolling_std'] = df['value'].rolling(window=window, min_periods=1).std()
-                
-                # Calculate z-score
-                df['value'] = (df['value'] - df['rolling_mean']) / df['rolling_std'].replace(0, 1)
-                df = df.drop(columns=['rolling_mean', 'rolling_std'])
+            # Rolling z-score when the text gives a window (e.g., "20D", "12m z-score"); mean and std share one pass
+            spec = parse_window(calculation)
+            if spec:
+                df['value'] = self._rolling(df, spec).zscore()
             else:
                 # Calculate overall z-score
                 mean_val = df['value'].mean()
@@ -404,27 +553,14 @@ class CalculationEngine:
                 # Single series - calculate rolling average
                 return self._calculate_moving_average(calculation, series_data, indicator_name)
             else:
-                # Multiple series - calculate cross-sectional average
-                all_dates = set()
-                for df in series_data.values():
-                    all_dates.update(df['date'].tolist())
-                
-                result_data = []
-                for date in sorted(all_dates):
-                    values = []
-                    for df in series_data.values():
-                        val = df[df['date'] == date]['value'].values
-                        if len(val) > 0:
-                            values.append(val[0])
-                    
-                    if values:
-                        avg_value = np.mean(values)
-                        result_data.append({'date': date, 'value': avg_value})
-                
-                if result_data:
-                    return 'average', pd.DataFrame(result_data)
-                else:
+                # Multiple series - cross-sectional average of whichever series have a value on each date
+                panel = self._panel(series_data, how=ALIGN_OUTER)
+                if not len(panel):
                     return 'average', None
+                
+                with np.errstate(invalid='ignore'):
+                    average = np.nanmean(panel.values, axis=0)
+                return 'average', self._panel_frame(panel, average, drop_missing=True)
                     
         except Exception as e:
             self.logger.error(f"Average calculation error: {e}")
@@ -434,9 +570,12 @@ class CalculationEngine:
                            indicator_name: str) -> Tuple[str, Optional[pd.DataFrame]]:
         """Handle complex composite calculations"""
         try:
-            # This is a placeholder for complex calculations
-            # In practice, you'd parse the calculation string and build a computation tree
-            self.logger.warning(f"Complex composite calculation not fully implemented: {calculation}")
+            # Formulas over the indicator's series are compiled and evaluated before keyword
+            # matching (core.formula); text that gets here is a description, not a formula
+            self.logger.warning(
+                f"Composite calculation '{calculation}' is not a formula over series {list(series_data)} - "
+                f"write it as one, e.g. '=avg(A, B)'"
+            )
             return 'composite', None
             
         except Exception as e:
@@ -471,17 +610,11 @@ class CalculationEngine:
                           series_ids: List[str]) -> Tuple[str, Optional[pd.DataFrame]]:
         """Calculate addition of two series"""
         try:
-            df1 = series_data[series_ids[0]].copy()
-            df2 = series_data[series_ids[1]].copy()
-            
-            merged = pd.merge(df1, df2, on='date', suffixes=('_1', '_2'))
-            if merged.empty:
+            panel = self._panel(series_data, series_ids[:2])
+            if not len(panel):
                 return 'addition', None
             
-            merged['value'] = merged['value_1'] + merged['value_2']
-            result = merged[['date', 'value']].copy()
-            
-            return 'addition', result
+            return 'addition', self._panel_frame(panel, panel.values[0] + panel.values[1])
             
         except Exception as e:
             self.logger.error(f"Addition calculation error: {e}")
@@ -491,22 +624,38 @@ class CalculationEngine:
                                 series_ids: List[str]) -> Tuple[str, Optional[pd.DataFrame]]:
         """Calculate multiplication of two series"""
         try:
-            df1 = series_data[series_ids[0]].copy()
-            df2 = series_data[series_ids[1]].copy()
-            
-            merged = pd.merge(df1, df2, on='date', suffixes=('_1', '_2'))
-            if merged.empty:
+            panel = self._panel(series_data, series_ids[:2])
+            if not len(panel):
                 return 'multiplication', None
             
-            merged['value'] = merged['value_1'] * merged['value_2']
-            result = merged[['date', 'value']].copy()
-            
-            return 'multiplication', result
+            return 'multiplication', self._panel_frame(panel, panel.values[0] * panel.values[1])
             
         except Exception as e:
             self.logger.error(f"Multiplication calculation error: {e}")
             return 'multiplication', None
     
+    def _panel(self, series_data: Dict[str, Any], series_ids: Optional[List[str]] = None,
+               how: str = ALIGN_INNER) -> SeriesPanel:
+        """Align series (DataFrames or ColumnarSeries) on one date axis"""
+        columns = {}
+        for series_id in series_ids or list(series_data.keys()):
+            data = series_data[series_id]
+            columns[series_id] = data if isinstance(data, ColumnarSeries) else ColumnarSeries.from_frame(series_id, data)
+        return align_series(columns, how=how)
+    
+    @staticmethod
+    def _rolling(df: pd.DataFrame, spec: WindowSpec, min_periods: int = 1) -> RollingWindow:
+        """Rolling window over a date-sorted frame, row for row"""
+        dates = pd.to_datetime(df['date']).to_numpy(dtype='datetime64[ns]').astype('datetime64[D]')
+        values = pd.to_numeric(df['value'], errors='coerce').to_numpy(dtype=np.float64)
+        return RollingWindow(dates, values, spec, min_periods)
+    
+    @staticmethod
+    def _panel_frame(panel: SeriesPanel, values: np.ndarray, drop_missing: bool = False) -> pd.DataFrame:
+        """Result frame ('date', 'value') on the panel dates"""
+        result = pd.DataFrame({'date': panel.dates.astype('datetime64[ns]'), 'value': values})
+        return result.dropna() if drop_missing else result
+    
     def _calculate_yoy_percentage(self, calculation: str, series_data: Dict[str, pd.DataFrame], 
                                  indicator_name: str) -> Tuple[str, Optional[pd.DataFrame]]:
         """Calculate Year-over-Year percentage changes"""
@@ -627,5 +776,72 @@ class CalculationEngine:
             self.logger.error(f"Weekly changes calculation error: {e}")
             return 'weekly_changes', None
 
+@lru_cache(maxsize=2048)
+def _classify_calculation(calculation_lower: str, has_yield_curve_series: bool, many_series: bool) -> Tuple[str, Optional[str]]:
+    """
+    Keyword match of a descriptive calculation to its method, cached per calculation text
+    
+    Returns:
+        (method name, pattern description to log or None)
+    """
+    # Pattern 1: Month-over-month changes (ΔMoM, ?MoM) - check BEFORE percentile
+    if any(keyword in calculation_lower for keyword in ['?mom', 'deltamom', 't - t-1', 'mom =', '= t - t']):
+        return '_calculate_mom_difference', 'MoM'
+    
+    # Pattern 2: Level/Percent as published (check BEFORE percentile)
+    if any(keyword in calculation_lower for keyword in ['percent as published', 'level', 'as published']):
+        return '_calculate_level_data', 'level_data'
+    
+    # Pattern 3: Descriptive calculations (check BEFORE other patterns)
+    if any(keyword in calculation_lower for keyword in ['use target rate', 'use published', 'preferred', 'headwind', 'tailwind', 'sensitivity', 'driver for', 'monitor', 'context', 'pair with', 'utilities/chemicals', 'rolling corr']):
+        return '_calculate_level_data', 'descriptive (treated as level_data)'
+    
+    # Pattern 4: Yield curve series (already calculated)
+    if any(keyword in calculation_lower for keyword in ['t10y2y', 'yield curve', 'curve inversion']) or has_yield_curve_series:
+        return '_calculate_level_data', 'yield curve'
+    
+    # Pattern 5: Z-score calculations (including YoY z-score, 20D)
+    if any(keyword in calculation_lower for keyword in ['z-score', 'zscore', '12m z-score', 'optional z-score']):
+        return '_calculate_z_score', 'z-score'
+    
+    # Pattern 6: YoY calculations (Year-over-year percentage changes)
+    if any(pattern in calculation_lower for pattern in ['yoy', 'year-over-year', 't/t-12', '100*(t/t-12']):
+        return '_calculate_yoy_percentage', None
+    
+    # Pattern 7: Moving Average calculations
+    if any(keyword in calculation_lower for keyword in ['ma', 'moving average', 'avg', '3-month', '3m']):
+        return '_calculate_moving_average', None
+    
+    # Pattern 8: Spread calculations (subtraction)
+    if any(keyword in calculation_lower for keyword in ['spread', 'subtract', '-', 'dgs10 - dgs2']):
+        return '_calculate_spread', None
+    
+    # Pattern 9: Ratio calculations (division)
+    if any(keyword in calculation_lower for keyword in ['ratio', 'divide', '/', 'per']):
+        return '_calculate_ratio', None
+    
+    # Pattern 10: Shiller ERP calculation
+    if 'shiller' in calculation_lower and 'erp' in calculation_lower:
+        return '_calculate_shiller_erp', None
+    
+    # Pattern 11: Volatility calculations
+    if any(keyword in calculation_lower for keyword in ['vol', 'volatility', 'std']):
+        return '_calculate_volatility', None
+    
+    # Pattern 12: Percentile calculations (check AFTER "percent as published")
+    if 'percentile' in calculation_lower:
+        return '_calculate_percentile', 'percentile'
+    
+    # Pattern 13: Weekly changes with Unicode (check for specific weekly patterns)
+    if any(keyword in calculation_lower for keyword in ['weekly change', 'weekly delta', 'weekly ?', 'wow', 'x_t']):
+        return '_calculate_weekly_changes', 'weekly changes'
+    
+    # Pattern 14: Composite calculations (multiple operations)
+    if many_series or '+' in calculation_lower or '*' in calculation_lower:
+        return '_calculate_composite', None
+    
+    # Default: try to parse as simple arithmetic
+    return '_calculate_simple_arithmetic', None
+
 # Global calculation engine instance
 calculation_engine = CalculationEngine()
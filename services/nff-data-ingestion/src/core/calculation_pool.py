@@ -0,0 +1,162 @@
+"""
+Calculation Process Pool
+Runs CalculationEngine work in warm worker processes so CPU-bound pandas code does not hold the service's GIL
+"""
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple, Union
+
+from config import settings
+from core.columnar import ColumnarSeries
+
+logger = logging.getLogger(__name__)
+
+# Per worker process, created by the pool initializer
+_worker_engine = None
+
+# Fewest calculations of a batch worth a worker of their own (shipping series and panel setup cost the rest)
+MIN_BATCH_SHARE = 8
+
+
+def _init_worker() -> None:
+    """Import the engine (and with it pandas/NumPy) and build it once per worker instead of once per calculation"""
+    global _worker_engine
+    from core.calculation_engine import CalculationEngine
+
+    _worker_engine = CalculationEngine()
+
+
+def _ping() -> bool:
+    return _worker_engine is not None
+
+
+def _calculate_series(calculation: str, series_data: Dict[str, ColumnarSeries], result_id: str) -> ColumnarSeries:
+    """Worker side: run the engine on the shipped series and return the result series"""
+    if _worker_engine is None:
+        _init_worker()
+
+    return _worker_engine.calculate_series(calculation, series_data, "indicator", result_id)
+
+
+def _calculate_batch(requests: List[Tuple[str, Dict[str, ColumnarSeries], str]]) -> List[Union[ColumnarSeries, Exception]]:
+    """Worker side: evaluate a batch of calculations on one panel"""
+    if _worker_engine is None:
+        _init_worker()
+
+    return _worker_engine.calculate_batch(requests)
+
+
+def _split_batch(requests: List[Tuple[str, Dict[str, ColumnarSeries], str]], parts: int) -> List[List[int]]:
+    """
+    Positions of a batch's requests per worker, balanced by count. Requests reading the same
+    series stay on one worker, so a series transformed the same way is still computed once.
+    """
+    groups: Dict[Tuple[str, ...], List[int]] = {}
+    for position, (_, series_data, _) in enumerate(requests):
+        groups.setdefault(tuple(sorted(series_data)), []).append(position)
+
+    shares: List[List[int]] = [[] for _ in range(parts)]
+    for group in sorted(groups.values(), key=len, reverse=True):
+        min(shares, key=len).extend(group)
+    return [share for share in shares if share]
+
+
+class CalculationPool:
+    """
+    Optional process pool for indicator calculations (CALCULATION_EXECUTION_MODE=process)
+
+    Inputs and results are ColumnarSeries - two NumPy arrays each - which pickle far
+    smaller and faster than lists of dicts.
+    """
+
+    def __init__(self, size: Optional[int] = None):
+        self.size = max(1, size or settings.CALCULATION_POOL_SIZE or multiprocessing.cpu_count())
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def enabled(self) -> bool:
+        return settings.CALCULATION_EXECUTION_MODE.lower() == 'process'
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # fork, not spawn/forkserver: those re-run `python src/main.py` in every worker,
+            # which would open a DB pool per worker. warm_up() forks all workers at startup,
+            # before the service has started any threads.
+            start_method = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn'
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.size,
+                mp_context=multiprocessing.get_context(start_method),
+                initializer=_init_worker
+            )
+        return self._executor
+
+    async def warm_up(self) -> None:
+        """Start every worker now so the first job does not pay process start-up and imports"""
+        if not self.enabled:
+            return
+
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        await asyncio.gather(*(loop.run_in_executor(executor, _ping) for _ in range(self.size)))
+        logger.info(f"[CALC POOL] {self.size} calculation workers ready")
+
+    async def calculate(
+        self,
+        series_data: Dict[str, ColumnarSeries],
+        calculation: str,
+        result_id: str
+    ) -> ColumnarSeries:
+        """Run one calculation in the pool, same result as CalculationEngine.calculate_series in-process"""
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                self._get_executor(), _calculate_series, calculation, series_data, result_id
+            )
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM); start a fresh pool for the next calculation
+            self._executor = None
+            raise
+
+    async def calculate_batch(
+        self,
+        requests: List[Tuple[str, Dict[str, ColumnarSeries], str]]
+    ) -> List[Union[ColumnarSeries, Exception]]:
+        """
+        Run CalculationEngine.calculate_batch in the pool, results in request order
+
+        A large batch is split across the workers (at least MIN_BATCH_SHARE calculations each)
+        so a whole category's calculations still use every core.
+        """
+        loop = asyncio.get_running_loop()
+        parts = min(self.size, len(requests) // MIN_BATCH_SHARE)
+        try:
+            executor = self._get_executor()
+            if parts <= 1:
+                return await loop.run_in_executor(executor, _calculate_batch, requests)
+
+            shares = _split_batch(requests, parts)
+            share_results = await asyncio.gather(*(
+                loop.run_in_executor(executor, _calculate_batch, [requests[position] for position in share])
+                for share in shares
+            ))
+        except BrokenProcessPool:
+            self._executor = None
+            raise
+
+        results: List[Union[ColumnarSeries, Exception, None]] = [None] * len(requests)
+        for share, share_result in zip(shares, share_results):
+            for position, result in zip(share, share_result):
+                results[position] = result
+        return results
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+calculation_pool = CalculationPool()
@@ -0,0 +1,121 @@
+"""
+Columnar Series
+One series held as typed date/value arrays - the data contract from fetch through calculation to persistence
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class ColumnarSeries:
+    """
+    Observations of a single series, sorted by date with one value per date.
+
+    dates is datetime64[D] and values is float64, so a series of 100k observations is
+    two contiguous arrays rather than 100k dicts. Fetched series never hold missing
+    values; a calculated series may hold NaN where the calculation produced none.
+    """
+    series_id: str
+    dates: np.ndarray
+    values: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    @property
+    def first_date(self) -> Optional[date]:
+        return self.dates[0].item() if len(self.dates) else None
+
+    @property
+    def last_date(self) -> Optional[date]:
+        return self.dates[-1].item() if len(self.dates) else None
+
+    @classmethod
+    def empty(cls, series_id: str) -> 'ColumnarSeries':
+        return cls(series_id, np.empty(0, dtype='datetime64[D]'), np.empty(0, dtype=np.float64))
+
+    @classmethod
+    def from_arrays(cls, series_id: str, dates: np.ndarray, values: np.ndarray) -> 'ColumnarSeries':
+        """Sort by date and keep the last value of any repeated date"""
+        dates = np.asarray(dates, dtype='datetime64[D]')
+        values = np.asarray(values, dtype=np.float64)
+
+        if len(dates) > 1 and not (dates[1:] > dates[:-1]).all():
+            order = np.argsort(dates, kind='stable')
+            dates, values = dates[order], values[order]
+            last_of_date = np.append(dates[1:] != dates[:-1], True)
+            dates, values = dates[last_of_date], values[last_of_date]
+
+        return cls(series_id, dates, values)
+
+    @classmethod
+    def from_records(cls, series_id: str, records: List[Dict[str, Any]]) -> 'ColumnarSeries':
+        """Build from fetcher-style records ({'date', 'value', ...}); rows without a value are dropped"""
+        records = [record for record in records if record.get('value') is not None]
+        return cls.from_arrays(
+            series_id,
+            np.array([record['date'] for record in records], dtype='datetime64[D]'),
+            np.array([record['value'] for record in records], dtype=np.float64)
+        )
+
+    @classmethod
+    def from_frame(cls, series_id: str, frame) -> 'ColumnarSeries':
+        """Build from a DataFrame with 'date' and 'value' columns (e.g. a CalculationEngine result)"""
+        import pandas as pd
+
+        return cls.from_arrays(
+            series_id,
+            pd.to_datetime(frame['date']).to_numpy(dtype='datetime64[ns]').astype('datetime64[D]'),
+            pd.to_numeric(frame['value'], errors='coerce').to_numpy(dtype=np.float64)
+        )
+
+    @classmethod
+    def combine(cls, series_id: str, parts: Sequence['ColumnarSeries']) -> 'ColumnarSeries':
+        """Merge series into one; where dates overlap the later part wins"""
+        parts = [part for part in parts if len(part)]
+        if not parts:
+            return cls.empty(series_id)
+        if len(parts) == 1:
+            return cls(series_id, parts[0].dates, parts[0].values)
+
+        return cls.from_arrays(
+            series_id,
+            np.concatenate([part.dates for part in parts]),
+            np.concatenate([part.values for part in parts])
+        )
+
+    def slice(self, start_date: Optional[date] = None, end_date: Optional[date] = None) -> 'ColumnarSeries':
+        """Observations within [start_date, end_date] (views, no copy)"""
+        lo = 0 if start_date is None else int(np.searchsorted(self.dates, np.datetime64(start_date, 'D'), side='left'))
+        hi = len(self.dates) if end_date is None else int(np.searchsorted(self.dates, np.datetime64(end_date, 'D'), side='right'))
+        if lo == 0 and hi == len(self.dates):
+            return self
+        return ColumnarSeries(self.series_id, self.dates[lo:hi], self.values[lo:hi])
+
+    def align(self, dates: np.ndarray) -> np.ndarray:
+        """Values of this series on the given dates, NaN where it has no observation"""
+        if not len(self.dates):
+            return np.full(len(dates), np.nan)
+
+        positions = np.clip(np.searchsorted(self.dates, dates), 0, len(self.dates) - 1)
+        return np.where(self.dates[positions] == dates, self.values[positions], np.nan)
+
+    def date_list(self) -> List[date]:
+        return self.dates.astype(object).tolist()
+
+    def to_frame(self):
+        """DataFrame with 'date' (datetime64) and 'value' columns, sharing the value array"""
+        import pandas as pd
+
+        return pd.DataFrame({'date': self.dates.astype('datetime64[ns]'), 'value': self.values}, copy=False)
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Fetcher-style records with datetime.date dates, for callers that still expect them"""
+        return [
+            {'date': obs_date, 'value': obs_value, 'series_id': self.series_id}
+            for obs_date, obs_value in zip(self.date_list(), self.values.tolist())
+        ]
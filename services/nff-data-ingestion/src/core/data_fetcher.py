@@ -1,30 +1,159 @@
 import pandas as pd
-import requests
+import numpy as np
+import httpx
+import asyncio
+import io
+import json
 import os
+import random
+import time
+import zipfile
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime, date
 from utils.logger import get_logger
 from config import settings
+from core.columnar import ColumnarSeries
+from core.http_client import http_client
+from core.job_executor import load_source_budgets
+from core.rate_limiter import TokenBucketLimiter, rate_limiters
+from core.workbook_cache import ParsedWorkbook, WorkbookCache, parse_workbook
 
 logger = get_logger(__name__)
 
 class BaseDataFetcher(ABC):
+    # Concurrent upstream requests a single fetcher issues; sources override from their budget
+    max_concurrency: int = 1
+    # Shared token bucket for the source's API key, None when the source has no rate budget
+    rate_limiter: Optional[TokenBucketLimiter] = None
+    # Series one upstream request can return together (pipe-separated IDs); JobSeriesStore batches up to this
+    max_batch_size: int = 1
+    # Whether get_last_updated asks upstream for a revision stamp (one extra request per series)
+    publishes_last_updated: bool = False
+    
     @abstractmethod
-    async def fetch(self, series_id: str, start_date: Optional[date] = None, end_date: Optional[date] = None) -> List[Dict[str, Any]]:
+    async def fetch_columns(
+        self,
+        series_id: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> Dict[str, ColumnarSeries]:
+        """Each component series of a (possibly pipe-separated) series ID as typed arrays; series without data are left out"""
         pass
+    
+    async def fetch(self, series_id: str, start_date: Optional[date] = None, end_date: Optional[date] = None) -> List[Dict[str, Any]]:
+        """All component series as one flat list of records (kept for record-based callers)"""
+        series_data = await self.fetch_columns(series_id, start_date, end_date)
+        return [record for series in series_data.values() for record in series.to_records()]
+    
+    async def fetch_grouped(
+        self,
+        series_id: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Records keyed by component series (kept for record-based callers)"""
+        series_data = await self.fetch_columns(series_id, start_date, end_date)
+        return {sid: series.to_records() for sid, series in series_data.items()}
+    
+    async def get_last_updated(self, series_id: str) -> Optional[str]:
+        """Upstream revision stamp of a single series, or None if the source does not publish one"""
+        return None
+    
+    @asynccontextmanager
+    async def _request_slot(self):
+        """Hold one of the source's concurrent request slots (shared by every caller of this fetcher)"""
+        loop = asyncio.get_running_loop()
+        
+        # asyncio.Semaphore is bound to the loop it first waits on - rebuild it for a new loop
+        if getattr(self, '_slots_loop', None) is not loop:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+            self._slots_loop = loop
+        
+        async with self._slots:
+            yield
+    
+    async def _get(self, url: str, **kwargs) -> httpx.Response:
+        """
+        GET through the pooled client within the source's rate and concurrency budget
+        
+        429 responses are retried with back-off (Retry-After when given); the last
+        response is returned once UPSTREAM_RETRY_MAX_ATTEMPTS retries are used up.
+        """
+        max_retries = max(0, settings.UPSTREAM_RETRY_MAX_ATTEMPTS)
+        
+        for attempt in range(max_retries + 1):
+            if self.rate_limiter:
+                await self.rate_limiter.acquire()
+            
+            async with self._request_slot():
+                response = await http_client.get_client().get(url, **kwargs)
+            
+            if response.status_code != 429 or attempt == max_retries:
+                return response
+            
+            delay = self._retry_delay(response, attempt)
+            logger.warning(f"{url} rate limited (429), retry {attempt + 1}/{max_retries} in {delay:.1f}s")
+            
+            if self.rate_limiter:
+                # Drains the shared bucket, so the next acquire() waits out the delay for every replica
+                await self.rate_limiter.throttled(delay)
+            else:
+                await asyncio.sleep(delay)
+        
+        return response
+    
+    @staticmethod
+    def _retry_delay(response: httpx.Response, attempt: int) -> float:
+        retry_after = response.headers.get('Retry-After')
+        if retry_after and retry_after.strip().isdigit():
+            delay = float(retry_after)
+        else:
+            delay = settings.UPSTREAM_RETRY_BASE_SECONDS * (2 ** attempt) * random.uniform(1.0, 1.5)
+        return min(delay, settings.UPSTREAM_RETRY_MAX_SECONDS)
+
+def parse_fred_observations(observations: List[Dict[str, Any]], sid: str) -> ColumnarSeries:
+    """
+    Parse a FRED observations array in bulk into typed arrays
+    
+    Dates and values are converted column-wise; FRED's '.' missing marker (and any other
+    unparseable value or date) becomes NaN/NaT and is masked out in one step.
+    """
+    if not observations:
+        return ColumnarSeries.empty(sid)
+    
+    raw_dates = [obs.get('date') for obs in observations]
+    try:
+        dates = np.array(raw_dates, dtype='datetime64[D]')
+    except (TypeError, ValueError):
+        # A malformed date somewhere - fall back to the coercing parser
+        dates = pd.to_datetime(raw_dates, format='%Y-%m-%d', errors='coerce').values.astype('datetime64[D]')
+    values = pd.to_numeric(
+        pd.Series([obs.get('value') for obs in observations], dtype=object), errors='coerce'
+    ).to_numpy(dtype=np.float64)
+    
+    valid = ~(np.isnan(values) | np.isnat(dates))
+    if not valid.all():
+        logger.debug(f"Dropped {int((~valid).sum())} missing or invalid observations for FRED series {sid}")
+    
+    return ColumnarSeries(sid, dates[valid], values[valid])
 
 class FREDDataFetcher(BaseDataFetcher):
+    publishes_last_updated = True
+    
     def __init__(self):
         self.api_key = self._get_api_key()
         self.base_url = "https://api.stlouisfed.org/fred"
+        self.max_concurrency = max(1, load_source_budgets()['fred'].max_concurrency)
+        self.rate_limiter = rate_limiters.get_limiter('fred', self.api_key)
         
         if not self.api_key:
             logger.error("FRED_API_KEY not found")
             raise ValueError("FRED_API_KEY is required for FREDDataFetcher.")
         
         logger.info("FRED API fetcher initialized successfully")
-
+    
     def _get_api_key(self) -> Optional[str]:
         # Try settings first (loads from .env file)
         api_key = settings.FRED_API_KEY
@@ -46,91 +175,94 @@ class FREDDataFetcher(BaseDataFetcher):
         
         logger.warning("FRED API key not found in environment variables or .env file")
         return None
-
-    async def fetch(self, series_id: str, start_date: Optional[date] = None, end_date: Optional[date] = None) -> List[Dict[str, Any]]:
-        all_series_data = []
+    
+    async def fetch_columns(
+        self,
+        series_id: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> Dict[str, ColumnarSeries]:
+        # Component series of a composite indicator are fetched concurrently, bounded by the FRED budget
         series_list = [s.strip() for s in series_id.split('|')] if '|' in series_id else [series_id.strip()]
-
+        
         logger.info(f"Fetching FRED data for {len(series_list)} series: {series_list}")
-
-        for sid in series_list:
-            try:
-                url = f"{self.base_url}/series/observations"
-                params = {
-                    'series_id': sid,
-                    'api_key': self.api_key,
-                    'file_type': 'json',
-                    'observation_start': start_date.isoformat() if start_date else '1776-07-04',
-                    'observation_end': end_date.isoformat() if end_date else datetime.now().isoformat().split('T')[0],
-                    'limit': 100000,
-                    'sort_order': 'asc'
-                }
-                
-                logger.info(f"Fetching FRED data for series: {sid}")
-                response = requests.get(url, params=params, timeout=30)
-                
-                if response.status_code == 401:
-                    raise ValueError(f"FRED API authentication failed. Check your API key.")
-                elif response.status_code == 403:
-                    raise ValueError(f"FRED API access forbidden. Check your API key permissions.")
-                elif response.status_code == 429:
-                    raise ValueError(f"FRED API rate limit exceeded. Please wait and try again.")
-                elif response.status_code == 400:
-                    try:
-                        error_data = response.json()
-                        error_message = error_data.get('error_message', 'Bad Request')
-                        raise ValueError(f"FRED API Bad Request (400): {error_message}")
-                    except:
-                        raise ValueError(f"FRED API Bad Request (400): Invalid request parameters")
-                elif response.status_code == 404:
-                    try:
-                        error_data = response.json()
-                        error_message = error_data.get('error_message', 'Not Found')
-                        raise ValueError(f"FRED API Not Found (404): {error_message}")
-                    except:
-                        raise ValueError(f"FRED API Not Found (404): Series does not exist")
-                
-                response.raise_for_status()
-                
-                data = response.json()
-                observations = data.get('observations', [])
-                
-                if not observations:
-                    logger.warning(f"No observations found for FRED series: {sid}")
-                    continue
-                
-                for obs in observations:
-                    try:
-                        obs_date = pd.to_datetime(obs['date']).date()
-                        obs_value = float(obs['value']) if obs['value'] != '.' else None
-                        
-                        if obs_value is not None:
-                            all_series_data.append({
-                                'date': obs_date,
-                                'value': obs_value,
-                                'series_id': sid 
-                            })
-                    except (ValueError, KeyError) as e:
-                        logger.debug(f"Skipping invalid observation: {e}")
-                        continue
-                
-                logger.info(f"Fetched {len([d for d in all_series_data if d.get('series_id') == sid])} records for series {sid}")
-                
-            except requests.exceptions.RequestException as e:
-                logger.error(f"FRED API request error for {sid}: {e}")
-                raise
-            except Exception as e:
-                logger.error(f"Error processing FRED data for {sid}: {e}")
-                raise
-
-        if not all_series_data:
+        
+        results = await asyncio.gather(*[
+            self._fetch_series(sid, start_date, end_date) for sid in series_list
+        ])
+        series_data = {sid: series for sid, series in zip(series_list, results) if len(series)}
+        
+        if not series_data:
             logger.warning("No data fetched from any series")
-            return []
+            return {}
         
-        logger.info(f"Total FRED data: {len(all_series_data)} records from {len(series_list)} series")
+        logger.info(
+            f"Total FRED data: {sum(len(series) for series in series_data.values())} records "
+            f"from {len(series_list)} series"
+        )
         
-        return all_series_data
-
+        return series_data
+    
+    async def _fetch_series(self, sid: str, start_date: Optional[date], end_date: Optional[date]) -> ColumnarSeries:
+        try:
+            url = f"{self.base_url}/series/observations"
+            params = {
+                'series_id': sid,
+                'api_key': self.api_key,
+                'file_type': 'json',
+                'observation_start': start_date.isoformat() if start_date else '1776-07-04',
+                'observation_end': end_date.isoformat() if end_date else datetime.now().isoformat().split('T')[0],
+                'limit': 100000,
+                'sort_order': 'asc'
+            }
+            
+            logger.info(f"Fetching FRED data for series: {sid}")
+            response = await self._get(url, params=params)
+            
+            if response.status_code == 401:
+                raise ValueError(f"FRED API authentication failed. Check your API key.")
+            elif response.status_code == 403:
+                raise ValueError(f"FRED API access forbidden. Check your API key permissions.")
+            elif response.status_code == 429:
+                raise ValueError(f"FRED API rate limit exceeded after {settings.UPSTREAM_RETRY_MAX_ATTEMPTS} retries. Please wait and try again.")
+            elif response.status_code == 400:
+                try:
+                    error_data = response.json()
+                    error_message = error_data.get('error_message', 'Bad Request')
+                    raise ValueError(f"FRED API Bad Request (400): {error_message}")
+                except:
+                    raise ValueError(f"FRED API Bad Request (400): Invalid request parameters")
+            elif response.status_code == 404:
+                try:
+                    error_data = response.json()
+                    error_message = error_data.get('error_message', 'Not Found')
+                    raise ValueError(f"FRED API Not Found (404): {error_message}")
+                except:
+                    raise ValueError(f"FRED API Not Found (404): Series does not exist")
+            
+            response.raise_for_status()
+            
+            # Decoding and parsing long daily histories is CPU work - keep it off the event loop
+            series_data = await asyncio.to_thread(self._parse_response, response.content, sid)
+            
+            if not len(series_data):
+                logger.warning(f"No observations found for FRED series: {sid}")
+                return series_data
+            
+            logger.info(f"Fetched {len(series_data)} records for series {sid}")
+            return series_data
+        
+        except httpx.HTTPError as e:
+            logger.error(f"FRED API request error for {sid}: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Error processing FRED data for {sid}: {e}")
+            raise
+    
+    @staticmethod
+    def _parse_response(content: bytes, sid: str) -> ColumnarSeries:
+        return parse_fred_observations(json.loads(content).get('observations') or [], sid)
+    
     async def get_series_info(self, series_id: str) -> Dict[str, Any]:
         try:
             url = f"{self.base_url}/series"
@@ -140,7 +272,7 @@ class FREDDataFetcher(BaseDataFetcher):
                 'file_type': 'json'
             }
             
-            response = requests.get(url, params=params, timeout=30)
+            response = await self._get(url, params=params)
             response.raise_for_status()
             
             data = response.json()
@@ -156,75 +288,394 @@ class FREDDataFetcher(BaseDataFetcher):
                 'observation_start': series_info.get('observation_start'),
                 'observation_end': series_info.get('observation_end')
             }
-            
+        
         except Exception as e:
             logger.error(f"Failed to get series info for {series_id}: {e}")
             return {}
+    
+    async def get_last_updated(self, series_id: str) -> Optional[str]:
+        return (await self.get_series_info(series_id)).get('last_updated')
 
 class ShillerDataFetcher(BaseDataFetcher):
+    # Every Shiller series is a column of the same workbook - download and parse it once per TTL
+    workbook_cache = WorkbookCache('shiller', settings.SHILLER_CACHE_TTL_SECONDS, settings.SHILLER_CACHE_DIR)
+    
     def __init__(self):
         self.data_url = os.getenv('SHILLER_DATA_URL')
         if not self.data_url:
             logger.warning("SHILLER_DATA_URL not set. Shiller data fetching might fail.")
+    
+    async def fetch_columns(
+        self,
+        series_id: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> Dict[str, ColumnarSeries]:
+        try:
+            workbook = await self.workbook_cache.get(self.data_url, self._load_workbook)
+            series = workbook.series(series_id).slice(start_date, end_date)
+            
+            logger.info(f"Fetched {len(series)} records for Shiller series {series_id}")
+            return {series_id: series} if len(series) else {}
+        
+        except Exception as e:
+            logger.error(f"Error fetching Shiller data for {series_id}: {e}")
+            raise
+    
+    async def _load_workbook(self) -> ParsedWorkbook:
+        logger.info(f"Downloading Shiller data from: {self.data_url}")
+        
+        source = self.data_url
+        if self.data_url.startswith(('http://', 'https://')):
+            response = await self._get(self.data_url)
+            response.raise_for_status()
+            source = io.BytesIO(response.content)
+        
+        read = pd.read_excel if self.data_url.endswith('.xlsx') else pd.read_csv
+        
+        # Workbook parsing is blocking - run it in a worker thread
+        return await asyncio.to_thread(lambda: parse_workbook(read(source)))
 
-    async def fetch(self, series_id: str, start_date: Optional[date] = None, end_date: Optional[date] = None) -> List[Dict[str, Any]]:
+# Legacy futures-only COT report: field name in series IDs -> column header of the bulk file
+CFTC_FIELDS = {
+    'open_interest': 'Open Interest (All)',
+    'noncommercial_long': 'Noncommercial Positions-Long (All)',
+    'noncommercial_short': 'Noncommercial Positions-Short (All)',
+    'noncommercial_spreading': 'Noncommercial Positions-Spreading (All)',
+    'commercial_long': 'Commercial Positions-Long (All)',
+    'commercial_short': 'Commercial Positions-Short (All)',
+    'nonreportable_long': 'Nonreportable Positions-Long (All)',
+    'nonreportable_short': 'Nonreportable Positions-Short (All)',
+}
+
+# Net positions are derived from the long/short columns
+CFTC_NET_FIELDS = {
+    'noncommercial_net': ('noncommercial_long', 'noncommercial_short'),
+    'commercial_net': ('commercial_long', 'commercial_short'),
+    'nonreportable_net': ('nonreportable_long', 'nonreportable_short'),
+}
+
+# Positioning indicators track speculators, so a bare contract code means their net position
+CFTC_DEFAULT_FIELD = 'noncommercial_net'
+
+_CFTC_CODE_COLUMN = 'CFTC Contract Market Code'
+_CFTC_DATE_COLUMN = 'As of Date in Form YYYY-MM-DD'
+
+def parse_cftc_series_id(series_id: str) -> Tuple[str, str]:
+    """
+    Split a CFTC series ID '<contract market code>[:<field>]' (e.g. '13874A:commercial_net')
+    
+    Raises:
+        ValueError: When the code is empty or the field is unknown
+    """
+    code, _, field = series_id.strip().partition(':')
+    code, field = code.strip().upper(), (field.strip().lower() or CFTC_DEFAULT_FIELD)
+    
+    if not code or not code.isalnum():
+        raise ValueError(f"Invalid CFTC contract market code in series ID '{series_id}'")
+    if field not in CFTC_FIELDS and field not in CFTC_NET_FIELDS:
+        raise ValueError(f"Unknown CFTC field '{field}' in series ID '{series_id}'")
+    
+    return code, field
+
+def parse_cot_report(source, chunk_size: int = 50_000) -> ParsedWorkbook:
+    """
+    Parse a legacy COT bulk file (CSV, or the zip CFTC publishes it in) into one column per contract and field
+    
+    The file is read in chunks and only the code, date and position columns are kept, so a
+    whole year of every contract is never held as text. Rows are pivoted to report dates x
+    '<code>:<field>' columns.
+    """
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            member = next(name for name in archive.namelist() if not name.endswith('/'))
+            # The member is decompressed as read_csv pulls each chunk, never held whole
+            with archive.open(member) as f:
+                return _parse_cot_csv(f, chunk_size)
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    return _parse_cot_csv(source, chunk_size)
+
+def _parse_cot_csv(source, chunk_size: int) -> ParsedWorkbook:
+    wanted = {_CFTC_CODE_COLUMN, _CFTC_DATE_COLUMN, *CFTC_FIELDS.values()}
+    codes, dates, fields = [], [], {field: [] for field in CFTC_FIELDS}
+    
+    chunks = pd.read_csv(
+        source,
+        usecols=lambda column: column.strip() in wanted,
+        dtype={_CFTC_CODE_COLUMN: str},
+        chunksize=chunk_size,
+        skipinitialspace=True
+    )
+    for chunk in chunks:
+        chunk.columns = [column.strip() for column in chunk.columns]
+        codes.append(chunk[_CFTC_CODE_COLUMN].astype(str).str.strip().str.upper().to_numpy())
+        dates.append(pd.to_datetime(chunk[_CFTC_DATE_COLUMN], errors='coerce').to_numpy(dtype='datetime64[ns]').astype('datetime64[D]'))
+        for field, header in CFTC_FIELDS.items():
+            fields[field].append(pd.to_numeric(chunk[header], errors='coerce').to_numpy(dtype=np.float64))
+    
+    if not codes:
+        return ParsedWorkbook(dates=np.empty(0, dtype='datetime64[D]'), columns={}, loaded_at=time.time())
+    
+    codes = np.concatenate(codes)
+    dates = np.concatenate(dates)
+    valid = ~np.isnat(dates)
+    codes, dates = codes[valid], dates[valid]
+    
+    report_dates, date_index = np.unique(dates, return_inverse=True)
+    contract_codes, code_index = np.unique(codes, return_inverse=True)
+    
+    columns = {}
+    for field, chunks in fields.items():
+        values = np.concatenate(chunks)[valid]
+        matrix = np.full((len(contract_codes), len(report_dates)), np.nan)
+        matrix[code_index, date_index] = values
+        for code, row in zip(contract_codes, matrix):
+            columns[f"{code}:{field}"] = row
+    
+    for net_field, (long_field, short_field) in CFTC_NET_FIELDS.items():
+        for code in contract_codes:
+            columns[f"{code}:{net_field}"] = columns[f"{code}:{long_field}"] - columns[f"{code}:{short_field}"]
+    
+    return ParsedWorkbook(dates=report_dates, columns=columns, loaded_at=time.time())
+
+class CFTCDataFetcher(BaseDataFetcher):
+    """
+    Commitments of Traders positions from CFTC's yearly bulk files
+    
+    Every contract of a year is in the same file, so a file is downloaded and parsed once
+    and serves every series that references it. Past years do not change and are kept
+    for CFTC_HISTORY_CACHE_TTL_SECONDS; the current year's file is refreshed weekly by
+    CFTC and kept for CFTC_CACHE_TTL_SECONDS.
+    """
+    report_cache = WorkbookCache('cftc', settings.CFTC_CACHE_TTL_SECONDS, settings.CFTC_CACHE_DIR)
+    history_cache = WorkbookCache('cftc-history', settings.CFTC_HISTORY_CACHE_TTL_SECONDS, settings.CFTC_CACHE_DIR)
+    
+    def __init__(self):
+        self.data_url = settings.CFTC_DATA_URL
+        self.max_concurrency = max(1, load_source_budgets()['cftc'].max_concurrency)
+    
+    async def fetch_columns(
+        self,
+        series_id: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> Dict[str, ColumnarSeries]:
+        series_list = [s.strip() for s in series_id.split('|') if s.strip()]
+        parsed_ids = {sid: parse_cftc_series_id(sid) for sid in series_list}
+        
+        current_year = date.today().year
+        last_year = min(end_date.year, current_year) if end_date else current_year
+        first_year = min(start_date.year, last_year) if start_date else last_year
+        
         try:
-            logger.info(f"Fetching Shiller data from: {self.data_url}")
+            reports = await asyncio.gather(*[self._load_year(year) for year in range(first_year, last_year + 1)])
+        except Exception as e:
+            logger.error(f"Error fetching CFTC data for {series_id}: {e}")
+            raise
+        
+        series_data = {}
+        for sid, (code, field) in parsed_ids.items():
+            column = f"{code}:{field}"
+            parts = [report.series(column) for report in reports if column in report.columns]
+            series = ColumnarSeries.combine(sid, parts).slice(start_date, end_date)
             
-            if self.data_url.endswith('.xlsx'):
-                df = pd.read_excel(self.data_url)
+            if len(series):
+                series_data[sid] = series
             else:
-                df = pd.read_csv(self.data_url)
-            
-            df['date'] = pd.to_datetime(df['Date'], errors='coerce').dt.date
-            df['value'] = pd.to_numeric(df[series_id], errors='coerce')
-            
-            df = df[['date', 'value']].dropna()
+                logger.warning(f"No CFTC data for contract {code} ({field}) between {first_year} and {last_year}")
+        
+        logger.info(f"Fetched CFTC series {list(series_data)} from {len(reports)} yearly report(s)")
+        return series_data
+    
+    async def _load_year(self, year: int) -> ParsedWorkbook:
+        url = self.data_url.format(year=year)
+        cache = self.report_cache if year >= date.today().year else self.history_cache
+        return await cache.get(url, lambda: self._download_report(url))
+    
+    async def _download_report(self, url: str) -> ParsedWorkbook:
+        logger.info(f"Downloading CFTC report from: {url}")
+        
+        if url.startswith(('http://', 'https://')):
+            response = await self._get(url)
+            if response.status_code == 404:
+                # The new year's file only appears with its first report
+                logger.info(f"CFTC report {url} not published yet")
+                return ParsedWorkbook(dates=np.empty(0, dtype='datetime64[D]'), columns={}, loaded_at=time.time())
+            response.raise_for_status()
+            source = io.BytesIO(response.content)
+        else:
+            source = url
+        
+        # Parsing is blocking - run it in a worker thread
+        return await asyncio.to_thread(parse_cot_report, source)
 
-            if start_date:
-                df = df[df['date'] >= start_date]
-            if end_date:
-                df = df[df['date'] <= end_date]
-            
-            fetched_data = []
-            for _, row in df.iterrows():
-                fetched_data.append({
-                    'date': row['date'],
-                    'value': float(row['value'])
-                })
-            
-            logger.info(f"Fetched {len(fetched_data)} records for Shiller series {series_id}")
-            return fetched_data
+def parse_te_historical(rows: List[Dict[str, Any]]) -> Dict[str, ColumnarSeries]:
+    """
+    Split a TradingEconomics historical response (rows of several symbols) into one series per symbol
+    
+    Symbols are upper-cased; dates and values are converted column-wise and rows with a
+    missing date or value are dropped.
+    """
+    if not rows:
+        return {}
+    
+    symbols = np.array([str(row.get('HistoricalDataSymbol') or row.get('Symbol') or '').upper() for row in rows])
+    dates = pd.to_datetime(
+        [str(row.get('DateTime') or '')[:10] for row in rows], format='%Y-%m-%d', errors='coerce'
+    ).values.astype('datetime64[D]')
+    values = pd.to_numeric(
+        pd.Series([row.get('Value') for row in rows], dtype=object), errors='coerce'
+    ).to_numpy(dtype=np.float64)
+    
+    valid = ~(np.isnat(dates) | np.isnan(values)) & (symbols != '')
+    symbols, dates, values = symbols[valid], dates[valid], values[valid]
+    
+    series_data = {}
+    for symbol in np.unique(symbols):
+        mask = symbols == symbol
+        series_data[str(symbol)] = ColumnarSeries.from_arrays(str(symbol), dates[mask], values[mask])
+    return series_data
 
+class TradingEconomicsDataFetcher(BaseDataFetcher):
+    """
+    Historical series from TradingEconomics by ticker symbol (e.g. 'USURTOT')
+    
+    TE's historical endpoint takes comma-separated symbols, so the series of a request -
+    and, through JobSeriesStore, every TE series of a job - are fetched max_batch_size at
+    a time instead of one request each.
+    
+    With TE_BASE_URL set to a directory instead of a URL, requests are answered from the
+    historical responses recorded there (*.json, each holding the rows of one or more
+    symbols), so the fetcher runs offline.
+    """
+    
+    def __init__(self):
+        self.base_url = settings.TE_BASE_URL.rstrip('/')
+        self.credentials = f"{settings.TE_API_KEY}:{settings.TE_API_SECRET}" if settings.TE_API_KEY and settings.TE_API_SECRET else 'guest:guest'
+        self.max_batch_size = max(1, settings.TE_BATCH_MAX_SYMBOLS)
+        self.max_concurrency = max(1, load_source_budgets()['tradingeconomics'].max_concurrency)
+        self.rate_limiter = rate_limiters.get_limiter('tradingeconomics', self.credentials)
+        
+        if self.credentials == 'guest:guest':
+            logger.warning("TE_API_KEY/TE_API_SECRET not set - using TradingEconomics guest access")
+    
+    @property
+    def offline(self) -> bool:
+        return not self.base_url.startswith(('http://', 'https://'))
+    
+    async def fetch_columns(
+        self,
+        series_id: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> Dict[str, ColumnarSeries]:
+        series_list = [s.strip() for s in series_id.split('|') if s.strip()]
+        batches = [series_list[i:i + self.max_batch_size] for i in range(0, len(series_list), self.max_batch_size)]
+        
+        logger.info(f"Fetching TradingEconomics data for {len(series_list)} series in {len(batches)} request(s)")
+        
+        try:
+            results = await asyncio.gather(*[self._fetch_batch(batch, start_date, end_date) for batch in batches])
         except Exception as e:
-            logger.error(f"Error fetching Shiller data for {series_id}: {e}")
+            logger.error(f"Error fetching TradingEconomics data for {series_id}: {e}")
             raise
+        
+        by_symbol = {symbol: series for result in results for symbol, series in result.items()}
+        
+        series_data = {}
+        for sid in series_list:
+            series = by_symbol.get(sid.upper())
+            if series is None or not len(series):
+                logger.warning(f"No observations found for TradingEconomics symbol: {sid}")
+                continue
+            series_data[sid] = ColumnarSeries(sid, series.dates, series.values).slice(start_date, end_date)
+        
+        return series_data
+    
+    async def _fetch_batch(self, symbols: List[str], start_date: Optional[date], end_date: Optional[date]) -> Dict[str, ColumnarSeries]:
+        if self.offline:
+            return await asyncio.to_thread(self._read_fixtures, symbols)
+        
+        start = (start_date or date(1900, 1, 1)).isoformat()
+        end = (end_date or date.today()).isoformat()
+        url = f"{self.base_url}/historical/ticker/{','.join(symbols)}/{start}/{end}"
+        
+        response = await self._get(url, params={'c': self.credentials, 'f': 'json'})
+        
+        if response.status_code in (401, 403):
+            raise ValueError(f"TradingEconomics API access denied ({response.status_code}). Check TE_API_KEY/TE_API_SECRET.")
+        elif response.status_code == 429:
+            raise ValueError(f"TradingEconomics API rate limit exceeded after {settings.UPSTREAM_RETRY_MAX_ATTEMPTS} retries. Please wait and try again.")
+        
+        response.raise_for_status()
+        
+        # Decoding and parsing is CPU work on long histories - keep it off the event loop
+        return await asyncio.to_thread(lambda: parse_te_historical(json.loads(response.content) or []))
+    
+    def _read_fixtures(self, symbols: List[str]) -> Dict[str, ColumnarSeries]:
+        wanted = {symbol.upper() for symbol in symbols}
+        rows = []
+        for name in sorted(os.listdir(self.base_url)):
+            if not name.endswith('.json'):
+                continue
+            with open(os.path.join(self.base_url, name)) as f:
+                rows.extend(
+                    row for row in json.load(f) or []
+                    if str(row.get('HistoricalDataSymbol') or row.get('Symbol') or '').upper() in wanted
+                )
+        return parse_te_historical(rows)
 
 class DataFetcherFactory:
-    @staticmethod
-    def get_fetcher(source: str) -> Optional[BaseDataFetcher]:
+    # One long-lived fetcher per source; they are stateless and share the pooled HTTP client
+    _fetchers: Dict[str, BaseDataFetcher] = {}
+    
+    @classmethod
+    def get_fetcher(cls, source: str) -> Optional[BaseDataFetcher]:
         source_lower = source.lower()
         
         try:
             if "fred" in source_lower:
-                logger.info("Using real FRED API")
-                return FREDDataFetcher()
+                key, fetcher_class = 'fred', FREDDataFetcher
             
             elif "polygon" in source_lower:
                 logger.error("Polygon API is no longer supported")
                 raise ValueError("POLYGON_NOT_SUPPORTED: Polygon API is no longer available. Please use alternative data source.")
             
             elif "shiller" in source_lower:
-                return ShillerDataFetcher()
+                key, fetcher_class = 'shiller', ShillerDataFetcher
+            
+            elif "cftc" in source_lower:
+                key, fetcher_class = 'cftc', CFTCDataFetcher
+            
+            elif "tradingeconomics" in source_lower.replace(' ', ''):
+                key, fetcher_class = 'tradingeconomics', TradingEconomicsDataFetcher
             
             else:
                 logger.warning(f"No data fetcher implemented for source: {source}")
                 return None
+            
+            if key not in cls._fetchers:
+                cls._fetchers[key] = fetcher_class()
+            return cls._fetchers[key]
         
         except Exception as e:
             logger.error(f"Failed to create data fetcher for source {source}: {e}")
             return None
-
+    
+    @classmethod
+    def initialize(cls) -> None:
+        """Create the fetchers of every configured source up front (app startup)"""
+        for source in cls.get_available_sources():
+            cls.get_fetcher(source)
+    
+    @classmethod
+    async def shutdown(cls) -> None:
+        """Drop shared fetchers and close the pooled HTTP and rate limiter clients (app shutdown)"""
+        cls._fetchers.clear()
+        await http_client.close()
+        await rate_limiters.close()
+    
     @staticmethod
     def get_available_sources() -> List[str]:
         available = []
@@ -236,6 +687,12 @@ class DataFetcherFactory:
         if os.getenv('SHILLER_DATA_URL'):
             available.append('Shiller')
         
+        # COT bulk files are public - no key needed
+        available.append('CFTC')
+        
+        if settings.TE_API_KEY and settings.TE_API_SECRET:
+            available.append('TradingEconomics')
+        
         return available
     
     @staticmethod
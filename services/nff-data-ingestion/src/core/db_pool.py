@@ -2,8 +2,14 @@ import psycopg2
 from psycopg2 import pool
 from psycopg2.extras import RealDictCursor
 from config import settings
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+import asyncio
+import functools
 import logging
 import atexit
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -28,9 +34,12 @@ class DatabasePool:
         try:
             db_url = settings.DATABASE_URL
             
+            self.min_size = max(1, settings.DB_POOL_MIN_SIZE)
+            self.max_size = max(self.min_size, settings.DB_POOL_MAX_SIZE)
+            
             self._pool = psycopg2.pool.ThreadedConnectionPool(
-                minconn=1,
-                maxconn=10,
+                minconn=self.min_size,
+                maxconn=self.max_size,
                 dsn=db_url,
                 connect_timeout=10,
                 keepalives=1,
@@ -39,49 +48,101 @@ class DatabasePool:
                 keepalives_count=5
             )
             
-            logger.info("Database connection pool initialized successfully")
+            # ThreadedConnectionPool raises as soon as it is exhausted; the semaphore
+            # makes callers queue for a free connection instead (and lets us time the wait)
+            self._slots = threading.BoundedSemaphore(self.max_size)
+            # One thread per connection: blocking queries run here instead of on the event loop
+            self._executor = ThreadPoolExecutor(max_workers=self.max_size, thread_name_prefix="db-pool")
+            self._stats_lock = threading.Lock()
+            self._pooled_ids = set()
+            self._stats = {
+                'checkouts': 0,
+                'waits': 0,
+                'total_wait_ms': 0.0,
+                'max_wait_ms': 0.0,
+                'timeouts': 0,
+                'fallback_connections': 0,
+                'discarded_connections': 0,
+            }
+            
+            logger.info(f"Database connection pool initialized successfully (min={self.min_size}, max={self.max_size})")
         except Exception as e:
             logger.error(f"Failed to initialize database pool: {e}")
             raise
     
     def get_connection(self):
-        """Get a connection from the pool"""
+        """Get a connection from the pool, waiting up to DB_POOL_TIMEOUT seconds for a free one"""
+        if self._pool is None:
+            self._initialize_pool()
+        
+        wait_started = time.monotonic()
+        if not self._slots.acquire(timeout=settings.DB_POOL_TIMEOUT):
+            with self._stats_lock:
+                self._stats['timeouts'] += 1
+            raise TimeoutError(f"Timed out after {settings.DB_POOL_TIMEOUT}s waiting for a database connection")
+        
+        self._record_wait(time.monotonic() - wait_started)
+        
         try:
-            if self._pool is None:
-                self._initialize_pool()
-            
             conn = self._pool.getconn()
-            if conn:
-                conn.cursor().execute("SELECT 1")
-                return conn
-            else:
-                raise Exception("Failed to get connection from pool")
+            if conn.closed:
+                # Server-side disconnect since last use - drop it and open a fresh one
+                self._pool.putconn(conn, close=True)
+                with self._stats_lock:
+                    self._stats['discarded_connections'] += 1
+                conn = self._pool.getconn()
+            
+            with self._stats_lock:
+                self._pooled_ids.add(id(conn))
+            return conn
         except Exception as e:
-            logger.error(f"Error getting connection from pool: {e}")            
+            self._slots.release()
+            logger.error(f"Error getting connection from pool: {e}")
             try:
                 logger.warning("Falling back to direct connection")
-                return psycopg2.connect(settings.DATABASE_URL)
+                conn = psycopg2.connect(settings.DATABASE_URL)
+                with self._stats_lock:
+                    self._stats['fallback_connections'] += 1
+                return conn
             except Exception as fallback_error:
                 logger.error(f"Fallback connection also failed: {fallback_error}")
                 raise
     
     def return_connection(self, conn):
         """Return connection to pool"""
+        if not conn:
+            return
+        
+        with self._stats_lock:
+            pooled = id(conn) in self._pooled_ids
+            self._pooled_ids.discard(id(conn))
+        
+        if not pooled:
+            # Direct fallback connection, never part of the pool
+            try:
+                conn.close()
+            except:
+                pass
+            return
+        
         try:
-            if self._pool and conn:
-                self._pool.putconn(conn)
+            if self._pool:
+                self._pool.putconn(conn, close=bool(conn.closed))
         except Exception as e:
             logger.error(f"Error returning connection to pool: {e}")
             try:
                 conn.close()
             except:
                 pass
+        finally:
+            self._slots.release()
     
     def close_pool(self):
         """Close all connections in pool"""
         try:
             if self._pool:
                 self._pool.closeall()
+                self._executor.shutdown(wait=False)
                 logger.info("Database connection pool closed")
         except Exception as e:
             logger.error(f"Error closing pool: {e}")
@@ -89,6 +150,50 @@ class DatabasePool:
     def get_cursor(self, cursor_factory=None):
         """Get a connection and cursor from pool (context manager)"""
         return DatabaseConnection(self, cursor_factory)
+    
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a blocking database function on the pool's worker threads
+        
+        Use this from async code so psycopg2 calls never block the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool size, utilisation and checkout wait-time statistics"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+            in_use = len(self._pooled_ids)
+        
+        idle = len(getattr(self._pool, '_pool', []) or [])
+        checkouts = stats['checkouts']
+        
+        return {
+            'min_size': self.min_size,
+            'max_size': self.max_size,
+            'in_use': in_use,
+            'idle': idle,
+            'open_connections': in_use + idle,
+            'checkouts': checkouts,
+            'waits': stats['waits'],
+            'avg_wait_ms': round(stats['total_wait_ms'] / checkouts, 3) if checkouts else 0.0,
+            'max_wait_ms': round(stats['max_wait_ms'], 3),
+            'total_wait_ms': round(stats['total_wait_ms'], 3),
+            'timeouts': stats['timeouts'],
+            'fallback_connections': stats['fallback_connections'],
+            'discarded_connections': stats['discarded_connections'],
+        }
+    
+    def _record_wait(self, wait_seconds: float) -> None:
+        wait_ms = wait_seconds * 1000
+        with self._stats_lock:
+            self._stats['checkouts'] += 1
+            self._stats['total_wait_ms'] += wait_ms
+            if wait_ms > 1:
+                self._stats['waits'] += 1
+            if wait_ms > self._stats['max_wait_ms']:
+                self._stats['max_wait_ms'] = wait_ms
 
 class DatabaseConnection:
     def __init__(self, pool_manager, cursor_factory=None):
@@ -103,24 +208,28 @@ class DatabaseConnection:
         return self.cursor
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.cursor:
-            try:
-                if exc_type:
-                    self.conn.rollback()
-                else:
-                    self.conn.commit()
-            except Exception as e:
-                logger.error(f"Error in transaction: {e}")
-                if self.conn:
-                    try:
+        try:
+            if self.cursor:
+                try:
+                    if exc_type:
                         self.conn.rollback()
-                    except:
-                        pass
-            finally:
-                self.cursor.close()
-        
-        if self.conn:
-            self.pool_manager.return_connection(self.conn)
+                    else:
+                        self.conn.commit()
+                except Exception as e:
+                    logger.error(f"Error in transaction: {e}")
+                    if self.conn:
+                        try:
+                            self.conn.rollback()
+                        except:
+                            pass
+                    # A failed commit must not look like a successful write
+                    if not exc_type:
+                        raise
+                finally:
+                    self.cursor.close()
+        finally:
+            if self.conn:
+                self.pool_manager.return_connection(self.conn)
         
         return False
 
@@ -0,0 +1,595 @@
+"""
+Formula Language
+Parses indicator calculation strings such as "yoy(CPIAUCSL) - yoy(PCEPI)" once into an expression tree and evaluates it over series arrays
+"""
+
+import re
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from pandas.api.indexers import BaseIndexer
+
+from core.alignment import ALIGN_INNER, axis_dates, take
+from core.columnar import ColumnarSeries
+from core.rolling_state import Lookback
+from core.windows import WindowSpec, business_daily, shift_span
+
+
+class FormulaError(ValueError):
+    """A calculation string that is not a valid formula (or references unknown series)"""
+
+
+# ---------------------------------------------------------------------------
+# Expression tree
+
+@dataclass(frozen=True)
+class Number:
+    value: float
+
+
+@dataclass(frozen=True)
+class SeriesRef:
+    series_id: str
+
+
+@dataclass(frozen=True)
+class Unary:
+    op: str
+    operand: 'Node'
+
+
+@dataclass(frozen=True)
+class Binary:
+    op: str
+    left: 'Node'
+    right: 'Node'
+
+
+@dataclass(frozen=True)
+class Call:
+    name: str
+    args: Tuple['Node', ...]
+
+
+@dataclass(frozen=True)
+class Window:
+    """A span of time given as a window argument, e.g. the 20D in ma(DGS10, 20D)"""
+    spec: WindowSpec
+
+
+Node = Union[Number, SeriesRef, Unary, Binary, Call, Window]
+
+# A window function's window: a number of observations or a span of time
+WindowArg = Union[int, WindowSpec]
+
+
+# ---------------------------------------------------------------------------
+# Functions
+
+def _by_row(values: np.ndarray, apply: Callable) -> np.ndarray:
+    """A pandas operation on one series, or on every row of a (series x dates) matrix in one call"""
+    if values.ndim == 1:
+        return apply(pd.Series(values)).to_numpy()
+    return apply(pd.DataFrame(values.T)).to_numpy().T
+
+
+class _StartsIndexer(BaseIndexer):
+    """pandas window bounds from precomputed window starts (each window ends at its own row)"""
+
+    def __init__(self, starts: np.ndarray):
+        super().__init__()
+        self.starts = starts
+
+    def get_window_bounds(self, num_values=0, min_periods=None, center=None, closed=None, step=None):
+        return self.starts.astype(np.int64), np.arange(1, num_values + 1, dtype=np.int64)
+
+
+def _rolling(dates: np.ndarray, values: np.ndarray, window: WindowArg, statistic: Callable) -> np.ndarray:
+    """A rolling statistic over a number of observations, or over a span of time once the series covers it"""
+    if isinstance(window, WindowSpec):
+        business_days = business_daily(dates)
+        indexer = _StartsIndexer(window.starts(dates, business_days))
+        result = _by_row(values, lambda data: statistic(data.rolling(indexer, min_periods=1)))
+        return np.where(window.covered(dates, business_days), result, np.nan)
+    return _by_row(values, lambda data: statistic(data.rolling(window=window, min_periods=window)))
+
+
+def _shift(dates: np.ndarray, values: np.ndarray, window: WindowArg) -> np.ndarray:
+    """Values `window` observations earlier, or as-of one span earlier"""
+    if isinstance(window, WindowSpec):
+        return shift_span(dates, values, window)
+    shifted = np.full(values.shape, np.nan)
+    if 0 < window < values.shape[-1]:
+        shifted[..., window:] = values[..., :-window]
+    return shifted
+
+
+def _zscore(dates: np.ndarray, values: np.ndarray, window: Optional[WindowArg] = None) -> np.ndarray:
+    if window is None:
+        count = np.count_nonzero(~np.isnan(values), axis=-1, keepdims=True)
+        mean = np.nanmean(values, axis=-1, keepdims=True)
+        squares = np.nansum((values - mean) ** 2, axis=-1, keepdims=True)
+        std = np.where(count > 1, np.sqrt(squares / np.maximum(count - 1, 1)), np.nan)
+        return np.where(std == 0, 0.0, (values - mean) / std)
+
+    std = _rolling(dates, values, window, lambda rolling: rolling.std())
+    return (values - _rolling(dates, values, window, lambda rolling: rolling.mean())) / np.where(std == 0, np.nan, std)
+
+
+def _percentile(dates: np.ndarray, values: np.ndarray, window: Optional[WindowArg] = None) -> np.ndarray:
+    if window is None:
+        return _by_row(values, lambda data: data.rank(pct=True)) * 100
+    return _rolling(dates, values, window, lambda rolling: rolling.rank(pct=True)) * 100
+
+
+@dataclass(frozen=True)
+class WindowFunction:
+    """
+    f(series, [window]) evaluated on the series' own observations. The window counts
+    observations ("ma(X, 20)") or, given with a unit, covers a span of time ("ma(X, 20D)",
+    "lag(X, 3M)") as the descriptive windows of core.windows do. apply(dates, values, window)
+    also takes a (series x dates) matrix of series sharing their dates, one row each.
+    """
+    apply: Callable[..., np.ndarray]
+    default_window: Optional[WindowArg]
+    window_required: bool = False
+    # Compares with the value one window earlier (lag/diff/pct/yoy) instead of aggregating the window
+    shifts: bool = False
+
+
+WINDOW_FUNCTIONS: Dict[str, WindowFunction] = {
+    'lag': WindowFunction(lambda d, v, n: _shift(d, v, n), 1, shifts=True),
+    'diff': WindowFunction(lambda d, v, n: v - _shift(d, v, n), 1, shifts=True),
+    'pct': WindowFunction(lambda d, v, n: 100 * (v / _shift(d, v, n) - 1), 1, shifts=True),
+    # A year of time, so yoy() is a year-over-year change whatever the series' frequency
+    'yoy': WindowFunction(lambda d, v, n: 100 * (v / _shift(d, v, n) - 1), WindowSpec(1, 'Y'), shifts=True),
+    'ma': WindowFunction(lambda d, v, n: _rolling(d, v, n, lambda rolling: rolling.mean()), None, window_required=True),
+    'std': WindowFunction(lambda d, v, n: _rolling(d, v, n, lambda rolling: rolling.std()), None, window_required=True),
+    'zscore': WindowFunction(_zscore, None),
+    'percentile': WindowFunction(_percentile, None),
+}
+
+ELEMENTWISE_FUNCTIONS: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    'abs': np.abs,
+    'log': np.log,
+    'exp': np.exp,
+    'sqrt': np.sqrt,
+}
+
+# Take two or more operands, aligned on common dates like arithmetic
+AGGREGATE_FUNCTIONS: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    'avg': lambda stacked: np.mean(stacked, axis=0),
+    'sum': lambda stacked: np.sum(stacked, axis=0),
+    'min': lambda stacked: np.min(stacked, axis=0),
+    'max': lambda stacked: np.max(stacked, axis=0),
+}
+
+# asof(X[, max_age_days]): sample X at the dates of the other operands from its latest
+# observation on or before each date - for mixing frequencies, e.g. "DGS10 - asof(yoy(CPIAUCSL))"
+ALIGNMENT_FUNCTIONS = frozenset({'asof'})
+
+FUNCTION_NAMES = (
+    frozenset(WINDOW_FUNCTIONS) | frozenset(ELEMENTWISE_FUNCTIONS) | frozenset(AGGREGATE_FUNCTIONS) | ALIGNMENT_FUNCTIONS
+)
+
+# A window argument with a unit: 20D, 12W, 3M, 1Y
+_SPAN = re.compile(r'(\d+)([DWMY])', re.IGNORECASE)
+
+# A formula function applied to a series name, e.g. "yoy(CPIAUCSL" - unlike descriptions such as "avg (MA)" or "MA(20)"
+_FUNCTION_CALL = re.compile(r'\b(?:' + '|'.join(sorted(FUNCTION_NAMES)) + r')\(\s*[A-Za-z_\["]', re.IGNORECASE)
+
+
+# ---------------------------------------------------------------------------
+# Parsing
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)(?![A-Za-z0-9_:.])
+      | \[(?P<bracketed>[^\]]+)\]
+      | "(?P<quoted>[^"]+)"
+      | (?P<name>[A-Za-z0-9_][A-Za-z0-9_.:]*)
+      | (?P<op>[-+*/^(),])
+    )""", re.VERBOSE)
+
+
+def _tokenize(text: str) -> List[Tuple[str, str]]:
+    tokens = []
+    position = 0
+    text = text.rstrip()
+
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if not match or match.end() == position:
+            raise FormulaError(f"Unexpected character '{text[position:].strip()[:1]}' at position {position}")
+        kind = match.lastgroup
+        value = match.group(kind)
+        tokens.append(('series' if kind in ('bracketed', 'quoted') else kind, value.strip()))
+        position = match.end()
+
+    return tokens
+
+
+class _Parser:
+    """
+    Recursive descent over:
+        expr  := term (('+' | '-') term)*
+        term  := unary (('*' | '/') unary)*
+        unary := '-' unary | power
+        power := atom ('^' unary)?
+        atom  := number | series | name '(' expr (',' expr)* ')' | '(' expr ')'
+    """
+
+    def __init__(self, tokens: List[Tuple[str, str]], series_ids: Dict[str, str]):
+        self.tokens = tokens
+        self.series_ids = series_ids
+        self.position = 0
+
+    def parse(self) -> Node:
+        if not self.tokens:
+            raise FormulaError("Formula is empty")
+
+        node = self._expr()
+        if self.position < len(self.tokens):
+            raise FormulaError(f"Unexpected '{self.tokens[self.position][1]}' after a complete expression")
+        return node
+
+    def _peek(self) -> Optional[Tuple[str, str]]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _take_op(self, *ops: str) -> Optional[str]:
+        token = self._peek()
+        if token and token[0] == 'op' and token[1] in ops:
+            self.position += 1
+            return token[1]
+        return None
+
+    def _expect(self, op: str) -> None:
+        if not self._take_op(op):
+            token = self._peek()
+            raise FormulaError(f"Expected '{op}' but found {repr(token[1]) if token else 'end of formula'}")
+
+    def _expr(self) -> Node:
+        node = self._term()
+        while (op := self._take_op('+', '-')):
+            node = Binary(op, node, self._term())
+        return node
+
+    def _term(self) -> Node:
+        node = self._unary()
+        while (op := self._take_op('*', '/')):
+            node = Binary(op, node, self._unary())
+        return node
+
+    def _unary(self) -> Node:
+        if self._take_op('-'):
+            operand = self._unary()
+            return Number(-operand.value) if isinstance(operand, Number) else Unary('-', operand)
+        self._take_op('+')
+        return self._power()
+
+    def _power(self) -> Node:
+        node = self._atom()
+        if self._take_op('^'):
+            node = Binary('^', node, self._unary())
+        return node
+
+    def _atom(self) -> Node:
+        token = self._peek()
+        if token is None:
+            raise FormulaError("Formula ends unexpectedly")
+
+        kind, value = token
+        self.position += 1
+
+        if kind == 'number':
+            return Number(float(value))
+
+        if kind == 'op':
+            if value == '(':
+                node = self._expr()
+                self._expect(')')
+                return node
+            raise FormulaError(f"Unexpected '{value}'")
+
+        if kind == 'name' and self._take_op('('):
+            return self._call(value.lower())
+
+        return self._series(value)
+
+    def _series(self, name: str) -> SeriesRef:
+        series_id = self.series_ids.get(name.upper())
+        if series_id is None:
+            if name.lower() in FUNCTION_NAMES:
+                raise FormulaError(f"Function '{name}' needs arguments, e.g. {name.lower()}(SERIES)")
+            raise FormulaError(f"Unknown series '{name}' (indicator series: {', '.join(self.series_ids.values()) or 'none'})")
+        return SeriesRef(series_id)
+
+    def _call(self, name: str) -> Call:
+        if name not in FUNCTION_NAMES:
+            raise FormulaError(f"Unknown function '{name}'")
+
+        args = [self._expr()]
+        while self._take_op(','):
+            args.append(self._window() if name in WINDOW_FUNCTIONS and len(args) == 1 else self._expr())
+        self._expect(')')
+
+        _check_call(name, args)
+        return Call(name, tuple(args))
+
+    def _window(self) -> Node:
+        """A window argument: a span such as 20D, else an expression (a number of observations)"""
+        token = self._peek()
+        match = _SPAN.fullmatch(token[1]) if token and token[0] == 'name' else None
+        if match:
+            self.position += 1
+            return Window(WindowSpec(int(match.group(1)), match.group(2).upper()))
+        return self._expr()
+
+
+def _check_call(name: str, args: List[Node]) -> None:
+    if name in WINDOW_FUNCTIONS:
+        function = WINDOW_FUNCTIONS[name]
+        if len(args) > 2:
+            raise FormulaError(f"{name}() takes a series and an optional window")
+        if function.window_required and len(args) < 2:
+            raise FormulaError(f"{name}() needs a window, e.g. {name}(SERIES, 12) or {name}(SERIES, 20D)")
+        if len(args) == 2:
+            window = args[1]
+            if isinstance(window, Window):
+                if window.spec.count < 1:
+                    raise FormulaError(f"{name}() window must span at least one day, week, month or year")
+            elif not isinstance(window, Number) or window.value != int(window.value) or window.value < 1:
+                raise FormulaError(f"{name}() window must be a positive whole number of observations or a span such as 20D, 3M or 1Y")
+    elif name in ELEMENTWISE_FUNCTIONS:
+        if len(args) != 1:
+            raise FormulaError(f"{name}() takes exactly one argument")
+    elif name in ALIGNMENT_FUNCTIONS:
+        if len(args) > 2:
+            raise FormulaError(f"{name}() takes a series and an optional maximum age in days")
+        if len(args) == 2:
+            max_age = args[1]
+            if not isinstance(max_age, Number) or max_age.value != int(max_age.value) or max_age.value < 0:
+                raise FormulaError(f"{name}() maximum age must be a whole number of days")
+    elif len(args) < 2:
+        raise FormulaError(f"{name}() takes two or more arguments")
+
+
+# ---------------------------------------------------------------------------
+# Evaluation
+
+@dataclass(frozen=True)
+class _Vector:
+    dates: np.ndarray
+    values: np.ndarray
+    # Sampled as-of onto the other operands' dates instead of intersecting with them
+    asof: bool = False
+    max_age_days: Optional[int] = None
+
+
+Value = Union[float, _Vector]
+
+
+def _align(operands: List[Value]) -> Tuple[Optional[np.ndarray], List[Union[float, np.ndarray]], bool]:
+    """
+    Put vector operands on one date axis; scalars pass through
+
+    The axis is the common dates of the regular operands; as-of operands are sampled onto
+    it. Returns (dates or None when all operands are scalars, aligned operands, whether the
+    result is itself as-of because every vector operand was).
+    """
+    vectors = [operand for operand in operands if isinstance(operand, _Vector)]
+    if not vectors:
+        return None, operands, False
+
+    anchors = [vector for vector in vectors if not vector.asof]
+    all_asof = not anchors
+    dates = axis_dates([vector.dates for vector in (vectors if all_asof else anchors)], ALIGN_INNER)
+
+    aligned = []
+    for operand in operands:
+        if isinstance(operand, _Vector):
+            sample_asof = operand.asof and not all_asof
+            aligned.append(take(operand.dates, operand.values, dates, asof=sample_asof, tolerance_days=operand.max_age_days))
+        else:
+            aligned.append(operand)
+    return dates, aligned, all_asof
+
+
+_BINARY = {
+    '+': np.add,
+    '-': np.subtract,
+    '*': np.multiply,
+    '/': np.divide,
+    '^': np.power,
+}
+
+
+def window_argument(call: Call) -> Optional[WindowArg]:
+    """The window a window-function call applies: its own argument, else the function's default"""
+    if len(call.args) > 1:
+        window = call.args[1]
+        return window.spec if isinstance(window, Window) else int(window.value)
+    return WINDOW_FUNCTIONS[call.name].default_window
+
+
+def _evaluate(node: Node, series: Dict[str, ColumnarSeries]) -> Value:
+    if isinstance(node, Number):
+        return node.value
+
+    if isinstance(node, SeriesRef):
+        data = series.get(node.series_id)
+        if data is None or not len(data):
+            raise FormulaError(f"No data for series '{node.series_id}'")
+        return _Vector(data.dates, data.values)
+
+    if isinstance(node, Unary):
+        operand = _evaluate(node.operand, series)
+        return -operand if not isinstance(operand, _Vector) else replace(operand, values=-operand.values)
+
+    if isinstance(node, Binary):
+        dates, (left, right), asof = _align([_evaluate(node.left, series), _evaluate(node.right, series)])
+        result = _BINARY[node.op](left, right)
+        return float(result) if dates is None else _Vector(dates, result, asof)
+
+    name = node.name
+
+    if name in WINDOW_FUNCTIONS:
+        target = _evaluate(node.args[0], series)
+        if not isinstance(target, _Vector):
+            raise FormulaError(f"{name}() needs a series, not a number")
+        values = WINDOW_FUNCTIONS[name].apply(target.dates, target.values, window_argument(node))
+        return replace(target, values=values)
+
+    operands = [_evaluate(arg, series) for arg in node.args]
+
+    if name in ELEMENTWISE_FUNCTIONS:
+        target = operands[0]
+        if not isinstance(target, _Vector):
+            return float(ELEMENTWISE_FUNCTIONS[name](target))
+        return replace(target, values=ELEMENTWISE_FUNCTIONS[name](target.values))
+
+    if name in ALIGNMENT_FUNCTIONS:
+        target = operands[0]
+        if not isinstance(target, _Vector):
+            raise FormulaError(f"{name}() needs a series, not a number")
+        return replace(target, asof=True, max_age_days=int(operands[1]) if len(operands) > 1 else None)
+
+    dates, aligned, asof = _align(operands)
+    if dates is None:
+        return float(AGGREGATE_FUNCTIONS[name](np.array(aligned)))
+    stacked = np.vstack([np.broadcast_to(value, len(dates)) for value in aligned])
+    return _Vector(dates, AGGREGATE_FUNCTIONS[name](stacked), asof)
+
+
+@dataclass(frozen=True)
+class FormulaPlan:
+    """A compiled calculation: the expression tree and the series it reads"""
+    text: str
+    expression: Node
+    series_ids: Tuple[str, ...]
+
+    def evaluate(self, series: Dict[str, ColumnarSeries], result_id: str = 'result') -> ColumnarSeries:
+        """Evaluate over the given series; dates where the result is missing or not finite are dropped"""
+        with np.errstate(all='ignore'):
+            result = _evaluate(self.expression, series)
+
+        if not isinstance(result, _Vector):
+            raise FormulaError(f"Formula '{self.text}' does not reference any series")
+
+        values = np.asarray(result.values, dtype=np.float64)
+        finite = np.isfinite(values)
+        return ColumnarSeries(result_id, result.dates[finite], values[finite])
+
+    def lookback(self) -> Optional[Lookback]:
+        """History of its inputs each output reads, None when outputs depend on the full history"""
+        return _lookback(self.expression)
+
+
+def _lookback(node: Node) -> Optional[Lookback]:
+    if isinstance(node, (Number, SeriesRef)):
+        return Lookback()
+    if isinstance(node, Unary):
+        return _lookback(node.operand)
+
+    if isinstance(node, Binary):
+        operands = [node.left, node.right]
+    elif node.name in AGGREGATE_FUNCTIONS:
+        operands = list(node.args)
+    else:
+        # The remaining arguments are constants (window, maximum age)
+        operands = [node.args[0]]
+
+    lookbacks = [_lookback(operand) for operand in operands]
+    if any(lookback is None for lookback in lookbacks):
+        return None
+    combined = Lookback()
+    for lookback in lookbacks:
+        combined = combined.union(lookback)
+
+    if isinstance(node, Call) and node.name in WINDOW_FUNCTIONS:
+        function = WINDOW_FUNCTIONS[node.name]
+        window = window_argument(node)
+        if window is None:
+            # zscore() / percentile() over the whole series
+            return None
+        if isinstance(window, WindowSpec):
+            # A shift matches as-of, up to one more span back
+            return combined.then(Lookback(days=window.span_days() * (2 if function.shifts else 1)))
+        # A rolling window includes the current observation, a shift reads the one `window` back
+        return combined.then(Lookback(observations=window - (0 if function.shifts else 1)))
+    if isinstance(node, Call) and node.name in ALIGNMENT_FUNCTIONS:
+        # The latest observation on or before each date may be an earlier one
+        max_age = int(node.args[1].value) if len(node.args) > 1 else 0
+        return combined.then(Lookback(observations=1, days=max_age))
+    return combined
+
+
+def _referenced_series(node: Node) -> List[str]:
+    if isinstance(node, SeriesRef):
+        return [node.series_id]
+    if isinstance(node, Unary):
+        return _referenced_series(node.operand)
+    if isinstance(node, Binary):
+        return _referenced_series(node.left) + _referenced_series(node.right)
+    if isinstance(node, Call):
+        return [series_id for arg in node.args for series_id in _referenced_series(arg)]
+    return []
+
+
+@lru_cache(maxsize=2048)
+def _compile_cached(text: str, series_ids: Tuple[str, ...]) -> Union[FormulaPlan, str]:
+    # Failures are cached too (as their message): descriptive calculations ("Level",
+    # "3-month average") are looked up on every fetch and never parse
+    try:
+        body = text.strip()
+        if body.startswith('='):
+            body = body[1:]
+
+        expression = _Parser(_tokenize(body), {sid.upper(): sid for sid in series_ids}).parse()
+        referenced = tuple(dict.fromkeys(_referenced_series(expression)))
+        if not referenced:
+            raise FormulaError("Formula does not reference any series")
+
+        return FormulaPlan(text=text, expression=expression, series_ids=referenced)
+    except FormulaError as e:
+        return str(e)
+
+
+def compile_formula(text: str, series_ids: Tuple[str, ...]) -> FormulaPlan:
+    """
+    Compile a calculation string against an indicator's series IDs (cached per text and series)
+
+    Raises:
+        FormulaError: When the text is not a formula over these series
+    """
+    result = _compile_cached(str(text), tuple(series_ids))
+    if isinstance(result, str):
+        # A fresh exception per call - re-raising a cached one would keep growing its
+        # traceback and hold on to every earlier caller's frames
+        raise FormulaError(result)
+    return result
+
+
+def looks_like_formula(text: Optional[str]) -> bool:
+    """
+    True for calculation strings meant as formulas (leading '=' or a formula function called
+    on a series); other text is a description handled by the keyword-based calculations
+    """
+    if not text:
+        return False
+    text = str(text).strip()
+    return text.startswith('=') or bool(_FUNCTION_CALL.search(text))
+
+
+def validate_formula(text: Optional[str], series_ids: Tuple[str, ...]) -> Optional[str]:
+    """Error message for a formula that does not compile, None for valid formulas and descriptive text"""
+    if not looks_like_formula(text):
+        return None
+    try:
+        compile_formula(str(text).strip(), series_ids)
+        return None
+    except FormulaError as e:
+        return str(e)
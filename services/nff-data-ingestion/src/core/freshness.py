@@ -0,0 +1,156 @@
+"""
+Freshness Planner
+Decides which indicators are due for a fetch from their series' release frequency and last upstream update
+"""
+
+import logging
+from dataclasses import dataclass, asdict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Release cadence per frequency code (FRED's frequency_short codes)
+FREQUENCY_PERIODS = {
+    'D': timedelta(days=1),
+    'W': timedelta(days=7),
+    'BW': timedelta(days=14),
+    'M': timedelta(days=30),
+    'Q': timedelta(days=91),
+    'SA': timedelta(days=182),
+    'A': timedelta(days=365),
+}
+
+# Upper bound on median observation spacing (days) for each frequency, in ascending order
+_SPACING_LIMITS = [(3, 'D'), (10, 'W'), (20, 'BW'), (45, 'M'), (120, 'Q'), (240, 'SA')]
+
+# Once a release is overdue, how often to look again at most
+MAX_RECHECK_INTERVAL = timedelta(days=1)
+
+# Decision reasons
+FORCE_REFRESH = 'force_refresh'
+NEVER_FETCHED = 'never_fetched'
+LAST_RUN_FAILED = 'last_run_failed'
+MAX_AGE_EXCEEDED = 'max_age_exceeded'
+RELEASE_DUE = 'release_due'
+AWAITING_RELEASE = 'awaiting_release'
+RECENTLY_CHECKED = 'recently_checked'
+UNKNOWN_FREQUENCY_STALE = 'unknown_frequency_stale'
+UNKNOWN_FREQUENCY_RECENT = 'unknown_frequency_recent'
+
+
+def infer_frequency(observation_dates: List[date]) -> Optional[str]:
+    """Frequency code from the median spacing of the latest observations, None with fewer than two"""
+    recent = sorted(set(observation_dates))[-25:]
+    if len(recent) < 2:
+        return None
+
+    gaps = sorted((later - earlier).days for earlier, later in zip(recent, recent[1:]))
+    median_gap = gaps[len(gaps) // 2]
+
+    for limit, frequency in _SPACING_LIMITS:
+        if median_gap <= limit:
+            return frequency
+    return 'A'
+
+
+def parse_last_updated(value: Optional[str]) -> Optional[datetime]:
+    """Parse an upstream last_updated stamp such as FRED's '2024-04-10 07:48:02-05' (offset dropped)"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value)[:19])
+    except ValueError:
+        return None
+
+
+@dataclass
+class FreshnessDecision:
+    """Whether one indicator is fetched in this job, and why"""
+    due: bool
+    reason: str
+    next_due_at: Optional[datetime] = None
+    frequency: Optional[str] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        result = asdict(self)
+        result['next_due_at'] = self.next_due_at.isoformat() if self.next_due_at else None
+        return result
+
+
+class FreshnessPlanner:
+    """
+    Schedules an indicator only when one of its series can have published new data.
+
+    The next release of a series is expected one period after it was last released: the
+    later of its upstream last_updated stamp and the time a new observation or stamp was
+    first stored (the watermark's changedAt), or the indicator's last successful fetch when
+    neither is known. The observation date itself is never the anchor - it is the start of
+    the period, and releases come out well after that. An overdue release is re-checked at
+    most every quarter period (capped at a day). Indicators whose series frequency is not
+    known yet fall back to a fixed refetch interval.
+    """
+
+    def __init__(self, fallback_days: int = 7, max_age_days: int = 90):
+        self.fallback_interval = timedelta(days=fallback_days)
+        self.max_age = timedelta(days=max_age_days)
+
+    def decide(
+        self,
+        indicator: Dict[str, Any],
+        series_states: List[Dict[str, Any]],
+        force_refresh: bool = False,
+        now: Optional[datetime] = None
+    ) -> FreshnessDecision:
+        """
+        Args:
+            indicator: IndicatorMetadata row (etlStatus, lastEtlRunAt, lastSuccessfulAt)
+            series_states: SeriesWatermark rows of the indicator's series ({} for a series without one)
+        """
+        now = now or datetime.now()
+        last_run = indicator.get('lastEtlRunAt')
+
+        if force_refresh:
+            return FreshnessDecision(True, FORCE_REFRESH)
+        if last_run is None:
+            return FreshnessDecision(True, NEVER_FETCHED)
+        if indicator.get('etlStatus') in ('UNKNOWN', 'ERROR'):
+            return FreshnessDecision(True, LAST_RUN_FAILED)
+        if now - last_run >= self.max_age:
+            return FreshnessDecision(True, MAX_AGE_EXCEEDED)
+
+        frequencies = [state.get('frequency') for state in series_states]
+        if not series_states or not all(frequency in FREQUENCY_PERIODS for frequency in frequencies):
+            next_due_at = last_run + self.fallback_interval
+            if now >= next_due_at:
+                return FreshnessDecision(True, UNKNOWN_FREQUENCY_STALE, next_due_at)
+            return FreshnessDecision(False, UNKNOWN_FREQUENCY_RECENT, next_due_at)
+
+        next_due_at = None
+        shortest_period = None
+        for state, frequency in zip(series_states, frequencies):
+            period = FREQUENCY_PERIODS[frequency]
+            released = [
+                stamp for stamp in (parse_last_updated(state.get('upstreamLastUpdated')), state.get('changedAt'))
+                if stamp is not None
+            ]
+            anchor = max(released) if released else indicator.get('lastSuccessfulAt') or last_run
+            series_due_at = anchor + period
+
+            if next_due_at is None or series_due_at < next_due_at:
+                next_due_at = series_due_at
+            if shortest_period is None or period < shortest_period:
+                shortest_period = period
+
+        frequency = min(frequencies, key=lambda code: FREQUENCY_PERIODS[code])
+
+        if now < next_due_at:
+            return FreshnessDecision(False, AWAITING_RELEASE, next_due_at, frequency)
+
+        if last_run >= next_due_at:
+            # Already looked after the release was expected and nothing new arrived yet
+            recheck_at = last_run + min(shortest_period / 4, MAX_RECHECK_INTERVAL)
+            if now < recheck_at:
+                return FreshnessDecision(False, RECENTLY_CHECKED, recheck_at, frequency)
+
+        return FreshnessDecision(True, RELEASE_DUE, next_due_at, frequency)
@@ -0,0 +1,69 @@
+"""
+Shared HTTP Client
+One pooled httpx.AsyncClient per process so upstream requests reuse keep-alive connections
+"""
+
+import asyncio
+import importlib.util
+import logging
+from typing import Optional
+
+import httpx
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPClientManager:
+    """
+    Owns the process-wide httpx.AsyncClient.
+
+    The client is created on first use and closed on app shutdown. An AsyncClient is bound
+    to the event loop it was created on, so a client from a loop that is gone (scripts that
+    call asyncio.run more than once) is replaced rather than reused.
+    """
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def get_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            self._client = self._create_client()
+            self._loop = loop
+
+        return self._client
+
+    def _create_client(self) -> httpx.AsyncClient:
+        http2 = settings.HTTP_CLIENT_HTTP2
+        if http2 and importlib.util.find_spec('h2') is None:
+            logger.warning("HTTP_CLIENT_HTTP2 is set but the 'h2' package is not installed; using HTTP/1.1")
+            http2 = False
+
+        limits = httpx.Limits(
+            max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_CLIENT_MAX_KEEPALIVE,
+            keepalive_expiry=settings.HTTP_CLIENT_KEEPALIVE_EXPIRY
+        )
+
+        logger.info(
+            f"Shared HTTP client created (max_connections={limits.max_connections}, "
+            f"keepalive={limits.max_keepalive_connections}, http2={http2})"
+        )
+        return httpx.AsyncClient(
+            limits=limits,
+            timeout=httpx.Timeout(settings.HTTP_CLIENT_TIMEOUT),
+            http2=http2,
+            follow_redirects=True
+        )
+
+    async def close(self) -> None:
+        client, self._client, self._loop = self._client, None, None
+        if client is not None and not client.is_closed:
+            await client.aclose()
+
+
+http_client = HTTPClientManager()
@@ -0,0 +1,231 @@
+"""
+ETL Job Executor
+Runs indicator fetches concurrently with per-source concurrency and request budgets
+"""
+
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass, asdict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SourceBudget:
+    """Concurrency and request-rate budget for a single upstream source"""
+    max_concurrency: int = 2
+    requests_per_minute: Optional[int] = None
+    # Token bucket size of the shared rate limiter; defaults to max_concurrency
+    burst: Optional[int] = None
+
+
+# FRED allows ~120 requests/minute per key, keep some headroom.
+# Shiller is a single workbook download, running it wider buys nothing.
+# CFTC serves one bulk file per year; a few in parallel cover a history backfill.
+# TradingEconomics allows about one request per second per key; requests carry many symbols.
+DEFAULT_SOURCE_BUDGETS: Dict[str, SourceBudget] = {
+    'fred': SourceBudget(max_concurrency=4, requests_per_minute=100, burst=8),
+    'shiller': SourceBudget(max_concurrency=1),
+    'cftc': SourceBudget(max_concurrency=2),
+    'tradingeconomics': SourceBudget(max_concurrency=2, requests_per_minute=50, burst=1),
+}
+
+DEFAULT_BUDGET_KEY = 'default'
+
+# Sources whose fetchers take every request from the shared token bucket (core/rate_limiter.py),
+# which already enforces requests_per_minute across jobs and replicas - their lanes are not paced again
+RATE_LIMITED_SOURCES = frozenset({'fred', 'tradingeconomics'})
+
+
+@dataclass
+class JobTally:
+    """Final counts of an ETL job run"""
+    successful: int = 0
+    failed: int = 0
+    blocked: int = 0
+    skipped: int = 0
+
+    @property
+    def processed(self) -> int:
+        return self.successful + self.failed + self.blocked + self.skipped
+
+    def record(self, status: Optional[str]) -> None:
+        if status == 'OK':
+            self.successful += 1
+        elif status == 'BLOCKED':
+            self.blocked += 1
+        elif status == 'SKIPPED':
+            self.skipped += 1
+        else:
+            self.failed += 1
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+def get_source_key(source: Optional[str]) -> str:
+    """Map an indicator source to its budget key (same matching as DataFetcherFactory)"""
+    source_lower = (source or '').strip().lower()
+
+    if 'fred' in source_lower:
+        return 'fred'
+    elif 'shiller' in source_lower:
+        return 'shiller'
+    elif 'cftc' in source_lower:
+        return 'cftc'
+    elif 'tradingeconomics' in source_lower.replace(' ', ''):
+        return 'tradingeconomics'
+
+    return source_lower or DEFAULT_BUDGET_KEY
+
+
+def load_source_budgets() -> Dict[str, SourceBudget]:
+    """
+    Build source budgets from defaults plus the ETL_SOURCE_BUDGETS override, e.g.
+    {"fred": {"max_concurrency": 6, "requests_per_minute": 110}, "tradingeconomics": {"max_concurrency": 1}}
+    """
+    budgets = {key: SourceBudget(**asdict(budget)) for key, budget in DEFAULT_SOURCE_BUDGETS.items()}
+
+    if settings.ETL_SOURCE_BUDGETS:
+        try:
+            overrides = json.loads(settings.ETL_SOURCE_BUDGETS)
+            for key, values in overrides.items():
+                base = asdict(budgets.get(key.lower(), SourceBudget()))
+                base.update(values or {})
+                budgets[key.lower()] = SourceBudget(**base)
+        except Exception as e:
+            logger.error(f"Invalid ETL_SOURCE_BUDGETS, using defaults: {e}")
+
+    return budgets
+
+
+class _RequestPacer:
+    """Spaces out request starts to stay within a requests-per-minute budget (sources without a shared rate limiter)"""
+
+    def __init__(self, requests_per_minute: Optional[int]):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self._next_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, cost: int = 1) -> float:
+        if not self.interval or cost <= 0:
+            return 0.0
+
+        async with self._lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_at)
+            self._next_at = start_at + self.interval * cost
+
+        wait = start_at - now
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+class ETLJobExecutor:
+    """
+    Runs a handler for many indicators concurrently.
+
+    Each source gets its own lane of workers (sized by its budget) so a slow source
+    only ever occupies its own slots; a global worker count caps total concurrency.
+    """
+
+    def __init__(
+        self,
+        worker_count: Optional[int] = None,
+        budgets: Optional[Dict[str, SourceBudget]] = None
+    ):
+        self.worker_count = max(1, worker_count or settings.ETL_WORKER_COUNT)
+        self.budgets = budgets if budgets is not None else load_source_budgets()
+
+    def get_budget(self, source_key: str) -> SourceBudget:
+        return self.budgets.get(source_key) or self.budgets.get(DEFAULT_BUDGET_KEY) or SourceBudget()
+
+    async def run(
+        self,
+        job_id: str,
+        items: List[Dict[str, Any]],
+        handler: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+    ) -> JobTally:
+        """
+        Run handler(item) for every item and tally the returned statuses
+
+        Args:
+            job_id: Job ID used for progress logging
+            items: Indicator dicts, each with at least 'id' and 'source' ('requestCost' or the 'seriesIDs' count is used as request cost)
+            handler: Coroutine returning a result dict with a 'status' key
+        """
+        tally = JobTally()
+        total = len(items)
+        if total == 0:
+            return tally
+
+        lanes: Dict[str, List[Dict[str, Any]]] = {}
+        for item in items:
+            lanes.setdefault(get_source_key(item.get('source')), []).append(item)
+
+        global_slots = asyncio.Semaphore(self.worker_count)
+        started_at = time.monotonic()
+
+        logger.info(
+            f"[ETL EXECUTOR] Job {job_id}: {total} indicators across sources "
+            f"{ {key: len(lane) for key, lane in lanes.items()} } with {self.worker_count} workers"
+        )
+
+        async def lane_worker(source_key: str, queue: List[Dict[str, Any]], pacer: _RequestPacer):
+            while queue:
+                item = queue.pop(0)
+                indicator_id = item.get('id')
+                indicator_name = item.get('indicatorEN', 'Unknown')
+
+                await pacer.acquire(self._request_cost(item))
+
+                async with global_slots:
+                    try:
+                        result = await handler(item)
+                        status = result.get('status') if result else None
+
+                        if status == 'ERROR':
+                            logger.warning(f"[ETL JOB] ✗ Indicator {indicator_id} ({indicator_name}) - FAILED: {result.get('error_message', 'Unknown error')}")
+                        else:
+                            logger.debug(f"[ETL JOB] Indicator {indicator_id} ({indicator_name}) - {status}")
+                    except Exception as e:
+                        logger.error(f"[ETL JOB] ✗ Error processing indicator {indicator_id} ({indicator_name}): {e}", exc_info=True)
+                        status = 'ERROR'
+
+                tally.record(status)
+
+                if tally.processed % 50 == 0 or tally.processed == total:
+                    logger.info(
+                        f"[ETL JOB] Progress: {tally.processed}/{total} (Success: {tally.successful}, "
+                        f"Failed: {tally.failed}, Blocked: {tally.blocked})"
+                    )
+
+        workers = []
+        for source_key, queue in lanes.items():
+            budget = self.get_budget(source_key)
+            pacer = _RequestPacer(None if source_key in RATE_LIMITED_SOURCES else budget.requests_per_minute)
+            lane_size = max(1, min(budget.max_concurrency, len(queue)))
+            workers.extend(lane_worker(source_key, queue, pacer) for _ in range(lane_size))
+
+        await asyncio.gather(*workers)
+
+        logger.info(
+            f"[ETL EXECUTOR] Job {job_id} finished in {time.monotonic() - started_at:.1f}s: "
+            f"Success={tally.successful}, Failed={tally.failed}, Blocked={tally.blocked}, Skipped={tally.skipped}"
+        )
+        return tally
+
+    @staticmethod
+    def _request_cost(item: Dict[str, Any]) -> int:
+        if item.get('requestCost') is not None:
+            # Planner-assigned cost; 0 when every series is already fetched by another item
+            return max(0, int(item['requestCost']))
+
+        series_ids = item.get('seriesIDs') or ''
+        return max(1, len([s for s in series_ids.split('|') if s.strip()]))
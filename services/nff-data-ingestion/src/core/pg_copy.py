@@ -0,0 +1,80 @@
+"""
+PostgreSQL binary COPY encoder
+Builds a COPY ... FROM STDIN (FORMAT binary) stream for psycopg2's copy_expert
+"""
+
+import io
+import struct
+from datetime import date, datetime
+from typing import Any, Iterable, List, Sequence
+
+PG_EPOCH = date(2000, 1, 1).toordinal()
+
+COPY_HEADER = b'PGCOPY\n\xff\r\n\x00' + struct.pack('!ii', 0, 0)
+COPY_TRAILER = struct.pack('!h', -1)
+
+_NULL = struct.pack('!i', -1)
+_INT2 = struct.Struct('!h')
+_INT4_FIELD = struct.Struct('!ii')
+_FLOAT8_FIELD = struct.Struct('!id')
+_BOOL_TRUE = struct.pack('!i?', 1, True)
+_BOOL_FALSE = struct.pack('!i?', 1, False)
+
+
+def _encode_date(value: Any) -> bytes:
+    if isinstance(value, datetime):
+        value = value.date()
+    elif isinstance(value, str):
+        value = date.fromisoformat(value[:10])
+    return _INT4_FIELD.pack(4, value.toordinal() - PG_EPOCH)
+
+
+def _encode_float8(value: Any) -> bytes:
+    return _FLOAT8_FIELD.pack(8, float(value))
+
+
+def _encode_int4(value: Any) -> bytes:
+    return _INT4_FIELD.pack(4, int(value))
+
+
+def _encode_bool(value: Any) -> bytes:
+    return _BOOL_TRUE if value else _BOOL_FALSE
+
+
+def _encode_text(value: Any) -> bytes:
+    data = str(value).encode('utf-8')
+    return struct.pack('!i', len(data)) + data
+
+
+ENCODERS = {
+    'date': _encode_date,
+    'float8': _encode_float8,
+    'int4': _encode_int4,
+    'bool': _encode_bool,
+    'text': _encode_text,
+}
+
+
+def encode_binary_copy(rows: Iterable[Sequence[Any]], column_types: List[str]) -> io.BytesIO:
+    """
+    Encode rows in PostgreSQL's binary COPY format
+
+    Args:
+        rows: Row tuples, values in the same order as column_types (None is written as NULL)
+        column_types: One of 'date', 'float8', 'int4', 'bool', 'text' per column
+    """
+    encoders = [ENCODERS[column_type] for column_type in column_types]
+    field_count = _INT2.pack(len(encoders))
+
+    buffer = io.BytesIO()
+    buffer.write(COPY_HEADER)
+
+    write = buffer.write
+    for row in rows:
+        write(field_count)
+        for encode, value in zip(encoders, row):
+            write(_NULL if value is None else encode(value))
+
+    write(COPY_TRAILER)
+    buffer.seek(0)
+    return buffer
@@ -0,0 +1,260 @@
+"""
+Upstream Rate Limiter
+Redis-backed token buckets per (source, API key), shared by every process and replica that calls the same upstream
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import redis.asyncio as aioredis
+
+from config import settings
+from core.job_executor import load_source_budgets
+
+logger = logging.getLogger(__name__)
+
+# Refill-and-take in one atomic step, on Redis server time so replica clock skew does not matter.
+# Returns the seconds the caller has to wait before retrying; tokens are only taken when that is 0.
+_ACQUIRE_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local wait = 0
+if tokens >= requested then
+    tokens = tokens - requested
+else
+    wait = (requested - tokens) / rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 60)
+return tostring(wait)
+"""
+
+# Push the bucket into debt so every holder of the key pauses for `delay` seconds (after a 429)
+_DRAIN_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local rate = tonumber(ARGV[1])
+local delay = tonumber(ARGV[2])
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(-delay * rate), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(delay) + 60)
+return 1
+"""
+
+# After a Redis error, use the local bucket for this long before trying Redis again
+REDIS_RETRY_AFTER_SECONDS = 30.0
+
+
+class _LocalBucket:
+    """In-process token bucket, used when Redis is disabled or unreachable"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def take(self, requested: float) -> float:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+        if self.tokens >= requested:
+            self.tokens -= requested
+            return 0.0
+        return (requested - self.tokens) / self.rate
+
+    def drain(self, delay: float) -> None:
+        self.tokens = -delay * self.rate
+        self.updated_at = time.monotonic()
+
+
+class TokenBucketLimiter:
+    """
+    Token bucket for one upstream source and API key.
+
+    The bucket lives in Redis so all replicas draw from the same budget; if Redis
+    is unavailable the limiter degrades to a per-process bucket rather than failing
+    the fetch.
+    """
+
+    def __init__(self, manager: 'RateLimiterManager', source_key: str, identity: str, requests_per_minute: int, burst: int):
+        self.manager = manager
+        self.source_key = source_key
+        self.redis_key = f"{settings.RATE_LIMIT_KEY_PREFIX}:{source_key}:{identity}"
+        self.rate = requests_per_minute / 60.0
+        self.capacity = float(max(1, burst))
+        self._local = _LocalBucket(self.rate, self.capacity)
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'acquisitions': 0,
+            'waits': 0,
+            'total_wait_ms': 0.0,
+            'max_wait_ms': 0.0,
+            'throttled_responses': 0,
+            'total_backoff_ms': 0.0,
+            'local_fallbacks': 0,
+        }
+
+    async def acquire(self, tokens: int = 1) -> float:
+        """Wait until `tokens` requests may be sent; returns the seconds spent waiting"""
+        started = time.monotonic()
+
+        while True:
+            wait = await self._take(tokens)
+            if wait <= 0:
+                break
+            await asyncio.sleep(wait)
+
+        waited = time.monotonic() - started
+        self._record_acquire(waited)
+        return waited
+
+    async def throttled(self, delay: float) -> None:
+        """Upstream answered 429 - pause every user of this bucket for `delay` seconds"""
+        with self._stats_lock:
+            self._stats['throttled_responses'] += 1
+            self._stats['total_backoff_ms'] += delay * 1000
+
+        client = self.manager.get_redis()
+        if client is not None:
+            try:
+                await client.eval(_DRAIN_SCRIPT, 1, self.redis_key, self.rate, delay)
+                return
+            except Exception as e:
+                self.manager.redis_failed(e)
+
+        self._local.drain(delay)
+
+    async def _take(self, tokens: int) -> float:
+        client = self.manager.get_redis()
+        if client is not None:
+            try:
+                return float(await client.eval(_ACQUIRE_SCRIPT, 1, self.redis_key, self.rate, self.capacity, tokens))
+            except Exception as e:
+                self.manager.redis_failed(e)
+
+        if self.manager.redis_enabled:
+            with self._stats_lock:
+                self._stats['local_fallbacks'] += 1
+        return self._local.take(tokens)
+
+    def _record_acquire(self, waited: float) -> None:
+        wait_ms = waited * 1000
+        with self._stats_lock:
+            self._stats['acquisitions'] += 1
+            if wait_ms >= 1:
+                self._stats['waits'] += 1
+            self._stats['total_wait_ms'] += wait_ms
+            self._stats['max_wait_ms'] = max(self._stats['max_wait_ms'], wait_ms)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Token wait and 429 back-off statistics"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+
+        acquisitions = stats['acquisitions']
+        return {
+            'source': self.source_key,
+            'requests_per_minute': round(self.rate * 60, 3),
+            'burst': int(self.capacity),
+            'acquisitions': acquisitions,
+            'waits': stats['waits'],
+            'avg_wait_ms': round(stats['total_wait_ms'] / acquisitions, 3) if acquisitions else 0.0,
+            'max_wait_ms': round(stats['max_wait_ms'], 3),
+            'total_wait_ms': round(stats['total_wait_ms'], 3),
+            'throttled_responses': stats['throttled_responses'],
+            'total_backoff_ms': round(stats['total_backoff_ms'], 3),
+            'local_fallbacks': stats['local_fallbacks'],
+        }
+
+
+class RateLimiterManager:
+    """
+    Owns the limiters of every (source, API key) pair and the async Redis client they share.
+
+    Like the shared HTTP client, the Redis client is bound to the event loop it was
+    created on and is replaced when used from a new loop.
+    """
+
+    def __init__(self):
+        self._limiters: Dict[Tuple[str, str], TokenBucketLimiter] = {}
+        self._redis: Optional[aioredis.Redis] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._redis_down_until = 0.0
+
+    def get_limiter(self, source_key: str, api_key: Optional[str] = None) -> Optional[TokenBucketLimiter]:
+        """Limiter for a source/key, or None when the source has no requests-per-minute budget"""
+        # Only a digest of the key ends up in Redis key names and logs
+        identity = hashlib.sha256((api_key or '').encode()).hexdigest()[:16] if api_key else 'shared'
+        key = (source_key, identity)
+
+        if key not in self._limiters:
+            budget = load_source_budgets().get(source_key)
+            if not budget or not budget.requests_per_minute:
+                return None
+
+            self._limiters[key] = TokenBucketLimiter(
+                self,
+                source_key,
+                identity,
+                budget.requests_per_minute,
+                budget.burst or budget.max_concurrency
+            )
+
+        return self._limiters[key]
+
+    @property
+    def redis_enabled(self) -> bool:
+        return settings.RATE_LIMIT_BACKEND.lower() == 'redis'
+
+    def get_redis(self) -> Optional[aioredis.Redis]:
+        if not self.redis_enabled or time.monotonic() < self._redis_down_until:
+            return None
+
+        loop = asyncio.get_running_loop()
+        if self._redis is None or self._loop is not loop:
+            self._redis = aioredis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+            self._loop = loop
+
+        return self._redis
+
+    def redis_failed(self, error: Exception) -> None:
+        if time.monotonic() >= self._redis_down_until:
+            logger.warning(
+                f"Rate limiter Redis unavailable, using per-process buckets for "
+                f"{REDIS_RETRY_AFTER_SECONDS:.0f}s: {error}"
+            )
+        self._redis_down_until = time.monotonic() + REDIS_RETRY_AFTER_SECONDS
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'backend': settings.RATE_LIMIT_BACKEND.lower(),
+            'redis_available': time.monotonic() >= self._redis_down_until,
+            'limiters': [limiter.get_stats() for limiter in self._limiters.values()],
+        }
+
+    async def close(self) -> None:
+        client, self._redis, self._loop = self._redis, None, None
+        if client is not None:
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.debug(f"Error closing rate limiter Redis client: {e}")
+
+
+rate_limiters = RateLimiterManager()
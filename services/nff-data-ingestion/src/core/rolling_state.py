@@ -0,0 +1,212 @@
+"""
+Rolling Calculation State
+The tail of an indicator's inputs a calculation needs to extend its result with new observations, instead of recomputing full history
+"""
+
+import hashlib
+import json
+import struct
+import zlib
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from core.columnar import ColumnarSeries
+
+# Bumped whenever calculation semantics change, so states captured by older code are not resumed
+STATE_VERSION = 2
+
+# Leads every payload so the layout can change without misreading old states
+PAYLOAD_FORMAT = b'ROLL1'
+
+# Extra observations kept beyond the lookback, for inputs that are aligned before a window applies
+TAIL_MARGIN = 0.25
+
+
+@dataclass(frozen=True)
+class Lookback:
+    """
+    How far back of each input an output reaches: this many earlier observations and
+    calendar days before its own date. Lookbacks of nested operations add up, those of
+    operands combined on common dates take the maximum.
+    """
+    observations: int = 0
+    days: int = 0
+
+    def then(self, other: 'Lookback') -> 'Lookback':
+        return Lookback(self.observations + other.observations, self.days + other.days)
+
+    def union(self, other: 'Lookback') -> 'Lookback':
+        return Lookback(max(self.observations, other.observations), max(self.days, other.days))
+
+
+def state_key(calculation: str, series_ids: str) -> str:
+    """Identifies the calculation a state belongs to; a changed calculation or series list starts over"""
+    return hashlib.sha256(f"{STATE_VERSION}|{calculation}|{series_ids}".encode()).hexdigest()[:32]
+
+
+def _cutoff(series: ColumnarSeries, resume_from: date, lookback: Lookback) -> Optional[np.datetime64]:
+    """Earliest date an output on or after resume_from can read, None when the series has too few observations before it"""
+    position = int(np.searchsorted(series.dates, np.datetime64(resume_from, 'D'), side='left'))
+    observations = lookback.observations + int(np.ceil(lookback.observations * TAIL_MARGIN))
+    if position < observations:
+        return None
+
+    cutoff = np.datetime64(resume_from - timedelta(days=lookback.days), 'D')
+    if observations:
+        cutoff = min(cutoff, series.dates[position - observations])
+    return cutoff
+
+
+@dataclass(frozen=True)
+class RollingState:
+    """
+    An indicator's inputs from the earliest date its next incremental update can need,
+    with the last calculated value to check a resumed calculation against.
+
+    The tails hold every observation on or after held_from. complete holds the inputs
+    whose tail is their full history (short series), which covers any resume date.
+    """
+    key: str
+    lookback: Lookback
+    components: Dict[str, ColumnarSeries]
+    held_from: date
+    last_output_date: date
+    last_output_value: float
+    complete: frozenset = field(default_factory=frozenset)
+
+    @classmethod
+    def capture(
+        cls,
+        key: str,
+        inputs: Dict[str, ColumnarSeries],
+        output: ColumnarSeries,
+        lookback: Lookback,
+        revision_days: int,
+        full_history: Iterable[str] = ()
+    ) -> Optional['RollingState']:
+        """
+        Keep what an update resuming revision_days before the last observation will read
+
+        Args:
+            inputs: The calculation's input series
+            output: Its result
+            full_history: Inputs that hold the series' full history
+        """
+        if not len(output) or not inputs or any(not len(series) for series in inputs.values()):
+            return None
+
+        full_history = set(full_history)
+        # All inputs are cut at one date, so operands aligned on common dates keep the same history
+        cutoffs = []
+        complete = set()
+        for series_id, series in inputs.items():
+            cutoff = _cutoff(series, series.last_date - timedelta(days=revision_days), lookback)
+            if cutoff is None or cutoff < series.dates[0]:
+                cutoff = series.dates[0]
+                if series_id in full_history:
+                    complete.add(series_id)
+            cutoffs.append(cutoff)
+        cutoff = min(cutoffs).item()
+
+        return cls(
+            key=key,
+            lookback=lookback,
+            components={series_id: series.slice(cutoff) for series_id, series in inputs.items()},
+            held_from=cutoff,
+            last_output_date=output.last_date,
+            last_output_value=float(output.values[-1]),
+            complete=frozenset(complete & set(inputs))
+        )
+
+    def extend(self, fetched: Dict[str, ColumnarSeries], resume_from: date) -> Optional[Dict[str, ColumnarSeries]]:
+        """
+        Tails merged with newly fetched observations (fetched values win), enough to calculate
+        every output from resume_from on. None when the state cannot serve this update: an input
+        it does not hold, a gap between the tail and the fetch, or a fetch that reaches further
+        back than the tail covers.
+        """
+        if set(fetched) - set(self.components):
+            return None
+
+        merged = {}
+        for series_id, tail in self.components.items():
+            # A series with nothing new in the fetched range is not returned at all
+            new = fetched.get(series_id) or ColumnarSeries.empty(series_id)
+            if not len(tail):
+                return None
+            if resume_from > tail.last_date:
+                return None
+            if series_id not in self.complete:
+                needed = _cutoff(tail, resume_from, self.lookback)
+                if needed is None or needed < np.datetime64(self.held_from, 'D'):
+                    return None
+            if len(new) and new.first_date < tail.first_date:
+                return None
+            merged[series_id] = ColumnarSeries.combine(series_id, [tail, new])
+        return merged
+
+    def revised(self, fetched: Dict[str, ColumnarSeries]) -> bool:
+        """Whether the fetch changed or inserted observations the state already held"""
+        for series_id, new in fetched.items():
+            tail = self.components[series_id]
+            held = new.slice(end_date=tail.last_date)
+            if len(held) and not np.array_equal(tail.align(held.dates), held.values):
+                return True
+        return False
+
+    def reproduces(self, output: ColumnarSeries) -> bool:
+        """Whether a result calculated from this state matches the last value of the full calculation"""
+        target = np.datetime64(self.last_output_date, 'D')
+        position = int(np.searchsorted(output.dates, target))
+        if position >= len(output) or output.dates[position] != target:
+            return False
+        return bool(np.isclose(output.values[position], self.last_output_value, rtol=1e-9, atol=1e-12))
+
+    def to_bytes(self) -> bytes:
+        """Format tag, JSON header length and header, then each tail's days since epoch and values (little-endian)"""
+        header = json.dumps({
+            'lookback': [self.lookback.observations, self.lookback.days],
+            'held_from': self.held_from.isoformat(),
+            'series': [[series_id, len(series), series_id in self.complete] for series_id, series in self.components.items()],
+        }).encode()
+        arrays = b''.join(
+            series.dates.astype('<i8').tobytes() + series.values.astype('<f8').tobytes()
+            for series in self.components.values()
+        )
+        return zlib.compress(PAYLOAD_FORMAT + struct.pack('<I', len(header)) + header + arrays)
+
+    @classmethod
+    def from_bytes(cls, key: str, last_output_date: date, last_output_value: float, payload: bytes) -> Optional['RollingState']:
+        content = zlib.decompress(payload)
+        if not content.startswith(PAYLOAD_FORMAT):
+            # Written in an older format - the next full calculation replaces it
+            return None
+
+        offset = len(PAYLOAD_FORMAT)
+        (header_length,) = struct.unpack_from('<I', content, offset)
+        offset += 4
+        header = json.loads(content[offset:offset + header_length])
+        offset += header_length
+
+        components = {}
+        complete = set()
+        for series_id, count, is_complete in header['series']:
+            dates = np.frombuffer(content, dtype='<i8', count=count, offset=offset)
+            values = np.frombuffer(content, dtype='<f8', count=count, offset=offset + 8 * count)
+            offset += 16 * count
+            components[series_id] = ColumnarSeries(series_id, dates.astype('datetime64[D]'), values.astype(np.float64))
+            if is_complete:
+                complete.add(series_id)
+
+        return cls(
+            key=key,
+            lookback=Lookback(*header['lookback']),
+            components=components,
+            held_from=date.fromisoformat(header['held_from']),
+            last_output_date=last_output_date,
+            last_output_value=last_output_value,
+            complete=frozenset(complete)
+        )
@@ -0,0 +1,289 @@
+"""
+Job Series Store
+Fetches each upstream series once per ETL job and shares it between every indicator that uses it
+"""
+
+import asyncio
+import logging
+from datetime import date
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from core.columnar import ColumnarSeries
+from core.data_fetcher import BaseDataFetcher
+
+if TYPE_CHECKING:
+    from services.upstream_cache_service import UpstreamCacheService
+
+logger = logging.getLogger(__name__)
+
+SeriesKey = Tuple[str, str]
+
+
+class JobSeriesStore:
+    """
+    In-job cache of upstream series.
+
+    The job planner registers every indicator's series and date range up front with
+    require(); the first fetch of a series then covers the union of all registered
+    ranges and every dependent indicator reads its own slice from the shared result.
+    A series is dropped once all of its registered consumers have read it.
+
+    With an upstream cache, a series whose upstream last_updated matches a cached
+    entry covering the range is served from the cache instead of being downloaded.
+    The lookup only uses a stamp the job already requested (ETLService records one on
+    every save of a source that publishes them); it never spends an upstream call of
+    its own, which a cache miss - the usual case for a series that is due - would waste.
+
+    For sources that return several series per request (fetcher.max_batch_size > 1)
+    the first fetch also starts every other registered, not yet fetched series of the
+    source, so the job needs one request per batch rather than one per series.
+    """
+
+    def __init__(self, upstream_cache: Optional['UpstreamCacheService'] = None):
+        self.upstream_cache = upstream_cache
+        self._ranges: Dict[SeriesKey, List[date]] = {}
+        self._consumers: Dict[SeriesKey, int] = {}
+        self._fetches: Dict[SeriesKey, asyncio.Future] = {}
+        self._fetched_ranges: Dict[SeriesKey, Tuple[date, date]] = {}
+        self._last_updated: Dict[SeriesKey, asyncio.Future] = {}
+        self.stats = {
+            'series_requests': 0,
+            'upstream_fetches': 0,
+            'batched_series': 0,
+            'last_updated_requests': 0,
+            'last_updated_fetches': 0,
+            'cache_lookups': 0,
+            'cache_hits': 0,
+            'cache_unchanged_content': 0,
+        }
+
+    def require(self, source_key: str, series_ids: List[str], start_date: date, end_date: date) -> int:
+        """
+        Register one indicator's need for series over [start_date, end_date]
+
+        Returns:
+            How many of the series were not registered before (the upstream calls this indicator adds)
+        """
+        new_series = 0
+
+        for sid in series_ids:
+            key = (source_key, sid)
+            if key not in self._ranges:
+                self._ranges[key] = [start_date, end_date]
+                new_series += 1
+            else:
+                wanted = self._ranges[key]
+                wanted[0] = min(wanted[0], start_date)
+                wanted[1] = max(wanted[1], end_date)
+            self._consumers[key] = self._consumers.get(key, 0) + 1
+
+        return new_series
+
+    async def fetch(
+        self,
+        fetcher: BaseDataFetcher,
+        source_key: str,
+        series_id: str,
+        start_date: date,
+        end_date: date
+    ) -> ColumnarSeries:
+        """One series within [start_date, end_date], fetched upstream at most once per job"""
+        key = (source_key, series_id)
+        self.stats['series_requests'] += 1
+
+        if key not in self._fetches:
+            if fetcher.max_batch_size > 1:
+                self._start_batch(fetcher, source_key, series_id, start_date, end_date)
+            else:
+                fetch_start, fetch_end = self._ranges.get(key, (start_date, end_date))
+                fetch_start, fetch_end = min(fetch_start, start_date), max(fetch_end, end_date)
+
+                self._fetched_ranges[key] = (fetch_start, fetch_end)
+                self._fetches[key] = asyncio.ensure_future(self._fetch_upstream(fetcher, source_key, series_id, fetch_start, fetch_end))
+
+        fetched_start, fetched_end = self._fetched_ranges[key]
+        try:
+            if start_date < fetched_start or end_date > fetched_end:
+                # Consumer that was not registered with the planner asks for more than was fetched
+                return await self._fetch_upstream(fetcher, source_key, series_id, start_date, end_date)
+
+            # Shielded so one indicator timing out does not cancel the fetch for the others
+            series = await asyncio.shield(self._fetches[key])
+        finally:
+            self._release(key)
+
+        return series.slice(start_date, end_date)
+
+    async def get_last_updated(self, fetcher: BaseDataFetcher, source_key: str, series_id: str) -> Optional[str]:
+        """Upstream last_updated stamp of one series, requested at most once per job"""
+        key = (source_key, series_id)
+        self.stats['last_updated_requests'] += 1
+
+        if key not in self._last_updated:
+            self.stats['last_updated_fetches'] += 1
+            self._last_updated[key] = asyncio.ensure_future(fetcher.get_last_updated(series_id))
+
+        return await asyncio.shield(self._last_updated[key])
+
+    def release(self, source_key: str, series_ids: List[str]) -> None:
+        """Drop a registered consumer that will not fetch (e.g. an indicator skipped as unchanged)"""
+        for sid in series_ids:
+            self._release((source_key, sid))
+
+    def summary(self) -> Dict[str, int]:
+        """
+        Upstream call counts for the job summary
+
+        upstream_calls_saved compares the calls the job's indicators asked for (a download
+        and, where they check it, a revision stamp per series) with the downloads and stamp
+        requests actually sent; it is negative when the store cost more than it saved.
+        """
+        stats = dict(self.stats)
+        stats['distinct_series'] = len(self._ranges)
+        stats['upstream_calls_spent'] = stats['upstream_fetches'] + stats['last_updated_fetches']
+        stats['upstream_calls_saved'] = (
+            stats['series_requests'] + stats['last_updated_requests'] - stats['upstream_calls_spent']
+        )
+        return stats
+
+    @staticmethod
+    def cache_hit_rate(stats: Dict[str, Any]) -> float:
+        """Share of upstream cache lookups served from the cache"""
+        lookups = stats.get('cache_lookups') or 0
+        return round(stats.get('cache_hits', 0) / lookups, 4) if lookups else 0.0
+
+    def _start_batch(
+        self,
+        fetcher: BaseDataFetcher,
+        source_key: str,
+        series_id: str,
+        start_date: date,
+        end_date: date
+    ) -> None:
+        """Start one upstream fetch for series_id plus other pending series of the source, over the union of their ranges"""
+        batch = [series_id]
+        for key in self._ranges:
+            if len(batch) >= fetcher.max_batch_size:
+                break
+            if key[0] == source_key and key[1] != series_id and key not in self._fetches and self._consumers.get(key):
+                batch.append(key[1])
+
+        ranges = [self._ranges.get((source_key, sid), (start_date, end_date)) for sid in batch]
+        fetch_start = min([start_date] + [wanted[0] for wanted in ranges])
+        fetch_end = max([end_date] + [wanted[1] for wanted in ranges])
+
+        self.stats['batched_series'] += len(batch) - 1
+        batch_fetch = asyncio.ensure_future(self._fetch_upstream_batch(fetcher, source_key, batch, fetch_start, fetch_end))
+
+        for sid in batch:
+            key = (source_key, sid)
+            self._fetched_ranges[key] = (fetch_start, fetch_end)
+            self._fetches[key] = asyncio.ensure_future(self._batch_member(batch_fetch, sid))
+
+    @staticmethod
+    async def _batch_member(batch_fetch: asyncio.Future, series_id: str) -> ColumnarSeries:
+        return (await asyncio.shield(batch_fetch))[series_id]
+
+    async def _fetch_upstream(
+        self,
+        fetcher: BaseDataFetcher,
+        source_key: str,
+        series_id: str,
+        start_date: date,
+        end_date: date
+    ) -> ColumnarSeries:
+        return (await self._fetch_upstream_batch(fetcher, source_key, [series_id], start_date, end_date))[series_id]
+
+    async def _fetch_upstream_batch(
+        self,
+        fetcher: BaseDataFetcher,
+        source_key: str,
+        series_ids: List[str],
+        start_date: date,
+        end_date: date
+    ) -> Dict[str, ColumnarSeries]:
+        """Series from the upstream cache where possible, the rest in one upstream request"""
+        results: Dict[str, ColumnarSeries] = {}
+        last_updated: Dict[str, Optional[str]] = {}
+
+        for series_id in series_ids:
+            last_updated[series_id], cached = await self._lookup_cache(fetcher, source_key, series_id, start_date, end_date)
+            if cached is not None:
+                results[series_id] = cached
+
+        missing = [series_id for series_id in series_ids if series_id not in results]
+        if not missing:
+            return results
+
+        self.stats['upstream_fetches'] += 1
+
+        fetched = await fetcher.fetch_columns(series_id='|'.join(missing), start_date=start_date, end_date=end_date)
+
+        for series_id in missing:
+            series = fetched.get(series_id) or ColumnarSeries.empty(series_id)
+            results[series_id] = series
+
+            if last_updated[series_id] and len(series):
+                await self._store_cache(source_key, series_id, start_date, end_date, last_updated[series_id], series)
+
+        return results
+
+    async def _lookup_cache(
+        self,
+        fetcher: BaseDataFetcher,
+        source_key: str,
+        series_id: str,
+        start_date: date,
+        end_date: date
+    ) -> Tuple[Optional[str], Optional[ColumnarSeries]]:
+        """(upstream last_updated, cached series or None)"""
+        key = (source_key, series_id)
+        if not self.upstream_cache or key not in self._last_updated:
+            # No stamp requested by the job for this series - not worth an upstream call of its own
+            return None, None
+
+        last_updated = await asyncio.shield(self._last_updated[key])
+        if not last_updated:
+            return None, None
+
+        self.stats['cache_lookups'] += 1
+        try:
+            cached = await self.upstream_cache.get(source_key, series_id, start_date, end_date, last_updated)
+        except Exception as e:
+            logger.warning(f"Upstream cache lookup failed for {source_key}/{series_id}: {e}")
+            cached = None
+
+        if cached is not None:
+            self.stats['cache_hits'] += 1
+            logger.debug(f"Upstream cache hit for {source_key}/{series_id} (last_updated {last_updated})")
+
+        return last_updated, cached
+
+    async def _store_cache(
+        self,
+        source_key: str,
+        series_id: str,
+        start_date: date,
+        end_date: date,
+        last_updated: str,
+        series: ColumnarSeries
+    ) -> None:
+        try:
+            changed = await self.upstream_cache.put(source_key, series_id, start_date, end_date, last_updated, series)
+            if not changed:
+                # New last_updated but identical observations (e.g. a metadata-only revision)
+                self.stats['cache_unchanged_content'] += 1
+        except Exception as e:
+            # The fetch succeeded; a missing cache entry only costs a download next time
+            logger.warning(f"Failed to cache upstream series {source_key}/{series_id}: {e}")
+
+    def _release(self, key: SeriesKey) -> None:
+        remaining = self._consumers.get(key, 0) - 1
+        if remaining > 0:
+            self._consumers[key] = remaining
+            return
+
+        # Last registered reader is done - free the arrays
+        self._consumers.pop(key, None)
+        self._fetches.pop(key, None)
+        self._fetched_ranges.pop(key, None)
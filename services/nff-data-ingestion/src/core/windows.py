@@ -0,0 +1,203 @@
+"""
+Rolling Windows
+Calendar-aware rolling statistics: "20D", "3M" or "1Y" cover that span of time whatever the series' frequency
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from core.freshness import infer_frequency
+
+# "20D", "12m", "3-month", "1 year"; the number must start and the unit end a token so names like "T10Y2Y" do not match
+_WINDOW_PATTERN = re.compile(
+    r'(?<![a-z0-9])(\d+)\s*-?\s*(days?|d|weeks?|wks?|w|months?|mos?|m|years?|yrs?|y)(?![a-z0-9])',
+    re.IGNORECASE
+)
+
+_UNITS = {'d': 'D', 'w': 'W', 'm': 'M', 'y': 'Y'}
+
+# Words naming the statistic a window belongs to ("20D MA", "z-score (1Y)", "rolling 3-month vol")
+_STATISTIC = r'(?:ma|sma|ema|moving|average|avg|mean|rolling|z[\s-]?scores?|vol|volatility|std|stdev|standard deviation)'
+_SEPARATORS = r'[\s()\[\]:,-]*'
+_STATISTIC_BEFORE = re.compile(r'(?<![a-z0-9])' + _STATISTIC + _SEPARATORS + r'$', re.IGNORECASE)
+_STATISTIC_AFTER = re.compile(_SEPARATORS + _STATISTIC + r'(?![a-z0-9])', re.IGNORECASE)
+
+# Maturities rather than windows: "10Y treasury", "30-year mortgage", "2Y-10Y spread"
+_TENOR_AFTER = re.compile(
+    r'\s*-?\s*(?:\d+\s*(?:y|yr|year)s?(?![a-z0-9])|(?:treasury|treasuries|yields?|notes?|bonds?|bills?|tips|'
+    r'mortgages?|swaps?|breakevens?|rates?|maturity|bunds?|gilts?|jgbs?)(?![a-z0-9]))',
+    re.IGNORECASE
+)
+_TENOR_BEFORE = re.compile(r'(?<![a-z0-9])\d+\s*(?:y|yr|year)s?\s*-\s*$', re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class WindowSpec:
+    """
+    A rolling window of `count` units: D, W, M, Y, or None for a number of observations.
+
+    D counts business days on a daily series and calendar days otherwise, so "20D" is
+    twenty trading sessions on daily data and about three observations on weekly data.
+    """
+    count: int
+    unit: Optional[str] = None
+
+    def __str__(self) -> str:
+        return f"{self.count}{self.unit}" if self.unit else f"{self.count} obs"
+
+    def span_days(self) -> int:
+        """Calendar days the window can reach back - an upper bound, 0 for a number of observations"""
+        if self.unit is None:
+            return 0
+        if self.unit == 'D':
+            # Business days, plus weekends and a few holidays
+            return self.count * 7 // 5 + 4
+        return self.count * {'W': 7, 'M': 31, 'Y': 366}[self.unit]
+
+    def lower_bounds(self, dates: np.ndarray, business_days: bool = False) -> np.ndarray:
+        """The date one span before each date - where its window starts (exclusive); needs a unit"""
+        if self.unit == 'D' and business_days:
+            return np.busday_offset(dates, -self.count, roll='forward')
+        if self.unit in ('D', 'W'):
+            days = self.count * (7 if self.unit == 'W' else 1)
+            return dates - np.timedelta64(days, 'D')
+        return _shift_months(dates, self.count * (12 if self.unit == 'Y' else 1))
+
+    def starts(self, dates: np.ndarray, business_days: bool = False) -> np.ndarray:
+        """Index of the first observation inside each date's window (the window ends at that date)"""
+        positions = np.arange(len(dates))
+        if self.unit is None:
+            return np.maximum(positions - self.count + 1, 0)
+
+        # The window is (lower, date] - the same convention as pandas' offset windows
+        return np.minimum(np.searchsorted(dates, self.lower_bounds(dates, business_days), side='right'), positions)
+
+    def covered(self, dates: np.ndarray, business_days: bool = False) -> np.ndarray:
+        """Whether the series reaches back over each date's whole window"""
+        if self.unit is None:
+            return np.arange(len(dates)) >= self.count - 1
+        return self.lower_bounds(dates, business_days) >= dates[0] if len(dates) else np.zeros(0, dtype=bool)
+
+
+def _shift_months(dates: np.ndarray, months: int) -> np.ndarray:
+    """Same day `months` earlier, clamped to the end of shorter months; month ends stay month ends"""
+    month = dates.astype('datetime64[M]')
+    day = dates - month.astype('datetime64[D]')
+    last_day = (month + np.timedelta64(1, 'M')).astype('datetime64[D]') - month.astype('datetime64[D]') - np.timedelta64(1, 'D')
+    target = month - np.timedelta64(months, 'M')
+    target_last = (target + np.timedelta64(1, 'M')).astype('datetime64[D]') - target.astype('datetime64[D]') - np.timedelta64(1, 'D')
+    # 30 April less three months is 31 January, so month-end series compare whole months
+    return target.astype('datetime64[D]') + np.where(day == last_day, target_last, np.minimum(day, target_last))
+
+
+def business_daily(dates: np.ndarray) -> bool:
+    """Whether "D" windows count business days on these (sorted) dates - true for series inferred as daily"""
+    return infer_frequency(np.asarray(dates[-25:], dtype='datetime64[D]').astype(object).tolist()) == 'D'
+
+
+def shift_span(dates: np.ndarray, values: np.ndarray, spec: WindowSpec) -> np.ndarray:
+    """
+    Each date's value one span earlier: the latest observation on or before the date one
+    span back (as-of, so "1Y" finds last year's value on daily and monthly series alike).
+    NaN where the series has no observation within the span before that date.
+    values may be a (series x dates) matrix of series sharing the dates.
+    """
+    dates = np.asarray(dates, dtype='datetime64[D]')
+    if not len(dates):
+        return np.full(np.shape(values), np.nan)
+
+    business_days = business_daily(dates)
+    lower = spec.lower_bounds(dates, business_days)
+    position = np.searchsorted(dates, lower, side='right') - 1
+    matched = np.maximum(position, 0)
+    found = (position >= 0) & (dates[matched] > spec.lower_bounds(lower, business_days))
+    return np.where(found, np.asarray(values, dtype=np.float64)[..., matched], np.nan)
+
+
+def parse_window(calculation: str) -> Optional[WindowSpec]:
+    """
+    The "<n><unit>" window in a calculation description, or None.
+
+    Descriptions often name maturities too ("10Y treasury 20D z-score"), so a token next to
+    the statistic ("MA", "z-score", "vol", ...) wins; otherwise the last token that does not
+    read as a maturity.
+    """
+    matches = list(_WINDOW_PATTERN.finditer(calculation))
+    for match in matches:
+        if (_STATISTIC_BEFORE.search(calculation, 0, match.start())
+                or _STATISTIC_AFTER.match(calculation, match.end())):
+            return _window_spec(match)
+
+    windows = [
+        match for match in matches
+        if not (_TENOR_AFTER.match(calculation, match.end()) or _TENOR_BEFORE.search(calculation, 0, match.start()))
+    ]
+    return _window_spec(windows[-1]) if windows else None
+
+
+def _window_spec(match: re.Match) -> WindowSpec:
+    return WindowSpec(int(match.group(1)), _UNITS[match.group(2)[0].lower()])
+
+
+def _prefix(values: np.ndarray) -> np.ndarray:
+    """Running sums along the last axis, led by a zero"""
+    return np.concatenate((np.zeros(values.shape[:-1] + (1,)), np.cumsum(values, axis=-1)), axis=-1)
+
+
+class RollingWindow:
+    """
+    One window applied to one series, evaluated for every observation at once.
+
+    The window bounds and running sums are computed once, so mean, std and z-score over
+    the same window share a single pass. NaN values are skipped. A statistic is NaN where
+    the window holds fewer than min_periods values.
+
+    values may also be a (series x dates) matrix of series sharing the dates; every row is
+    then evaluated in the same pass.
+    """
+
+    def __init__(self, dates: np.ndarray, values: np.ndarray, spec: WindowSpec, min_periods: int = 1):
+        self.dates = np.asarray(dates, dtype='datetime64[D]')
+        self.values = np.asarray(values, dtype=np.float64)
+        self.spec = spec
+        self.min_periods = max(min_periods, 1)
+        self.frequency = infer_frequency(self.dates[-25:].astype(object).tolist())
+
+        starts = spec.starts(self.dates, business_days=self.frequency == 'D')
+        ends = np.arange(1, len(self.dates) + 1)
+
+        valid = ~np.isnan(self.values)
+        # Centre each series on its overall mean so the squared sums do not cancel on large levels
+        observed = valid.sum(axis=-1, keepdims=True)
+        self._offset = np.where(valid, self.values, 0.0).sum(axis=-1, keepdims=True) / np.maximum(observed, 1)
+        centred = np.where(valid, self.values - self._offset, 0.0)
+
+        count = _prefix(valid.astype(np.float64))
+        total = _prefix(centred)
+        squares = _prefix(centred * centred)
+
+        self.count = count[..., ends] - count[..., starts]
+        self._sum = total[..., ends] - total[..., starts]
+        self._squares = squares[..., ends] - squares[..., starts]
+        # Rounding left in a difference of two running sums, used to recognise flat windows
+        self._noise = 64 * np.finfo(np.float64).eps * squares[..., ends]
+
+    def mean(self) -> np.ndarray:
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = self._sum / self.count + self._offset
+        return np.where(self.count >= self.min_periods, mean, np.nan)
+
+    def std(self, ddof: int = 1) -> np.ndarray:
+        with np.errstate(invalid='ignore', divide='ignore'):
+            deviation = self._squares - self._sum * self._sum / self.count
+            deviation = np.where(deviation <= self._noise, 0.0, deviation)
+            std = np.sqrt(deviation / (self.count - ddof))
+        return np.where((self.count >= self.min_periods) & (self.count > ddof), std, np.nan)
+
+    def zscore(self) -> np.ndarray:
+        """Distance from the window mean in window standard deviations (a flat window divides by 1)"""
+        std = self.std()
+        return (self.values - self.mean()) / np.where(std == 0, 1.0, std)
@@ -0,0 +1,186 @@
+"""
+Workbook Cache
+Whole upstream workbooks (e.g. Shiller's) downloaded once per TTL and held as typed columns for every series they contain
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import numpy as np
+
+from core.columnar import ColumnarSeries
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ParsedWorkbook:
+    """
+    Every numeric column of a workbook against its date column.
+
+    dates is datetime64[D] with NaT for rows whose date did not parse; each column is
+    float64 of the same length with NaN where a cell is empty or not a number.
+    """
+    dates: np.ndarray
+    columns: Dict[str, np.ndarray]
+    # Wall-clock time of the download, so a copy read back from disk keeps its age
+    loaded_at: float
+
+    def series(self, series_id: str) -> ColumnarSeries:
+        if series_id not in self.columns:
+            raise ValueError(f"Workbook has no column '{series_id}'")
+
+        values = self.columns[series_id]
+        valid = ~(np.isnat(self.dates) | np.isnan(values))
+        return ColumnarSeries.from_arrays(series_id, self.dates[valid], values[valid])
+
+
+def parse_workbook(frame, date_column: str = 'Date') -> ParsedWorkbook:
+    """Convert a workbook DataFrame column by column (no per-row work)"""
+    import pandas as pd
+
+    dates = pd.to_datetime(frame[date_column], errors='coerce').to_numpy(dtype='datetime64[ns]').astype('datetime64[D]')
+
+    columns = {}
+    for column in frame.columns:
+        if column == date_column:
+            continue
+        columns[str(column)] = pd.to_numeric(frame[column], errors='coerce').to_numpy(dtype=np.float64)
+
+    return ParsedWorkbook(dates=dates, columns=columns, loaded_at=time.time())
+
+
+class WorkbookCache:
+    """
+    One parsed workbook per source URL, shared by every series read from it.
+
+    Concurrent readers of an expired workbook wait on a single download. With
+    cache_dir set the parsed columns are also written to disk, so a restart or another
+    worker process within the TTL does not download again.
+    """
+
+    def __init__(self, name: str, ttl_seconds: float, cache_dir: Optional[str] = None):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.cache_dir = cache_dir or None
+        self._workbooks: Dict[str, ParsedWorkbook] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._locks_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stats = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'downloads': 0,
+        }
+
+    async def get(self, url: str, load: Callable[[], Awaitable[ParsedWorkbook]]) -> ParsedWorkbook:
+        """Parsed workbook for url, calling load() only when no fresh copy is cached"""
+        workbook = self._workbooks.get(url)
+        if self._fresh(workbook):
+            self.stats['memory_hits'] += 1
+            return workbook
+
+        async with self._lock(url):
+            # Another reader may have refreshed it while this one waited
+            workbook = self._workbooks.get(url)
+            if self._fresh(workbook):
+                self.stats['memory_hits'] += 1
+                return workbook
+
+            workbook = await self._read_disk(url)
+            if self._fresh(workbook):
+                self.stats['disk_hits'] += 1
+            else:
+                workbook = await load()
+                self.stats['downloads'] += 1
+                await self._write_disk(url, workbook)
+                logger.info(f"Cached {self.name} workbook with {len(workbook.columns)} columns, {len(workbook.dates)} rows")
+
+            self._workbooks[url] = workbook
+            return workbook
+
+    def invalidate(self, url: Optional[str] = None) -> None:
+        """Drop the in-memory copy of one workbook (or all); disk copies expire by age"""
+        if url is None:
+            self._workbooks.clear()
+        else:
+            self._workbooks.pop(url, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {'name': self.name, 'cached_workbooks': len(self._workbooks), **self.stats}
+
+    def _fresh(self, workbook: Optional[ParsedWorkbook]) -> bool:
+        return workbook is not None and time.time() - workbook.loaded_at < self.ttl_seconds
+
+    def _lock(self, url: str) -> asyncio.Lock:
+        # asyncio.Lock is bound to the loop it first waits on - rebuild the locks for a new loop
+        loop = asyncio.get_running_loop()
+        if self._locks_loop is not loop:
+            self._locks = {}
+            self._locks_loop = loop
+
+        if url not in self._locks:
+            self._locks[url] = asyncio.Lock()
+        return self._locks[url]
+
+    def _disk_path(self, url: str) -> str:
+        digest = hashlib.sha256(url.encode()).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{self.name}-{digest}.npz")
+
+    async def _read_disk(self, url: str) -> Optional[ParsedWorkbook]:
+        if not self.cache_dir:
+            return None
+
+        def _read():
+            path = self._disk_path(url)
+            if not os.path.exists(path):
+                return None
+
+            with np.load(path, allow_pickle=False) as data:
+                return ParsedWorkbook(
+                    dates=data['dates'].astype('datetime64[D]'),
+                    columns={str(name): values for name, values in zip(data['names'], data['values'])},
+                    loaded_at=float(data['loaded_at'])
+                )
+
+        try:
+            return await asyncio.to_thread(_read)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable {self.name} workbook cache file: {e}")
+            return None
+
+    async def _write_disk(self, url: str, workbook: ParsedWorkbook) -> None:
+        if not self.cache_dir:
+            return
+
+        def _write():
+            os.makedirs(self.cache_dir, exist_ok=True)
+            names = list(workbook.columns)
+            values = np.stack([workbook.columns[name] for name in names]) if names else np.empty((0, len(workbook.dates)))
+
+            # Write then rename so a concurrent reader never sees a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.npz')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    np.savez(
+                        f,
+                        dates=workbook.dates.astype(np.int64),
+                        names=np.array(names, dtype=str),
+                        values=values,
+                        loaded_at=np.float64(workbook.loaded_at)
+                    )
+                os.replace(tmp_path, self._disk_path(url))
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+
+        try:
+            await asyncio.to_thread(_write)
+        except Exception as e:
+            # The in-memory copy still serves this process
+            logger.warning(f"Failed to write {self.name} workbook cache file: {e}")
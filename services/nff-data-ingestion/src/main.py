@@ -41,6 +41,53 @@ app.include_router(tweets_router, prefix="/api/v1", tags=["Tweets"])
 app.include_router(bulk_operations.router, prefix="/api/v1", tags=["Bulk Operations"])
 app.include_router(lobstr_processor_router, prefix="/api/v1", tags=["Lobstr Processor"])
 
+# Strong references to startup tasks so they are not garbage collected mid-run
+_background_tasks = set()
+
+async def _resume_orphaned_etl_jobs():
+    from services.etl_service import ETLService
+    
+    service = ETLService()
+    try:
+        job_ids = await service.reclaim_orphaned_jobs()
+    except Exception as e:
+        logger.error(f"Failed to reclaim orphaned ETL jobs: {e}")
+        return
+    
+    for job_id in job_ids:
+        await service.run_job(job_id)
+
+@app.on_event("startup")
+async def on_startup():
+    import asyncio
+    from core.calculation_pool import calculation_pool
+    
+    # First, while the process has no other threads running
+    await calculation_pool.warm_up()
+    
+    from core.data_fetcher import DataFetcherFactory
+    DataFetcherFactory.initialize()
+    
+    task = asyncio.create_task(_resume_orphaned_etl_jobs())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    
+    if settings.ETL_WORKER_ENABLED:
+        from services.etl_worker import etl_worker
+        etl_worker.start()
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    if settings.ETL_WORKER_ENABLED:
+        from services.etl_worker import etl_worker
+        await etl_worker.stop()
+    
+    from core.calculation_pool import calculation_pool
+    calculation_pool.shutdown()
+    
+    from core.data_fetcher import DataFetcherFactory
+    await DataFetcherFactory.shutdown()
+
 if settings.SENTRY_DSN:
     init_sentry(settings.SENTRY_DSN)
 
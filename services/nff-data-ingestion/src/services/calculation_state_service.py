@@ -0,0 +1,94 @@
+"""
+Calculation State Service
+Persists each calculated indicator's rolling state so incremental runs extend the calculation instead of recomputing history
+"""
+
+from typing import Dict, List
+from datetime import datetime
+import logging
+import psycopg2
+from core.db_pool import db_pool
+from core.rolling_state import RollingState
+
+logger = logging.getLogger(__name__)
+
+class CalculationStateService:
+    """indicatorId -> calculation key, last calculated value and the input tails its next update reads"""
+
+    _table_ready = False
+
+    def __init__(self):
+        self.db_pool = db_pool
+
+    @classmethod
+    def _ensure_table(cls, cur) -> None:
+        if cls._table_ready:
+            return
+
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS "CalculationState" (
+                "indicatorId" INTEGER PRIMARY KEY,
+                "calculationKey" VARCHAR(64) NOT NULL,
+                "lastOutputDate" DATE NOT NULL,
+                "lastOutputValue" DOUBLE PRECISION NOT NULL,
+                payload BYTEA NOT NULL,
+                "updatedAt" TIMESTAMP NOT NULL DEFAULT NOW()
+            )
+        """)
+
+        cls._table_ready = True
+
+    async def get_states(self, indicator_ids: List[int]) -> Dict[int, RollingState]:
+        """Stored states of the given indicators (indicators without a readable state are absent)"""
+        if not indicator_ids:
+            return {}
+
+        def _query():
+            with self.db_pool.get_cursor() as cur:
+                self._ensure_table(cur)
+
+                cur.execute("""
+                    SELECT "indicatorId", "calculationKey", "lastOutputDate", "lastOutputValue", payload
+                    FROM "CalculationState"
+                    WHERE "indicatorId" = ANY(%s)
+                """, (list(indicator_ids),))
+
+                states = {}
+                for row in cur.fetchall():
+                    try:
+                        state = RollingState.from_bytes(
+                            row['calculationKey'], row['lastOutputDate'], row['lastOutputValue'], bytes(row['payload'])
+                        )
+                    except Exception as e:
+                        logger.warning(f"Ignoring unreadable calculation state of indicator {row['indicatorId']}: {e}")
+                        continue
+                    if state is not None:
+                        states[row['indicatorId']] = state
+                return states
+
+        return await self.db_pool.run(_query)
+
+    async def put(self, indicator_id: int, state: RollingState) -> None:
+        """Replace an indicator's state after its calculated series was saved"""
+        def _query():
+            payload = state.to_bytes()
+
+            with self.db_pool.get_cursor() as cur:
+                self._ensure_table(cur)
+
+                cur.execute("""
+                    INSERT INTO "CalculationState"
+                        ("indicatorId", "calculationKey", "lastOutputDate", "lastOutputValue", payload, "updatedAt")
+                    VALUES (%s, %s, %s, %s, %s, %s)
+                    ON CONFLICT ("indicatorId") DO UPDATE SET
+                        "calculationKey" = EXCLUDED."calculationKey",
+                        "lastOutputDate" = EXCLUDED."lastOutputDate",
+                        "lastOutputValue" = EXCLUDED."lastOutputValue",
+                        payload = EXCLUDED.payload,
+                        "updatedAt" = EXCLUDED."updatedAt"
+                """, (
+                    indicator_id, state.key, state.last_output_date, state.last_output_value,
+                    psycopg2.Binary(payload), datetime.now()
+                ))
+
+        await self.db_pool.run(_query)
@@ -4,25 +4,143 @@ Handles data fetching, processing, and loading operations
 """
 
 import psycopg2
-from psycopg2.extras import RealDictCursor, execute_values
-from typing import List, Optional, Dict, Any
+from psycopg2.extras import execute_values
+from typing import List, Optional, Dict, Any, NamedTuple, Tuple
+from dataclasses import dataclass
 from datetime import datetime, date, timedelta
 from config import settings
 import logging
 import uuid
 import asyncio
-from core.data_fetcher import DataFetcherFactory
+import hashlib
+import math
+import numpy as np
+import os
+import socket
+from contextlib import asynccontextmanager
+from concurrent.futures.process import BrokenProcessPool
+from core.data_fetcher import DataFetcherFactory, parse_cftc_series_id
+from core.formula import validate_formula
+from core.freshness import FreshnessPlanner, infer_frequency
 from core.ai_features import AIFeaturesCalculator
+from core.calculation_batch import CalculationBatch
+from core.calculation_pool import calculation_pool
+from core.columnar import ColumnarSeries
+from core.job_executor import ETLJobExecutor, get_source_key
+from core.db_pool import db_pool
+from core.pg_copy import encode_binary_copy
+from core.rolling_state import RollingState, state_key
+from core.series_store import JobSeriesStore
+from services.calculation_state_service import CalculationStateService
+from services.series_watermark_service import SeriesWatermarkService
+from services.upstream_cache_service import UpstreamCacheService
 
 logger = logging.getLogger(__name__)
 
+# Start of the history requested when a fetch has no explicit start date
+DEFAULT_HISTORY_START = date(2000, 1, 1)
+
+# Identifies the process that owns (heartbeats) a running job
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+# ETLJobItem statuses that are not re-run when a job resumes
+FINISHED_ITEM_STATUSES = ('OK', 'ERROR', 'BLOCKED', 'SKIPPED')
+
+# Jobs this process is currently draining, so its own ETL worker does not claim them twice
+_draining_jobs: set = set()
+
+class TimeSeriesColumn(NamedTuple):
+    """A written IndicatorTimeSeries column and how it is read, staged and compared"""
+    name: str
+    key: str
+    stage_type: str
+    default: Any = None
+    scale: Optional[int] = None
+
+
+# Always written; indicatorMetadataId and hasCalculation are bound per statement
+TIME_SERIES_VALUE_COLUMNS = [
+    TimeSeriesColumn('value', 'value', 'float8', scale=6),
+    TimeSeriesColumn('originalValue', 'original_value', 'float8', scale=6),
+    TimeSeriesColumn('calculatedValue', 'calculated_value', 'float8', scale=6),
+]
+
+# AI feature columns - only written when at least one record carries a value
+TIME_SERIES_FEATURE_COLUMNS = [
+    TimeSeriesColumn('zScore', 'z_score', 'float8', scale=4),
+    TimeSeriesColumn('normalized', 'normalized', 'float8', scale=6),
+    TimeSeriesColumn('pctChange1m', 'pct_change_1m', 'float8', scale=4),
+    TimeSeriesColumn('pctChange3m', 'pct_change_3m', 'float8', scale=4),
+    TimeSeriesColumn('pctChange12m', 'pct_change_12m', 'float8', scale=4),
+    TimeSeriesColumn('ma30d', 'ma_30d', 'float8', scale=6),
+    TimeSeriesColumn('ma90d', 'ma_90d', 'float8', scale=6),
+    TimeSeriesColumn('ma365d', 'ma_365d', 'float8', scale=6),
+    TimeSeriesColumn('volatility30d', 'volatility_30d', 'float8', scale=6),
+    TimeSeriesColumn('volatility90d', 'volatility_90d', 'float8', scale=6),
+    TimeSeriesColumn('trend', 'trend', 'text'),
+    TimeSeriesColumn('isOutlier', 'is_outlier', 'bool', default=False),
+]
+
+
+@dataclass
+class TimeSeriesBatch:
+    """Deduplicated rows of one indicator, ready to diff and write"""
+    feature_columns: List[TimeSeriesColumn]
+    rows: List[tuple]
+    fingerprint: str
+    first_date: Optional[date] = None
+    last_date: Optional[date] = None
+
+
+@dataclass
+class TimeSeriesWriteResult:
+    """Outcome of a change-detecting time-series save"""
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    skipped_write: bool = False
+    
+    @property
+    def total(self) -> int:
+        return self.inserted + self.updated + self.unchanged
+
+
+def _column_values(values: np.ndarray) -> List[Any]:
+    """Array as Python values for a row, with NaN (no value) as None"""
+    if values.dtype.kind == 'f':
+        return [None if math.isnan(value) else value for value in values.tolist()]
+    return values.tolist()
+
+
+def _stored_value_equal(stored: Any, incoming: Any, scale: Optional[int]) -> bool:
+    """Compare a stored column value with the value a write would store (numbers within half a unit of scale)"""
+    if stored is None or incoming is None:
+        return stored is None and incoming is None
+    
+    if scale is None:
+        return stored == incoming
+    
+    stored_f, incoming_f = float(stored), float(incoming)
+    if math.isnan(stored_f) or math.isnan(incoming_f):
+        return math.isnan(stored_f) and math.isnan(incoming_f)
+    
+    return abs(stored_f - incoming_f) <= 0.5 * 10 ** -scale + 1e-12
+
+
 class ETLService:
     """Service for ETL operations"""
     
+    _tables_ready = False
+    
     def __init__(self):
         self.db_url = settings.DATABASE_URL
+        self.db_pool = db_pool
         self.data_fetcher_factory = DataFetcherFactory()
         self.ai_calculator = AIFeaturesCalculator()
+        self.job_executor = ETLJobExecutor()
+        self.watermark_service = SeriesWatermarkService()
+        self.upstream_cache = UpstreamCacheService() if settings.UPSTREAM_CACHE_ENABLED else None
+        self.calculation_states = CalculationStateService() if settings.ETL_CALCULATION_STATE_ENABLED else None
     
     async def create_job(
         self,
@@ -37,7 +155,7 @@ class ETLService:
         job_id = f"ETL_{uuid.uuid4().hex[:12]}"
         started_at = datetime.now()
         
-        indicators = await self._get_indicators_for_job(
+        indicators, plan = await self._get_indicators_for_job(
             indicator_ids=indicator_ids,
             category=category,
             source=source,
@@ -46,56 +164,44 @@ class ETLService:
         
         # Create job record
         try:
-            conn = psycopg2.connect(self.db_url)
+            def _query():
+                with self.db_pool.get_cursor() as cur:
+                    self._ensure_etl_tables(cur)
+                    
+                    cur.execute("""
+                        INSERT INTO "ETLJob" ("jobId", status, "totalIndicators", "startedAt", "heartbeatAt", "ownerId", metadata)
+                        VALUES (%s, %s, %s, %s, %s, %s, %s)
+                    """, (job_id, 'PROCESSING', len(indicators), started_at, started_at, WORKER_ID, psycopg2.extras.Json({
+                        'category': category,
+                        'source': source,
+                        'force_refresh': force_refresh,
+                        'indicator_ids': indicator_ids,
+                        'plan': plan
+                    })))
             
-            with conn.cursor() as cur:
-                cur.execute("""
-                    CREATE TABLE IF NOT EXISTS "ETLJob" (
-                        "jobId" VARCHAR(50) PRIMARY KEY,
-                        status VARCHAR(20) NOT NULL,
-                        "totalIndicators" INTEGER NOT NULL,
-                        successful INTEGER DEFAULT 0,
-                        failed INTEGER DEFAULT 0,
-                        blocked INTEGER DEFAULT 0,
-                        "startedAt" TIMESTAMP NOT NULL,
-                        "completedAt" TIMESTAMP,
-                        metadata JSONB,
-                        "createdAt" TIMESTAMP DEFAULT NOW()
-                    )
-                """)
-                
-                cur.execute("""
-                    INSERT INTO "ETLJob" ("jobId", status, "totalIndicators", "startedAt", metadata)
-                    VALUES (%s, %s, %s, %s, %s)
-                """, (job_id, 'PROCESSING', len(indicators), started_at, psycopg2.extras.Json({
-                    'category': category,
-                    'source': source,
-                    'force_refresh': force_refresh,
-                    'indicator_ids': indicator_ids
-                })))
-                
-                conn.commit()
-                
+            await self.db_pool.run(_query)
+            
+            # Items are fixed at creation so the job runs exactly the indicators its plan selected
+            await self._checkpoint_job_items(job_id, [indicator['id'] for indicator in indicators])
+        
         except Exception as e:
             logger.error(f"Error creating ETL job: {e}")
-            if 'conn' in locals():
-                conn.rollback()
             raise
-        finally:
-            if 'conn' in locals():
-                conn.close()
         
         return {
             "job_id": job_id,
             "status": "PROCESSING",
             "started_at": started_at.isoformat(),
             "total_indicators": len(indicators),
-            "message": f"ETL job created with {len(indicators)} indicators"
+            "message": f"ETL job created with {len(indicators)} indicators ({plan['skipped']} not due)"
         }
     
     async def process_job(self, job_id: str) -> None:
         """
         Process an ETL job (run in background)
+        
+        Plans the job's items, then works through them alongside the ETL workers of any
+        other replica that claims items of the same job.
         """
         try:
             job = await self._get_job(job_id)
@@ -105,63 +211,18 @@ class ETLService:
             
             metadata = job['metadata']
             
-            indicators = await self._get_indicators_for_job(
-                indicator_ids=metadata.get('indicator_ids'),
-                category=metadata.get('category'),
-                source=metadata.get('source'),
-                force_refresh=metadata.get('force_refresh', False)
-            )
-            
-            successful = 0
-            failed = 0
-            blocked = 0
-            
-            total_indicators = len(indicators)
-            logger.info(f"[ETL JOB] Starting to process {total_indicators} indicators for job {job_id}")
-            
-            for idx, indicator in enumerate(indicators, 1):
-                indicator_id = indicator['id']
-                indicator_name = indicator.get('indicatorEN', 'Unknown')
-                etl_status = indicator.get('etlStatus', 'UNKNOWN')
-                
-                # Log progress every 50 indicators
-                if idx % 50 == 0 or idx == 1:
-                    logger.info(f"[ETL JOB] Progress: {idx}/{total_indicators} (Success: {successful}, Failed: {failed}, Blocked: {blocked})")
-                
-                try:
-                    logger.debug(f"[ETL JOB] Processing indicator {idx}/{total_indicators}: ID={indicator_id}, Name='{indicator_name}', CurrentStatus={etl_status}")
-                    
-                    result = await self.fetch_indicator_data(
-                        indicator_id=indicator_id,
-                        force_refresh=metadata.get('force_refresh', False)
-                    )
-                    
-                    if result['status'] == 'OK':
-                        successful += 1
-                        logger.debug(f"[ETL JOB] ✓ Indicator {indicator_id} ({indicator_name}) - SUCCESS")
-                    elif result['status'] == 'BLOCKED':
-                        blocked += 1
-                        logger.debug(f"[ETL JOB] ⊗ Indicator {indicator_id} ({indicator_name}) - BLOCKED")
-                    else:
-                        failed += 1
-                        logger.warning(f"[ETL JOB] ✗ Indicator {indicator_id} ({indicator_name}) - FAILED: {result.get('error_message', 'Unknown error')}")
-                        
-                except Exception as e:
-                    logger.error(f"[ETL JOB] ✗ Error processing indicator {indicator_id} ({indicator_name}): {e}", exc_info=True)
-                    failed += 1
-                
-                await asyncio.sleep(0.2)
-            
-            logger.info(f"[ETL JOB] Completed processing {total_indicators} indicators: Success={successful}, Failed={failed}, Blocked={blocked}")
-            
-            await self._update_job_status(
-                job_id=job_id,
-                status='COMPLETED',
-                successful=successful,
-                failed=failed,
-                blocked=blocked
-            )
+            # A resumed job keeps the indicator set it was planned with
+            if not await self._get_job_item_ids(job_id):
+                indicators, _ = await self._get_indicators_for_job(
+                    indicator_ids=metadata.get('indicator_ids'),
+                    category=metadata.get('category'),
+                    source=metadata.get('source'),
+                    force_refresh=metadata.get('force_refresh', False)
+                )
+                await self._checkpoint_job_items(job_id, [indicator['id'] for indicator in indicators])
             
+            await self.drain_job(job_id, job)
+        
         except Exception as e:
             logger.error(f"Error processing job {job_id}: {e}")
             await self._update_job_status(job_id=job_id, status='FAILED')
@@ -171,10 +232,23 @@ class ETLService:
         indicator_id: int,
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
-        force_refresh: bool = False
+        force_refresh: bool = False,
+        save_from: Optional[date] = None,
+        upstream_last_updated: Optional[Dict[str, Optional[str]]] = None,
+        series_store: Optional[JobSeriesStore] = None,
+        calculation_state: Optional[RollingState] = None,
+        calculation_batch: Optional[CalculationBatch] = None
     ) -> Dict[str, Any]:
         """
         Fetch data for a single indicator
+        
+        Args:
+            save_from: Only rows on or after this date are saved; earlier rows are calculation warm-up
+            upstream_last_updated: Upstream revision stamps per series, recorded on the watermarks after a successful save
+                (requested here, before the download, when not given and the source publishes them)
+            series_store: Job-wide store that fetches each upstream series once per job
+            calculation_state: Rolling state to resume the calculation from, in place of warm-up history (requires save_from)
+            calculation_batch: Evaluates the calculation together with the batch's other calculated indicators
         """
         etl_log_id = await self._create_etl_log(indicator_id)
         
@@ -201,91 +275,158 @@ class ETLService:
             
             # Determine date range
             if not start_date:
-                start_date = date(2000, 1, 1)
+                start_date = DEFAULT_HISTORY_START
             if not end_date:
                 end_date = date.today()
             
+            if upstream_last_updated is None:
+                # Every save records the stamp, so release planning never has to guess from observation dates
+                upstream_last_updated = await self._get_upstream_last_updated(fetcher, indicator, series_store)
+            
             # Fetch data with timeout protection
-            import asyncio
+            if series_store:
+                fetch = self._fetch_series(fetcher, indicator, start_date, end_date, series_store)
+            else:
+                fetch = fetcher.fetch_columns(
+                    series_id=indicator['seriesIDs'],
+                    start_date=start_date,
+                    end_date=end_date
+                )
+            
             try:
-                raw_data = await asyncio.wait_for(
-                    fetcher.fetch(
-                        series_id=indicator['seriesIDs'],
-                        start_date=start_date,
-                        end_date=end_date
-                    ),
+                series_columns = await asyncio.wait_for(
+                    fetch,
                     timeout=300  # 5 minutes timeout
                 )
             except asyncio.TimeoutError:
                 raise ValueError(f"Data fetch timeout for indicator {indicator_id} after 5 minutes")
             
-            if not raw_data or len(raw_data) == 0:
+            # Component series merged on date (the later series wins a shared date)
+            raw_series = ColumnarSeries.combine(indicator['seriesIDs'], list(series_columns.values()))
+            
+            if not len(raw_series):
                 raise ValueError("No data returned from API")
             
             # Apply calculation if needed and keep both original + calculated
             has_calculation = bool(indicator.get('calculation'))
-            calculated_data = None
-            calculation_error = None
             
             if has_calculation:
                 try:
-                    # Apply calculation using calculation engine
-                    calculated_data = await self._apply_calculation(
-                        raw_data, 
-                        indicator['calculation'], 
-                        indicator['seriesIDs']
-                    )
-                    processed_data = calculated_data
+                    resumed = None
+                    full_history = set(series_columns) if start_date <= DEFAULT_HISTORY_START else set()
+                    if calculation_state is not None and save_from:
+                        resumed = await self._resume_calculation(calculation_state, series_columns, indicator, save_from)
+                        if resumed is None:
+                            logger.info(f"Calculation state of indicator {indicator_id} does not cover this update - recalculating from full history")
+                            series_columns = await asyncio.wait_for(
+                                fetcher.fetch_columns(
+                                    series_id=indicator['seriesIDs'],
+                                    start_date=DEFAULT_HISTORY_START,
+                                    end_date=end_date
+                                ),
+                                timeout=300
+                            )
+                            raw_series = ColumnarSeries.combine(indicator['seriesIDs'], list(series_columns.values()))
+                            full_history = set(series_columns)
+                    
+                    if resumed is not None:
+                        calculation_inputs, series = resumed
+                        full_history = set(calculation_state.complete)
+                    else:
+                        # Apply calculation using calculation engine
+                        calculation_inputs = series_columns
+                        series = await self._apply_calculation(
+                            series_columns,
+                            indicator['calculation'],
+                            indicator['seriesIDs'],
+                            calculation_batch=calculation_batch,
+                            indicator_id=indicator_id
+                        )
                     logger.info(f"Applied calculation for indicator {indicator_id}: {indicator['calculation']}")
                 except Exception as e:
-                    calculation_error = str(e)
                     logger.error(f"Calculation failed for indicator {indicator_id}: {e}")
                     # Fall back to raw data if calculation fails
-                    processed_data = raw_data
+                    series = raw_series
                     has_calculation = False
             else:
                 # No calculation needed - use raw data directly
-                processed_data = raw_data
+                series = raw_series
                 logger.info(f"Using raw data for indicator {indicator_id} (no calculation specified)")
             
-            enriched_data = processed_data
-            records_inserted = await self._save_time_series_data(
+            if save_from:
+                series = series.slice(save_from)
+            
+            write_result = await self._save_time_series_data(
                 indicator_id=indicator_id,
-                data=enriched_data,
-                original_data=raw_data if has_calculation else None,
+                series=series,
+                original=raw_series if has_calculation else None,
                 has_calculation=has_calculation,
                 force_refresh=force_refresh
             )
             
-            etl_notes = "Raw data only (calculation engine & AI features disabled)"
+            if has_calculation:
+                etl_notes = f"Calculated: {indicator['calculation']}"
+            elif indicator.get('calculation'):
+                etl_notes = "Raw data only (calculation failed)"
+            else:
+                etl_notes = "Raw data only (no calculation)"
             
             await self._complete_etl_log(
                 etl_log_id=etl_log_id,
                 status='OK',
-                records_processed=len(enriched_data),
-                records_inserted=records_inserted
+                records_processed=len(series),
+                records_inserted=write_result.inserted,
+                records_updated=write_result.updated,
+                metadata={
+                    'records_unchanged': write_result.unchanged,
+                    'write_skipped': write_result.skipped_write
+                }
             )
             
+            # The same instant marks the indicator's success and any watermark change it made,
+            # so the next incremental run sees this indicator as up to date with its series
+            saved_at = datetime.now()
             await self._update_indicator_etl_status(
                 indicator_id=indicator_id,
                 status='OK',
-                records_count=records_inserted,
-                last_successful_at=datetime.now(),
+                records_count=write_result.total,
+                last_successful_at=saved_at,
                 etl_notes=etl_notes
             )
             
+            try:
+                await self.watermark_service.advance(
+                    get_source_key(indicator['source']),
+                    {sid: component.last_date for sid, component in series_columns.items()},
+                    upstream_last_updated,
+                    {
+                        # The spacing of recent observations is enough to classify the frequency
+                        sid: infer_frequency(component.dates[-25:].astype(object).tolist())
+                        for sid, component in series_columns.items()
+                    },
+                    saved_at=saved_at
+                )
+            except Exception as e:
+                # Data is saved; a stale watermark only means the next incremental run refetches more
+                logger.warning(f"Failed to advance series watermarks for indicator {indicator_id}: {e}")
+            
+            if has_calculation:
+                await self._store_calculation_state(indicator_id, indicator, calculation_inputs, series, full_history)
+            
             return {
                 "status": "OK",
                 "indicator_id": indicator_id,
-                "records_fetched": len(raw_data),
-                "records_processed": len(enriched_data),
-                "records_inserted": records_inserted,
+                "records_fetched": sum(len(component) for component in series_columns.values()),
+                "records_processed": len(series),
+                "records_inserted": write_result.inserted,
+                "records_updated": write_result.updated,
+                "records_unchanged": write_result.unchanged,
                 "date_range": {
                     "start": start_date.isoformat(),
                     "end": end_date.isoformat()
                 }
             }
-            
+        
         except Exception as e:
             logger.error(f"Error fetching indicator {indicator_id}: {e}")
             
@@ -324,10 +465,8 @@ class ETLService:
         """
         Create job for fetching all indicators in a category
         """
-        try:
-            conn = psycopg2.connect(self.db_url)
-            
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        def _query():
+            with self.db_pool.get_cursor() as cur:
                 if importance_min is not None:
                     query = """
                         SELECT im.id FROM "IndicatorMetadata" im
@@ -350,39 +489,21 @@ class ETLService:
                 
                 cur.execute(query, params)
                 
-                indicators = cur.fetchall()
-                indicator_ids = [ind['id'] for ind in indicators]
-                
-        finally:
-            if 'conn' in locals():
-                conn.close()
+                return [ind['id'] for ind in cur.fetchall()]
+        
+        indicator_ids = await self.db_pool.run(_query)
         
         job_id = f"CATEGORY_{uuid.uuid4().hex[:12]}"
         started_at = datetime.now()
         
-        try:
-            conn = psycopg2.connect(self.db_url)
-            
-            with conn.cursor() as cur:
-                cur.execute("""
-                    CREATE TABLE IF NOT EXISTS "ETLJob" (
-                        "jobId" VARCHAR(50) PRIMARY KEY,
-                        status VARCHAR(20) NOT NULL,
-                        "totalIndicators" INTEGER NOT NULL,
-                        successful INTEGER DEFAULT 0,
-                        failed INTEGER DEFAULT 0,
-                        blocked INTEGER DEFAULT 0,
-                        "startedAt" TIMESTAMP NOT NULL,
-                        "completedAt" TIMESTAMP,
-                        metadata JSONB,
-                        "createdAt" TIMESTAMP DEFAULT NOW()
-                    )
-                """)
+        def _query():
+            with self.db_pool.get_cursor() as cur:
+                self._ensure_etl_tables(cur)
                 
                 cur.execute("""
-                    INSERT INTO "ETLJob" ("jobId", status, "totalIndicators", "startedAt", metadata)
-                    VALUES (%s, %s, %s, %s, %s)
-                """, (job_id, 'PROCESSING', len(indicator_ids), started_at, psycopg2.extras.Json({
+                    INSERT INTO "ETLJob" ("jobId", status, "totalIndicators", "startedAt", "heartbeatAt", "ownerId", metadata)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s)
+                """, (job_id, 'PROCESSING', len(indicator_ids), started_at, started_at, WORKER_ID, psycopg2.extras.Json({
                     'type': 'category_full',
                     'category': category_name,
                     'start_date': start_date.isoformat() if start_date else None,
@@ -390,12 +511,8 @@ class ETLService:
                     'importance_min': importance_min,
                     'indicator_ids': indicator_ids
                 })))
-                
-                conn.commit()
-                
-        finally:
-            if 'conn' in locals():
-                conn.close()
+        
+        await self.db_pool.run(_query)
         
         return {
             "job_id": job_id,
@@ -414,50 +531,9 @@ class ETLService:
             if not job:
                 return
             
-            metadata = job['metadata']
-            indicator_ids = metadata.get('indicator_ids', [])
-            start_date = None
-            end_date = None
-            
-            if metadata.get('start_date'):
-                start_date = datetime.fromisoformat(metadata['start_date']).date()
-            if metadata.get('end_date'):
-                end_date = datetime.fromisoformat(metadata['end_date']).date()
-            
-            successful = 0
-            failed = 0
-            blocked = 0
-            
-            for indicator_id in indicator_ids:
-                try:
-                    result = await self.fetch_indicator_data(
-                        indicator_id=indicator_id,
-                        start_date=start_date,
-                        end_date=end_date,
-                        force_refresh=False
-                    )
-                    
-                    if result['status'] == 'OK':
-                        successful += 1
-                    elif result['status'] == 'BLOCKED':
-                        blocked += 1
-                    else:
-                        failed += 1
-                        
-                except Exception as e:
-                    logger.error(f"Error processing indicator {indicator_id}: {e}")
-                    failed += 1
-                
-                await asyncio.sleep(0.2)
-            
-            await self._update_job_status(
-                job_id=job_id,
-                status='COMPLETED',
-                successful=successful,
-                failed=failed,
-                blocked=blocked
-            )
-            
+            await self._checkpoint_job_items(job_id, job['metadata'].get('indicator_ids', []))
+            await self.drain_job(job_id, job)
+        
         except Exception as e:
             logger.error(f"Error processing category job {job_id}: {e}")
             await self._update_job_status(job_id=job_id, status='FAILED')
@@ -473,10 +549,8 @@ class ETLService:
         job_id = f"INCR_{uuid.uuid4().hex[:12]}"
         started_at = datetime.now()
         
-        try:
-            conn = psycopg2.connect(self.db_url)
-            
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        def _query():
+            with self.db_pool.get_cursor() as cur:
                 cur.execute("""
                     SELECT im.id, im."lastSuccessfulAt"
                     FROM "IndicatorMetadata" im
@@ -484,31 +558,25 @@ class ETLService:
                     WHERE cc.name = %s AND im."isActive" = true
                 """, (category_name,))
                 
-                indicators = cur.fetchall()
-                
-        finally:
-            if 'conn' in locals():
-                conn.close()
+                return cur.fetchall()
         
-        try:
-            conn = psycopg2.connect(self.db_url)
-            
-            with conn.cursor() as cur:
+        indicators = await self.db_pool.run(_query)
+        
+        def _query():
+            with self.db_pool.get_cursor() as cur:
+                self._ensure_etl_tables(cur)
+                
                 cur.execute("""
-                    INSERT INTO "ETLJob" ("jobId", status, "totalIndicators", "startedAt", metadata)
-                    VALUES (%s, %s, %s, %s, %s)
-                """, (job_id, 'PROCESSING', len(indicators), started_at, psycopg2.extras.Json({
+                    INSERT INTO "ETLJob" ("jobId", status, "totalIndicators", "startedAt", "heartbeatAt", "ownerId", metadata)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s)
+                """, (job_id, 'PROCESSING', len(indicators), started_at, started_at, WORKER_ID, psycopg2.extras.Json({
                     'type': 'incremental',
                     'category': category_name,
                     'days_back': days_back,
                     'indicators': [{'id': ind['id'], 'last_success': ind['lastSuccessfulAt'].isoformat() if ind['lastSuccessfulAt'] else None} for ind in indicators]
                 })))
-                
-                conn.commit()
-                
-        finally:
-            if 'conn' in locals():
-                conn.close()
+        
+        await self.db_pool.run(_query)
         
         return {
             "job_id": job_id,
@@ -527,57 +595,200 @@ class ETLService:
             if not job:
                 return
             
-            metadata = job['metadata']
-            indicators = metadata.get('indicators', [])
-            days_back = metadata.get('days_back', 30)
+            await self._checkpoint_job_items(
+                job_id,
+                [ind_info['id'] for ind_info in job['metadata'].get('indicators', [])]
+            )
+            await self.drain_job(job_id, job)
+        
+        except Exception as e:
+            logger.error(f"Error processing incremental job {job_id}: {e}")
+            await self._update_job_status(job_id=job_id, status='FAILED')
+    
+    async def _plan_incremental_fetches(
+        self,
+        indicators: List[Dict[str, Any]],
+        fallback_starts: Dict[int, date],
+        end_date: date,
+        last_successes: Optional[Dict[int, Optional[datetime]]] = None
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Work out each indicator's incremental date range from its series watermarks
+        
+        Starts from the oldest series watermark minus ETL_REVISION_LOOKBACK_DAYS, but never
+        after the indicator's own fallback start (the day after its last successful save):
+        watermarks are shared by every indicator using a series, and another indicator's
+        save must not hide this one's gap. Calculated indicators
+        resume from their rolling calculation state when they have one; otherwise they fetch
+        ETL_CALCULATION_WARMUP_DAYS of extra history. Either way only the new range is saved.
+        """
+        series_by_source: Dict[str, set] = {}
+        for indicator in indicators:
+            series_by_source.setdefault(get_source_key(indicator.get('source')), set()).update(
+                self._split_series_ids(indicator.get('seriesIDs'))
+            )
+        
+        watermarks_by_source = {
+            source_key: await self.watermark_service.get_watermarks(source_key, sorted(series_ids))
+            for source_key, series_ids in series_by_source.items()
+        }
+        calculation_states = await self._get_calculation_states(indicators)
+        
+        plans = {}
+        for indicator in indicators:
+            series_ids = self._split_series_ids(indicator.get('seriesIDs'))
+            source_watermarks = watermarks_by_source.get(get_source_key(indicator.get('source')), {})
+            watermarks = {sid: source_watermarks[sid] for sid in series_ids if sid in source_watermarks}
             
-            successful = 0
-            failed = 0
-            blocked = 0
+            fallback_start = min(fallback_starts[indicator['id']], end_date)
+            watermark_start = self.watermark_service.plan_start_date(
+                watermarks, series_ids, settings.ETL_REVISION_LOOKBACK_DAYS
+            )
+            start_date = min(watermark_start, fallback_start) if watermark_start else fallback_start
             
-            for ind_info in indicators:
-                try:
-                    if ind_info['last_success']:
-                        start_date = datetime.fromisoformat(ind_info['last_success']).date() + timedelta(days=1)
-                    else:
-                        start_date = date.today() - timedelta(days=days_back)
-                    
-                    end_date = date.today()
-                    
-                    if start_date >= end_date:
-                        continue
-                    
-                    result = await self.fetch_indicator_data(
-                        indicator_id=ind_info['id'],
-                        start_date=start_date,
-                        end_date=end_date,
-                        force_refresh=False
-                    )
-                    
-                    if result['status'] == 'OK':
-                        successful += 1
-                    elif result['status'] == 'BLOCKED':
-                        blocked += 1
-                    else:
-                        failed += 1
-                        
-                except Exception as e:
-                    logger.error(f"Error processing indicator {ind_info['id']}: {e}")
-                    failed += 1
-                
-                await asyncio.sleep(0.2)
+            save_from = None
+            calculation_state = calculation_states.get(indicator['id'])
+            if indicator.get('calculation'):
+                save_from = start_date
+                if calculation_state is None:
+                    start_date = start_date - timedelta(days=settings.ETL_CALCULATION_WARMUP_DAYS)
+            
+            plans[indicator['id']] = {
+                'watermarks': watermarks,
+                'last_success': (last_successes or {}).get(indicator['id']),
+                'start_date': start_date,
+                'save_from': save_from,
+                'calculation_state': calculation_state
+            }
+        
+        return plans
+    
+    async def _fetch_incremental_indicator(
+        self,
+        indicator: Dict[str, Any],
+        plan: Dict[str, Any],
+        end_date: date,
+        series_store: Optional[JobSeriesStore] = None
+    ) -> Dict[str, Any]:
+        """
+        Fetch only what is new for one indicator, skipping it when every series reports
+        an unchanged upstream last_updated and this indicator saved since the series last changed
+        """
+        indicator_id = indicator['id']
+        series_ids = self._split_series_ids(indicator.get('seriesIDs'))
+        source_key = get_source_key(indicator.get('source'))
+        watermarks = plan['watermarks']
+        
+        upstream_last_updated = None
+        fetcher = self.data_fetcher_factory.get_fetcher(indicator['source']) if indicator.get('source') else None
+        if fetcher and watermarks:
+            upstream_last_updated = await self._get_upstream_last_updated(fetcher, indicator, series_store)
             
-            await self._update_job_status(
-                job_id=job_id,
-                status='COMPLETED',
-                successful=successful,
-                failed=failed,
-                blocked=blocked
+            if upstream_last_updated is not None and self.watermark_service.upstream_unchanged(
+                watermarks, series_ids, upstream_last_updated, plan.get('last_success')
+            ):
+                logger.info(f"[ETL JOB] Indicator {indicator_id} skipped - upstream unchanged since last fetch")
+                if series_store:
+                    series_store.release(source_key, series_ids)
+                return {
+                    "status": "SKIPPED",
+                    "indicator_id": indicator_id,
+                    "reason": "UPSTREAM_UNCHANGED"
+                }
+        
+        return await self.fetch_indicator_data(
+            indicator_id=indicator_id,
+            start_date=plan['start_date'],
+            end_date=end_date,
+            force_refresh=False,
+            save_from=plan['save_from'],
+            upstream_last_updated=upstream_last_updated,
+            series_store=series_store,
+            calculation_state=plan.get('calculation_state')
+        )
+    
+    async def _get_upstream_last_updated(
+        self,
+        fetcher,
+        indicator: Dict[str, Any],
+        series_store: Optional[JobSeriesStore] = None
+    ) -> Optional[Dict[str, Optional[str]]]:
+        """Upstream revision stamps of an indicator's series (once per job with a series store), None when the source publishes none"""
+        if not fetcher.publishes_last_updated:
+            return None
+        
+        source_key = get_source_key(indicator.get('source'))
+        series_ids = self._split_series_ids(indicator.get('seriesIDs'))
+        if series_store:
+            stamps = await asyncio.gather(*[series_store.get_last_updated(fetcher, source_key, sid) for sid in series_ids])
+        else:
+            stamps = await asyncio.gather(*[fetcher.get_last_updated(sid) for sid in series_ids])
+        return dict(zip(series_ids, stamps))
+    
+    def _plan_series_store(
+        self,
+        indicators: List[Dict[str, Any]],
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> JobSeriesStore:
+        """
+        Register every indicator's series with a job-wide store so each distinct upstream
+        series is fetched once; request cost is charged to the first indicator using a series
+        (or starting a batch, for sources that fetch several series per request), plus its
+        revision stamp request for sources that publish one
+        """
+        series_store = JobSeriesStore(self.upstream_cache)
+        fetchers: Dict[str, Any] = {}
+        planned_series: Dict[str, int] = {}
+        
+        for indicator in indicators:
+            source_key = get_source_key(indicator.get('source'))
+            new_series = series_store.require(
+                source_key,
+                self._split_series_ids(indicator.get('seriesIDs')),
+                start_date or DEFAULT_HISTORY_START,
+                end_date or date.today()
             )
             
-        except Exception as e:
-            logger.error(f"Error processing incremental job {job_id}: {e}")
-            await self._update_job_status(job_id=job_id, status='FAILED')
+            # Sources that batch series into one request cost one request per batch started
+            if source_key not in fetchers:
+                fetchers[source_key] = self.data_fetcher_factory.get_fetcher(indicator['source']) if indicator.get('source') else None
+            fetcher = fetchers[source_key]
+            before = planned_series.get(source_key, 0)
+            planned_series[source_key] = before + new_series
+            batch_size = fetcher.max_batch_size if fetcher else 1
+            indicator['requestCost'] = math.ceil(planned_series[source_key] / batch_size) - math.ceil(before / batch_size)
+            if fetcher and fetcher.publishes_last_updated:
+                indicator['requestCost'] += new_series
+        
+        summary = series_store.summary()
+        logger.info(
+            f"[ETL JOB] {len(indicators)} indicators reference {summary['distinct_series']} distinct upstream series"
+        )
+        return series_store
+    
+    async def _fetch_series(
+        self,
+        fetcher,
+        indicator: Dict[str, Any],
+        start_date: date,
+        end_date: date,
+        series_store: JobSeriesStore
+    ) -> Dict[str, ColumnarSeries]:
+        """Fetch an indicator's series through the job series store, keyed by series ID"""
+        source_key = get_source_key(indicator['source'])
+        series_list = self._split_series_ids(indicator['seriesIDs'])
+        
+        results = await asyncio.gather(*[
+            series_store.fetch(fetcher, source_key, sid, start_date, end_date)
+            for sid in series_list
+        ])
+        
+        return {sid: series for sid, series in zip(series_list, results) if len(series)}
+    
+    @staticmethod
+    def _split_series_ids(series_ids: Optional[str]) -> List[str]:
+        return [sid.strip() for sid in (series_ids or '').split('|') if sid.strip()]
     
     async def get_indicator_time_series(
         self,
@@ -589,10 +800,8 @@ class ETLService:
         """
         Get time-series data for indicator
         """
-        try:
-            conn = psycopg2.connect(self.db_url)
-            
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        def _query():
+            with self.db_pool.get_cursor() as cur:
                 query = """
                     SELECT 
                         date, value, "zScore", normalized,
@@ -627,10 +836,8 @@ class ETLService:
                     data.append(item)
                 
                 return data
-                
-        finally:
-            if 'conn' in locals():
-                conn.close()
+        
+        return await self.db_pool.run(_query)
     
     async def _get_indicators_for_job(
         self,
@@ -638,12 +845,15 @@ class ETLService:
         category: Optional[str],
         source: Optional[str],
         force_refresh: bool
-    ) -> List[Dict[str, Any]]:
-        """Get indicators for ETL job"""
-        try:
-            conn = psycopg2.connect(self.db_url)
-            
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+    ):
+        """
+        Get indicators for ETL job
+        
+        Returns:
+            (indicators due for a fetch, freshness plan with the reason for every candidate)
+        """
+        def _query():
+            with self.db_pool.get_cursor() as cur:
                 query = """
                     SELECT im.* FROM "IndicatorMetadata" im
                     LEFT JOIN "ChartCategory" cc ON cc.id = im."categoryId"
@@ -664,58 +874,183 @@ class ETLService:
                     query += " AND im.source = %s"
                     params.append(source)
                 
-                count_query = query.replace('SELECT im.*', 'SELECT COUNT(*) as total')
-                cur.execute(count_query, params)
-                total_before_filter = cur.fetchone()['total']
-                
-                # Get status breakdown before filter
-                status_query = query.replace('SELECT im.*', 'SELECT im."etlStatus", COUNT(*) as count')
-                status_query += ' GROUP BY im."etlStatus"'
-                cur.execute(status_query, params)
-                status_breakdown = {row['etlStatus']: row['count'] for row in cur.fetchall()}
-                
-                if not force_refresh:
-                    # Only include indicators that need update
-                    query += """ AND (
-                        im."etlStatus" IN ('UNKNOWN', 'ERROR') 
-                        OR im."lastEtlRunAt" IS NULL
-                        OR im."lastEtlRunAt" < NOW() - INTERVAL '7 days'
-                    )"""
-                
                 cur.execute(query, params)
-                indicators = [dict(row) for row in cur.fetchall()]
-                
-                # Get status breakdown after filter
-                status_after_query = query.replace('SELECT im.*', 'SELECT im."etlStatus", COUNT(*) as count')
-                status_after_query += ' GROUP BY im."etlStatus"'
-                cur.execute(status_after_query, params)
-                status_after_breakdown = {row['etlStatus']: row['count'] for row in cur.fetchall()}
-                
-                logger.info(f"[ETL QUERY] Total active indicators: {total_before_filter}")
-                logger.info(f"[ETL QUERY] Status breakdown BEFORE filter: {status_breakdown}")
-                logger.info(f"[ETL QUERY] After filter (UNKNOWN/ERROR or never fetched or >7 days old): {len(indicators)}")
-                logger.info(f"[ETL QUERY] Status breakdown AFTER filter: {status_after_breakdown}")
-                logger.info(f"[ETL QUERY] Filters - Category={category}, Source={source}, ForceRefresh={force_refresh}")
-                
-                return indicators
+                return [dict(row) for row in cur.fetchall()]
+        
+        candidates = await self.db_pool.run(_query)
+        indicators, plan = await self._plan_freshness(candidates, force_refresh)
+        
+        logger.info(f"[ETL QUERY] Total active indicators: {len(candidates)}")
+        logger.info(f"[ETL QUERY] Due for fetch: {plan['due']}, skipped: {plan['skipped']}, reasons: {plan['reasons']}")
+        logger.info(f"[ETL QUERY] Filters - Category={category}, Source={source}, ForceRefresh={force_refresh}")
+        
+        return indicators, plan
+    
+    async def _plan_freshness(
+        self,
+        candidates: List[Dict[str, Any]],
+        force_refresh: bool
+    ):
+        """Keep only indicators whose series can have new data, recording why each one was kept or skipped"""
+        watermarks_by_source: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        
+        if not force_refresh:
+            series_by_source: Dict[str, set] = {}
+            for indicator in candidates:
+                series_by_source.setdefault(get_source_key(indicator.get('source')), set()).update(
+                    self._split_series_ids(indicator.get('seriesIDs'))
+                )
+            
+            for source_key, series_ids in series_by_source.items():
+                watermarks_by_source[source_key] = await self.watermark_service.get_watermarks(source_key, sorted(series_ids))
+        
+        planner = FreshnessPlanner(
+            fallback_days=settings.ETL_FRESHNESS_FALLBACK_DAYS,
+            max_age_days=settings.ETL_FRESHNESS_MAX_AGE_DAYS
+        )
+        now = datetime.now()
+        
+        due_indicators = []
+        decisions = []
+        reasons: Dict[str, int] = {}
+        
+        for indicator in candidates:
+            watermarks = watermarks_by_source.get(get_source_key(indicator.get('source')), {})
+            series_states = [watermarks.get(sid, {}) for sid in self._split_series_ids(indicator.get('seriesIDs'))]
+            
+            decision = planner.decide(indicator, series_states, force_refresh=force_refresh, now=now)
+            if decision.due:
+                due_indicators.append(indicator)
+            
+            reasons[decision.reason] = reasons.get(decision.reason, 0) + 1
+            decisions.append({
+                'id': indicator['id'],
+                'indicator': indicator.get('indicatorEN'),
+                **decision.as_dict()
+            })
+        
+        plan = {
+            'planned_at': now.isoformat(),
+            'due': len(due_indicators),
+            'skipped': len(candidates) - len(due_indicators),
+            'reasons': reasons,
+            'indicators': decisions
+        }
+        return due_indicators, plan
+    
+    async def _get_indicators_by_ids(self, indicator_ids: List[int]) -> List[Dict[str, Any]]:
+        """Get id/source/series routing info for a list of indicators, preserving order"""
+        if not indicator_ids:
+            return []
+        
+        def _query():
+            with self.db_pool.get_cursor() as cur:
+                cur.execute("""
+                    SELECT id, source, "seriesIDs", "indicatorEN", "etlStatus", calculation
+                    FROM "IndicatorMetadata"
+                    WHERE id = ANY(%s)
+                """, (list(indicator_ids),))
                 
-        finally:
-            if 'conn' in locals():
-                conn.close()
+                return {row['id']: dict(row) for row in cur.fetchall()}
+        
+        rows = await self.db_pool.run(_query)
+        
+        # Indicators deleted since the job was created still go through fetch_indicator_data
+        # so they end up counted (and logged) as failed rather than silently dropped
+        return [rows.get(indicator_id, {'id': indicator_id, 'source': None}) for indicator_id in indicator_ids]
     
     async def _get_indicator_metadata(self, indicator_id: int) -> Optional[Dict[str, Any]]:
         """Get indicator metadata"""
-        try:
-            conn = psycopg2.connect(self.db_url)
-            
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        def _query():
+            with self.db_pool.get_cursor() as cur:
                 cur.execute('SELECT * FROM "IndicatorMetadata" WHERE id = %s', (indicator_id,))
                 result = cur.fetchone()
                 return dict(result) if result else None
-                
-        finally:
-            if 'conn' in locals():
-                conn.close()
+        
+        return await self.db_pool.run(_query)
+    
+    @classmethod
+    def _ensure_etl_tables(cls, cur) -> None:
+        """Create ETL bookkeeping tables once per process instead of on every write"""
+        if cls._tables_ready:
+            return
+        
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS "ETLJob" (
+                "jobId" VARCHAR(50) PRIMARY KEY,
+                status VARCHAR(20) NOT NULL,
+                "totalIndicators" INTEGER NOT NULL,
+                successful INTEGER DEFAULT 0,
+                failed INTEGER DEFAULT 0,
+                blocked INTEGER DEFAULT 0,
+                "startedAt" TIMESTAMP NOT NULL,
+                "completedAt" TIMESTAMP,
+                metadata JSONB,
+                "createdAt" TIMESTAMP DEFAULT NOW()
+            )
+        """)
+        
+        cur.execute("""
+            ALTER TABLE "ETLJob"
+            ADD COLUMN IF NOT EXISTS "heartbeatAt" TIMESTAMP,
+            ADD COLUMN IF NOT EXISTS "ownerId" VARCHAR(100)
+        """)
+        
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS "ETLJobItem" (
+                "jobId" VARCHAR(50) NOT NULL,
+                "indicatorId" INTEGER NOT NULL,
+                status VARCHAR(20) NOT NULL DEFAULT 'PENDING',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                "errorMessage" TEXT,
+                "startedAt" TIMESTAMP,
+                "completedAt" TIMESTAMP,
+                "updatedAt" TIMESTAMP NOT NULL DEFAULT NOW(),
+                PRIMARY KEY ("jobId", "indicatorId")
+            )
+        """)
+        
+        cur.execute("""
+            ALTER TABLE "ETLJobItem"
+            ADD COLUMN IF NOT EXISTS "leaseOwner" VARCHAR(100),
+            ADD COLUMN IF NOT EXISTS "leaseExpiresAt" TIMESTAMP
+        """)
+        
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS "ETLJobItem_jobId_status_idx" ON "ETLJobItem" ("jobId", status)
+        """)
+        
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS "IndicatorETLLog" (
+                id SERIAL PRIMARY KEY,
+                "indicatorId" INTEGER NOT NULL,
+                "jobId" VARCHAR(50) NOT NULL,
+                status VARCHAR(20) NOT NULL,
+                "errorCode" VARCHAR(50),
+                "errorMessage" TEXT,
+                "errorCategory" VARCHAR(50),
+                "recordsProcessed" INTEGER DEFAULT 0,
+                "recordsInserted" INTEGER DEFAULT 0,
+                "recordsUpdated" INTEGER DEFAULT 0,
+                "startedAt" TIMESTAMP,
+                "completedAt" TIMESTAMP,
+                "createdAt" TIMESTAMP DEFAULT NOW(),
+                metadata JSONB
+            )
+        """)
+        
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS "IndicatorSeriesFingerprint" (
+                "indicatorMetadataId" INTEGER PRIMARY KEY,
+                fingerprint VARCHAR(64) NOT NULL,
+                "rowCount" INTEGER NOT NULL,
+                "firstDate" DATE,
+                "lastDate" DATE,
+                "updatedAt" TIMESTAMP NOT NULL DEFAULT NOW()
+            )
+        """)
+        
+        cls._tables_ready = True
     
     def _validate_indicator_api_config(self, indicator: Dict[str, Any]) -> Optional[str]:
         """
@@ -747,34 +1082,26 @@ class ETLService:
                 if not series or not series.replace('_', '').replace('-', '').isalnum():
                     return f"INVALID_FRED_SERIES: Invalid FRED series ID format: '{series}'"
         
+        if 'cftc' in source:
+            for series in series_ids.split('|'):
+                try:
+                    parse_cftc_series_id(series)
+                except ValueError as e:
+                    return f"INVALID_CFTC_SERIES: {e}"
+        
+        formula_error = validate_formula(indicator.get('calculation'), tuple(self._split_series_ids(series_ids)))
+        if formula_error:
+            return f"INVALID_FORMULA: {formula_error}"
+        
         return None
     
     async def _create_etl_log(self, indicator_id: int) -> int:
         """Create ETL log entry"""
-        try:
-            conn = psycopg2.connect(self.db_url)
-            
-            with conn.cursor() as cur:
+        def _query():
+            with self.db_pool.get_cursor() as cur:
                 job_id = f"LOG_{uuid.uuid4().hex[:12]}"
                 
-                cur.execute("""
-                    CREATE TABLE IF NOT EXISTS "IndicatorETLLog" (
-                        id SERIAL PRIMARY KEY,
-                        "indicatorId" INTEGER NOT NULL,
-                        "jobId" VARCHAR(50) NOT NULL,
-                        status VARCHAR(20) NOT NULL,
-                        "errorCode" VARCHAR(50),
-                        "errorMessage" TEXT,
-                        "errorCategory" VARCHAR(50),
-                        "recordsProcessed" INTEGER DEFAULT 0,
-                        "recordsInserted" INTEGER DEFAULT 0,
-                        "recordsUpdated" INTEGER DEFAULT 0,
-                        "startedAt" TIMESTAMP,
-                        "completedAt" TIMESTAMP,
-                        "createdAt" TIMESTAMP DEFAULT NOW(),
-                        metadata JSONB
-                    )
-                """)
+                self._ensure_etl_tables(cur)
                 
                 cur.execute("""
                     INSERT INTO "IndicatorETLLog" ("indicatorId", "jobId", status, "startedAt")
@@ -782,14 +1109,9 @@ class ETLService:
                     RETURNING id
                 """, (indicator_id, job_id, 'PROCESSING', datetime.now()))
                 
-                etl_log_id = cur.fetchone()[0]
-                conn.commit()
-                
-                return etl_log_id
-                
-        finally:
-            if 'conn' in locals():
-                conn.close()
+                return cur.fetchone()['id']
+        
+        return await self.db_pool.run(_query)
     
     async def _complete_etl_log(
         self,
@@ -797,32 +1119,34 @@ class ETLService:
         status: str,
         records_processed: int = 0,
         records_inserted: int = 0,
+        records_updated: int = 0,
         error_code: Optional[str] = None,
         error_message: Optional[str] = None,
-        error_category: Optional[str] = None
+        error_category: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
     ) -> None:
         """Complete ETL log"""
-        try:
-            conn = psycopg2.connect(self.db_url)
-            
-            with conn.cursor() as cur:
+        def _query():
+            with self.db_pool.get_cursor() as cur:
                 cur.execute("""
                     UPDATE "IndicatorETLLog"
                     SET status = %s,
                         "recordsProcessed" = %s,
                         "recordsInserted" = %s,
+                        "recordsUpdated" = %s,
                         "errorCode" = %s,
                         "errorMessage" = %s,
                         "errorCategory" = %s,
-                        "completedAt" = %s
+                        "completedAt" = %s,
+                        metadata = COALESCE(%s, metadata)
                     WHERE id = %s
-                """, (status, records_processed, records_inserted, error_code, error_message, error_category, datetime.now(), etl_log_id))
-                
-                conn.commit()
-                
-        finally:
-            if 'conn' in locals():
-                conn.close()
+                """, (
+                    status, records_processed, records_inserted, records_updated,
+                    error_code, error_message, error_category, datetime.now(),
+                    psycopg2.extras.Json(metadata) if metadata else None, etl_log_id
+                ))
+        
+        await self.db_pool.run(_query)
     
     async def _update_indicator_etl_status(
         self,
@@ -834,10 +1158,8 @@ class ETLService:
         etl_notes: Optional[str] = None
     ) -> None:
         """Update indicator ETL status"""
-        try:
-            conn = psycopg2.connect(self.db_url)
-            
-            with conn.cursor() as cur:
+        def _query():
+            with self.db_pool.get_cursor() as cur:
                 updates = ['"etlStatus" = %s', '"lastEtlRunAt" = %s']
                 params = [status, datetime.now()]
                 
@@ -864,167 +1186,464 @@ class ETLService:
                     SET {', '.join(updates)}
                     WHERE id = %s
                 """, params)
-                
-                conn.commit()
-                
-        finally:
-            if 'conn' in locals():
-                conn.close()
+        
+        await self.db_pool.run(_query)
     
     async def _save_time_series_data(
         self,
         indicator_id: int,
-        data: List[Dict[str, Any]],
-        original_data: Optional[List[Dict[str, Any]]] = None,
+        series: ColumnarSeries,
+        original: Optional[ColumnarSeries] = None,
         has_calculation: bool = False,
-        force_refresh: bool = False
-    ) -> int:
+        force_refresh: bool = False,
+        features: Optional[Dict[str, np.ndarray]] = None
+    ) -> TimeSeriesWriteResult:
         """
         Save time-series data to database with dual value support
         
+        Only new or changed dates are written. When the batch matches the stored series
+        fingerprint the write is skipped entirely.
+        
         Args:
             indicator_id: ID of the indicator
-            data: Enriched data (with AI features) - this is the main value
-            original_data: Original raw data from API (only if has_calculation=True)
+            series: Series to save - this is the main value
+            original: Original raw series from API (only if has_calculation=True)
             has_calculation: Whether this indicator has a calculation formula
-            force_refresh: Whether to force refresh existing data
+            force_refresh: Rewrite every row even if it is unchanged
+            features: AI feature arrays aligned with series.dates, keyed like TIME_SERIES_FEATURE_COLUMNS
         """
-        if not data:
-            return 0
+        if not len(series):
+            return TimeSeriesWriteResult()
         
-        original_lookup = {}
-        if original_data and has_calculation:
-            for item in original_data:
-                original_lookup[item['date']] = item.get('value')
+        # Row building is CPU work on large histories - keep it off the event loop too
+        batch = await asyncio.to_thread(
+            self._prepare_time_series_rows,
+            indicator_id,
+            series,
+            original,
+            has_calculation,
+            features
+        )
         
-        try:
-            conn = psycopg2.connect(self.db_url)
-            
-            with conn.cursor() as cur:
-                seen_dates = {}
-                for item in data:
-                    item_date = item['date']
-                    seen_dates[item_date] = item  # Will overwrite duplicates
+        def _query():
+            with self.db_pool.get_cursor() as cur:
+                self._ensure_etl_tables(cur)
                 
-                deduplicated_data = list(seen_dates.values())
+                if not force_refresh and self._fingerprint_matches(cur, indicator_id, batch):
+                    return TimeSeriesWriteResult(unchanged=len(batch.rows), skipped_write=True)
                 
-                if len(deduplicated_data) < len(data):
-                    logger.warning(f"Removed {len(data) - len(deduplicated_data)} duplicate dates for indicator {indicator_id}")
+                stored = self._load_stored_time_series(cur, indicator_id, batch)
+                rows_to_write, result = self._diff_time_series_rows(batch, has_calculation, stored, force_refresh)
                 
-                values = []
-                for item in deduplicated_data:
-                    item_date = item['date']
-                    main_value = item.get('value')
-                    
-                    if has_calculation:
-                        original_val = original_lookup.get(item_date)
-                        calculated_val = main_value
-                    else:
-                        original_val = None
-                        calculated_val = None
-                    
-                    values.append((
-                        indicator_id,
-                        item_date,
-                        main_value,
-                        original_val,
-                        calculated_val,
-                        has_calculation,
-                        item.get('z_score'),
-                        item.get('normalized'),
-                        item.get('pct_change_1m'),
-                        item.get('pct_change_3m'),
-                        item.get('pct_change_12m'),
-                        item.get('ma_30d'),
-                        item.get('ma_90d'),
-                        item.get('ma_365d'),
-                        item.get('volatility_30d'),
-                        item.get('volatility_90d'),
-                        item.get('trend'),
-                        item.get('is_outlier', False),
-                        datetime.now(),
-                        datetime.now()
-                    ))
+                if rows_to_write:
+                    write = self._copy_time_series_rows if self._use_copy_writes(len(rows_to_write)) else self._insert_time_series_rows
+                    write(cur, indicator_id, has_calculation, batch.feature_columns, rows_to_write, datetime.now())
                 
-                execute_values(cur, """
-                    INSERT INTO "IndicatorTimeSeries" (
-                        "indicatorMetadataId", date, value,
-                        "originalValue", "calculatedValue", "hasCalculation",
-                        "zScore", normalized,
-                        "pctChange1m", "pctChange3m", "pctChange12m",
-                        "ma30d", "ma90d", "ma365d",
-                        "volatility30d", "volatility90d",
-                        trend, "isOutlier",
-                        "createdAt", "updatedAt"
-                    ) VALUES %s
-                    ON CONFLICT ("indicatorMetadataId", date)
-                    DO UPDATE SET
-                        value = EXCLUDED.value,
-                        "originalValue" = EXCLUDED."originalValue",
-                        "calculatedValue" = EXCLUDED."calculatedValue",
-                        "hasCalculation" = EXCLUDED."hasCalculation",
-                        "zScore" = EXCLUDED."zScore",
-                        normalized = EXCLUDED.normalized,
-                        "pctChange1m" = EXCLUDED."pctChange1m",
-                        "pctChange3m" = EXCLUDED."pctChange3m",
-                        "pctChange12m" = EXCLUDED."pctChange12m",
-                        "ma30d" = EXCLUDED."ma30d",
-                        "ma90d" = EXCLUDED."ma90d",
-                        "ma365d" = EXCLUDED."ma365d",
-                        "volatility30d" = EXCLUDED."volatility30d",
-                        "volatility90d" = EXCLUDED."volatility90d",
-                        trend = EXCLUDED.trend,
-                        "isOutlier" = EXCLUDED."isOutlier",
-                        "updatedAt" = EXCLUDED."updatedAt"
-                """, values)
-                
-                conn.commit()
-                return len(values)
-                
-        finally:
-            if 'conn' in locals():
-                conn.close()
+                self._store_fingerprint(cur, indicator_id, batch)
+                return result
+        
+        result = await self.db_pool.run(_query)
+        
+        logger.info(
+            f"Saved time series for indicator {indicator_id}: inserted={result.inserted}, "
+            f"updated={result.updated}, unchanged={result.unchanged}"
+            f"{' (fingerprint match, write skipped)' if result.skipped_write else ''}"
+        )
+        return result
+    
+    def _prepare_time_series_rows(
+        self,
+        indicator_id: int,
+        series: ColumnarSeries,
+        original: Optional[ColumnarSeries],
+        has_calculation: bool,
+        features: Optional[Dict[str, np.ndarray]] = None
+    ) -> TimeSeriesBatch:
+        """
+        Build date-ordered IndicatorTimeSeries rows from the series arrays (runs in a worker thread)
+        
+        ColumnarSeries already holds one value per date. Only feature columns with at least
+        one value are included; each row is (date, value, originalValue, calculatedValue,
+        *feature values).
+        """
+        features = features or {}
+        
+        dates = series.date_list()
+        values = series.values.tolist()
+        
+        if has_calculation:
+            original_values = _column_values(original.align(series.dates)) if original is not None else [None] * len(dates)
+            calculated_values = values
+        else:
+            original_values = calculated_values = [None] * len(dates)
+        
+        feature_columns = []
+        feature_values = []
+        for column in TIME_SERIES_FEATURE_COLUMNS:
+            if column.key not in features:
+                continue
+            column_values = _column_values(features[column.key])
+            if any(value is not None for value in column_values):
+                feature_columns.append(column)
+                feature_values.append([column.default if value is None else value for value in column_values])
+        
+        rows = list(zip(dates, values, original_values, calculated_values, *feature_values))
+        
+        return TimeSeriesBatch(
+            feature_columns=feature_columns,
+            rows=rows,
+            fingerprint=self._fingerprint_rows(has_calculation, feature_columns, rows),
+            first_date=rows[0][0] if rows else None,
+            last_date=rows[-1][0] if rows else None
+        )
+    
+    @staticmethod
+    def _fingerprint_rows(has_calculation: bool, feature_columns: List[TimeSeriesColumn], rows: List[tuple]) -> str:
+        """SHA-256 over the rows as they will be stored (numbers rounded to their column scale)"""
+        columns = TIME_SERIES_VALUE_COLUMNS + feature_columns
+        digest = hashlib.sha256(f"{int(has_calculation)}|{','.join(c.name for c in feature_columns)}\n".encode())
+        
+        for row in rows:
+            parts = [row[0].isoformat()]
+            for column, value in zip(columns, row[1:]):
+                if value is None:
+                    parts.append('')
+                elif column.scale is not None:
+                    parts.append(f"{float(value):.{column.scale}f}")
+                else:
+                    parts.append(str(value))
+            digest.update('|'.join(parts).encode())
+            digest.update(b'\n')
+        
+        return digest.hexdigest()
+    
+    def _fingerprint_matches(self, cur, indicator_id: int, batch: TimeSeriesBatch) -> bool:
+        """True when the stored series already holds exactly this batch (same fingerprint and row count)"""
+        cur.execute("""
+            SELECT f.fingerprint, f."rowCount",
+                (
+                    SELECT COUNT(*) FROM "IndicatorTimeSeries" ts
+                    WHERE ts."indicatorMetadataId" = f."indicatorMetadataId"
+                    AND ts.date BETWEEN f."firstDate" AND f."lastDate"
+                ) AS stored_count
+            FROM "IndicatorSeriesFingerprint" f
+            WHERE f."indicatorMetadataId" = %s
+        """, (indicator_id,))
+        
+        row = cur.fetchone()
+        if not row:
+            return False
+        
+        return row['fingerprint'] == batch.fingerprint and row['rowCount'] == row['stored_count'] == len(batch.rows)
+    
+    def _store_fingerprint(self, cur, indicator_id: int, batch: TimeSeriesBatch) -> None:
+        cur.execute("""
+            INSERT INTO "IndicatorSeriesFingerprint" ("indicatorMetadataId", fingerprint, "rowCount", "firstDate", "lastDate", "updatedAt")
+            VALUES (%s, %s, %s, %s, %s, %s)
+            ON CONFLICT ("indicatorMetadataId")
+            DO UPDATE SET
+                fingerprint = EXCLUDED.fingerprint,
+                "rowCount" = EXCLUDED."rowCount",
+                "firstDate" = EXCLUDED."firstDate",
+                "lastDate" = EXCLUDED."lastDate",
+                "updatedAt" = EXCLUDED."updatedAt"
+        """, (indicator_id, batch.fingerprint, len(batch.rows), batch.first_date, batch.last_date, datetime.now()))
+    
+    def _load_stored_time_series(self, cur, indicator_id: int, batch: TimeSeriesBatch) -> Dict[date, tuple]:
+        """Stored rows in the batch's date range as date -> (hasCalculation, value columns..., feature columns...)"""
+        if not batch.rows:
+            return {}
+        
+        columns = ['hasCalculation'] + [c.name for c in TIME_SERIES_VALUE_COLUMNS + TIME_SERIES_FEATURE_COLUMNS]
+        
+        cur.execute(f"""
+            SELECT date, {', '.join(f'"{column}"' for column in columns)}
+            FROM "IndicatorTimeSeries"
+            WHERE "indicatorMetadataId" = %s
+            AND date BETWEEN %s AND %s
+        """, (indicator_id, batch.first_date, batch.last_date))
+        
+        return {
+            row['date']: tuple(row[column] for column in columns)
+            for row in cur.fetchall()
+        }
+    
+    def _diff_time_series_rows(
+        self,
+        batch: TimeSeriesBatch,
+        has_calculation: bool,
+        stored: Dict[date, tuple],
+        force_refresh: bool = False
+    ) -> tuple:
+        """
+        Split the batch into rows that need writing and count inserted/updated/unchanged
+        
+        A row is unchanged when every column would store the same value a write would
+        produce, including feature columns a write would reset.
+        """
+        result = TimeSeriesWriteResult()
+        rows_to_write = []
+        
+        populated = {column.name: index for index, column in enumerate(batch.feature_columns, start=4)}
+        scales = [None] + [column.scale for column in TIME_SERIES_VALUE_COLUMNS + TIME_SERIES_FEATURE_COLUMNS]
+        
+        for row in batch.rows:
+            existing = stored.get(row[0])
+            
+            if existing is None:
+                result.inserted += 1
+                rows_to_write.append(row)
+                continue
+            
+            incoming = [has_calculation, row[1], row[2], row[3]]
+            for column in TIME_SERIES_FEATURE_COLUMNS:
+                incoming.append(row[populated[column.name]] if column.name in populated else column.default)
+            
+            if force_refresh or not all(
+                _stored_value_equal(stored_value, value, scale)
+                for stored_value, value, scale in zip(existing, incoming, scales)
+            ):
+                result.updated += 1
+                rows_to_write.append(row)
+            else:
+                result.unchanged += 1
+        
+        return rows_to_write, result
+    
+    def _use_copy_writes(self, row_count: int) -> bool:
+        """Pick the write path: TIME_SERIES_WRITE_MODE is 'copy', 'values' or 'auto' (COPY from a row threshold)"""
+        mode = (settings.TIME_SERIES_WRITE_MODE or 'auto').lower()
+        
+        if mode == 'copy':
+            return True
+        elif mode == 'values':
+            return False
+        
+        return row_count >= settings.TIME_SERIES_COPY_MIN_ROWS
+    
+    def _time_series_upsert_sql(self, feature_columns: List[TimeSeriesColumn]) -> tuple:
+        """Column list and ON CONFLICT clause for an IndicatorTimeSeries upsert of the given feature columns"""
+        populated = {column.name for column in feature_columns}
+        
+        insert_columns = (
+            ['indicatorMetadataId', 'date'] + [c.name for c in TIME_SERIES_VALUE_COLUMNS] + ['hasCalculation']
+            + [c.name for c in feature_columns] + ['createdAt', 'updatedAt']
+        )
+        
+        updates = [f'"{c.name}" = EXCLUDED."{c.name}"' for c in TIME_SERIES_VALUE_COLUMNS]
+        updates.append('"hasCalculation" = EXCLUDED."hasCalculation"')
+        for column in TIME_SERIES_FEATURE_COLUMNS:
+            if column.name in populated:
+                updates.append(f'"{column.name}" = EXCLUDED."{column.name}"')
+            else:
+                # Not part of this write - reset it the same way a full-width write would
+                updates.append(f'"{column.name}" = {"NULL" if column.default is None else str(column.default).upper()}')
+        updates.append('"updatedAt" = EXCLUDED."updatedAt"')
+        
+        columns_sql = ', '.join(f'"{column}"' for column in insert_columns)
+        conflict_sql = f"""
+            ON CONFLICT ("indicatorMetadataId", date)
+            DO UPDATE SET
+                {', '.join(updates)}
+        """
+        return columns_sql, conflict_sql
+    
+    def _insert_time_series_rows(
+        self,
+        cur,
+        indicator_id: int,
+        has_calculation: bool,
+        feature_columns: List[TimeSeriesColumn],
+        rows: List[tuple],
+        written_at: datetime
+    ) -> None:
+        """Upsert rows with a multi-row INSERT ... VALUES (best for small batches)"""
+        columns_sql, conflict_sql = self._time_series_upsert_sql(feature_columns)
+        
+        values = [
+            (indicator_id, *row[:4], has_calculation, *row[4:], written_at, written_at)
+            for row in rows
+        ]
+        
+        execute_values(cur, f"""
+            INSERT INTO "IndicatorTimeSeries" ({columns_sql})
+            VALUES %s
+            {conflict_sql}
+        """, values, page_size=1000)
+    
+    def _copy_time_series_rows(
+        self,
+        cur,
+        indicator_id: int,
+        has_calculation: bool,
+        feature_columns: List[TimeSeriesColumn],
+        rows: List[tuple],
+        written_at: datetime
+    ) -> None:
+        """
+        Upsert rows by streaming them with binary COPY into a transaction-scoped staging
+        table and merging into IndicatorTimeSeries with a single INSERT ... SELECT
+        """
+        columns_sql, conflict_sql = self._time_series_upsert_sql(feature_columns)
+        
+        stage_columns = [('date', 'date')]
+        stage_columns += [(column.name, column.stage_type) for column in TIME_SERIES_VALUE_COLUMNS + feature_columns]
+        
+        cur.execute(f"""
+            CREATE TEMP TABLE "_IndicatorTimeSeriesStage" (
+                {', '.join(f'"{name}" {stage_type}' for name, stage_type in stage_columns)}
+            ) ON COMMIT DROP
+        """)
+        
+        cur.copy_expert(
+            'COPY "_IndicatorTimeSeriesStage" FROM STDIN WITH (FORMAT binary)',
+            encode_binary_copy(rows, [stage_type for _, stage_type in stage_columns])
+        )
+        
+        feature_select = ''.join(f', s."{column.name}"' for column in feature_columns)
+        cur.execute(f"""
+            INSERT INTO "IndicatorTimeSeries" ({columns_sql})
+            SELECT %s, s.date, s.value, s."originalValue", s."calculatedValue", %s{feature_select}, %s, %s
+            FROM "_IndicatorTimeSeriesStage" s
+            {conflict_sql}
+        """, (indicator_id, has_calculation, written_at, written_at))
     
     async def _apply_calculation(
         self,
-        raw_data: List[Dict[str, Any]],
+        series_columns: Dict[str, ColumnarSeries],
         calculation: str,
-        series_ids: str
-    ) -> List[Dict[str, Any]]:
-        """Apply calculation logic"""
-        import pandas as pd
-        from core.calculation_engine import CalculationEngine
-        calculation_engine = CalculationEngine()
+        series_ids: str,
+        calculation_batch: Optional[CalculationBatch] = None,
+        indicator_id: Optional[int] = None
+    ) -> ColumnarSeries:
+        """
+        Apply calculation logic off the event loop to the indicator's component series
         
-        if '|' in series_ids:
-            series_list = [s.strip() for s in series_ids.split('|')]
-            series_data = {}
+        Runs in the calculation process pool when CALCULATION_EXECUTION_MODE=process,
+        otherwise in a worker thread. With a calculation batch it is evaluated in the
+        batch's next round, together with the other indicators' calculations.
+        """
+        for series_id in self._split_series_ids(series_ids):
+            if series_columns.get(series_id) is not None and len(series_columns[series_id]):
+                logger.info(f"Prepared {len(series_columns[series_id])} records for series {series_id}")
+            else:
+                logger.warning(f"No data found for series {series_id}")
+        
+        series_columns = {series_id: series for series_id, series in series_columns.items() if len(series)}
+        if not series_columns:
+            raise ValueError("No data available for any of the specified series")
+        
+        if calculation_batch is not None:
+            return await calculation_batch.calculate(indicator_id, series_columns, calculation, series_ids)
+        
+        if calculation_pool.enabled:
+            try:
+                return await calculation_pool.calculate(series_columns, calculation, series_ids)
+            except BrokenProcessPool as e:
+                logger.error(f"Calculation pool failed, running calculation in-process: {e}")
+        
+        return await asyncio.to_thread(self._run_calculation, series_columns, calculation, series_ids)
+    
+    async def _resume_calculation(
+        self,
+        state: RollingState,
+        fetched: Dict[str, ColumnarSeries],
+        indicator: Dict[str, Any],
+        save_from: date
+    ) -> Optional[Tuple[Dict[str, ColumnarSeries], ColumnarSeries]]:
+        """
+        Calculate an indicator from its rolling state plus the newly fetched observations
+        
+        Returns:
+            (calculation inputs, calculated series), or None when the state cannot stand in for
+            full history: the update reaches back further than it holds, or the value it recorded
+            for its last date does not come out the same
+        """
+        inputs = state.extend(fetched, save_from)
+        if inputs is None:
+            return None
+        
+        try:
+            series = await self._apply_calculation(inputs, indicator['calculation'], indicator['seriesIDs'])
             
-            for series_id in series_list:
-                series_records = [record for record in raw_data if record.get('series_id') == series_id]
-                if series_records:
-                    df = pd.DataFrame(series_records)
-                    series_data[series_id] = df
-                    logger.info(f"Prepared {len(series_records)} records for series {series_id}")
-                else:
-                    logger.warning(f"No data found for series {series_id}")
+            # A revision of observations the state held may legitimately change its last value -
+            # then check the state against its own inputs instead
+            check = series
+            if state.revised(fetched):
+                check = await self._apply_calculation(state.components, indicator['calculation'], indicator['seriesIDs'])
+        except ValueError as e:
+            # Too little history in the tails for the calculation to produce anything
+            logger.info(f"Calculation from rolling state failed: {e}")
+            return None
+        
+        if not state.reproduces(check):
+            return None
+        
+        return inputs, series
+    
+    async def _store_calculation_state(
+        self,
+        indicator_id: int,
+        indicator: Dict[str, Any],
+        inputs: Dict[str, ColumnarSeries],
+        series: ColumnarSeries,
+        full_history: set
+    ) -> None:
+        """Keep the input tails the indicator's next incremental update resumes from"""
+        if self.calculation_states is None:
+            return
+        
+        from core.calculation_engine import calculation_engine
+        
+        try:
+            lookback = calculation_engine.lookback(indicator['calculation'], tuple(inputs))
+            if lookback is None:
+                return
             
-            if not series_data:
-                raise ValueError("No data available for any of the specified series")
-                
-        else:
-            df = pd.DataFrame(raw_data)
-            series_data = {series_ids.strip(): df}
+            state = RollingState.capture(
+                state_key(indicator['calculation'], indicator['seriesIDs']),
+                inputs,
+                series,
+                lookback,
+                settings.ETL_REVISION_LOOKBACK_DAYS,
+                full_history
+            )
+            if state is not None:
+                await self.calculation_states.put(indicator_id, state)
+        except Exception as e:
+            # Data is saved; without a state the next incremental run fetches warm-up history instead
+            logger.warning(f"Failed to store calculation state for indicator {indicator_id}: {e}")
+    
+    async def _get_calculation_states(self, indicators: List[Dict[str, Any]]) -> Dict[int, RollingState]:
+        """Rolling states of the calculated indicators, where they belong to the current calculation"""
+        calculated = [indicator for indicator in indicators if indicator.get('calculation')]
+        if self.calculation_states is None or not calculated:
+            return {}
         
-        result = calculation_engine.process_calculation(calculation, series_data, "indicator")
+        try:
+            states = await self.calculation_states.get_states([indicator['id'] for indicator in calculated])
+        except Exception as e:
+            logger.warning(f"Failed to load calculation states, using warm-up history: {e}")
+            return {}
         
-        if result.success and result.data is not None:
-            if isinstance(result.data, pd.DataFrame):
-                return result.data.to_dict('records')
-            else:
-                return result.data
-        else:
-            raise ValueError(f"Calculation failed: {result.error_message}")
+        return {
+            indicator['id']: states[indicator['id']]
+            for indicator in calculated
+            if indicator['id'] in states
+            and states[indicator['id']].key == state_key(indicator['calculation'], indicator['seriesIDs'])
+        }
+    
+    def _run_calculation(
+        self,
+        series_columns: Dict[str, ColumnarSeries],
+        calculation: str,
+        series_ids: str
+    ) -> ColumnarSeries:
+        """Apply calculation logic"""
+        from core.calculation_engine import CalculationEngine
+        calculation_engine = CalculationEngine()
+        
+        return calculation_engine.calculate_series(calculation, series_columns, "indicator", series_ids)
     
     def _classify_error(self, error: Exception) -> str:
         """Classify error and return error code"""
@@ -1032,6 +1651,8 @@ class ETLService:
         
         if 'api key' in error_str or 'authentication' in error_str:
             return 'API_AUTHENTICATION_FAILED'
+        elif 'invalid_formula' in error_str:
+            return 'INVALID_FORMULA'
         elif 'rate limit' in error_str:
             return 'API_RATE_LIMIT'
         elif 'timeout' in error_str:
@@ -1062,17 +1683,13 @@ class ETLService:
     
     async def _get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
         """Get job by ID"""
-        try:
-            conn = psycopg2.connect(self.db_url)
-            
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        def _query():
+            with self.db_pool.get_cursor() as cur:
                 cur.execute('SELECT * FROM "ETLJob" WHERE "jobId" = %s', (job_id,))
                 result = cur.fetchone()
                 return dict(result) if result else None
-                
-        finally:
-            if 'conn' in locals():
-                conn.close()
+        
+        return await self.db_pool.run(_query)
     
     async def _update_job_status(
         self,
@@ -1080,28 +1697,606 @@ class ETLService:
         status: str,
         successful: int = 0,
         failed: int = 0,
-        blocked: int = 0
+        blocked: int = 0,
+        summary: Optional[Dict[str, Any]] = None
     ) -> None:
-        """Update job status"""
+        """Update job status (summary is merged into the job metadata)"""
+        def _query():
+            with self.db_pool.get_cursor() as cur:
+                cur.execute("""
+                    UPDATE "ETLJob"
+                    SET status = %s,
+                        successful = %s,
+                        failed = %s,
+                        blocked = %s,
+                        "completedAt" = %s,
+                        metadata = COALESCE(metadata, '{}'::jsonb) || %s::jsonb
+                    WHERE "jobId" = %s
+                """, (status, successful, failed, blocked, datetime.now(), psycopg2.extras.Json(summary or {}), job_id))
+        
+        await self.db_pool.run(_query)
+    
+    async def drain_job(self, job_id: str, job: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Claim and run batches of a job's items until none are left to claim
+        
+        Safe to run on every replica at once: items are claimed with FOR UPDATE SKIP LOCKED
+        under a lease, so each batch goes to exactly one worker, and items of a crashed
+        worker become claimable again once their lease expires. Whoever finishes the last
+        item marks the job completed.
+        
+        Returns:
+            Number of items run by this process
+        """
+        if job_id in _draining_jobs:
+            return 0
+        
+        job = job or await self._get_job(job_id)
+        if not job:
+            return 0
+        
+        processed = 0
+        _draining_jobs.add(job_id)
         try:
-            conn = psycopg2.connect(self.db_url)
+            async with self._job_heartbeat(job_id):
+                while True:
+                    claimed_ids = await self._claim_job_items(job_id, settings.ETL_CLAIM_BATCH_SIZE)
+                    if not claimed_ids:
+                        break
+                    
+                    await self._run_claimed_items(job, claimed_ids)
+                    processed += len(claimed_ids)
+        finally:
+            _draining_jobs.discard(job_id)
+        
+        await self._complete_job_if_finished(job_id)
+        
+        if processed:
+            logger.info(f"[ETL JOB] {WORKER_ID} ran {processed} items of job {job_id}")
+        return processed
+    
+    async def find_claimable_job(self) -> Optional[Dict[str, Any]]:
+        """Oldest running job that has items nobody holds a live lease on (jobs drained here are skipped)"""
+        def _query():
+            with self.db_pool.get_cursor() as cur:
+                self._ensure_etl_tables(cur)
+                
+                cur.execute("""
+                    SELECT j.* FROM "ETLJob" j
+                    WHERE j.status = 'PROCESSING'
+                    AND NOT (j."jobId" = ANY(%s))
+                    AND EXISTS (
+                        SELECT 1 FROM "ETLJobItem" item
+                        WHERE item."jobId" = j."jobId"
+                        AND (item.status = 'PENDING'
+                             OR (item.status = 'PROCESSING' AND (item."leaseExpiresAt" IS NULL OR item."leaseExpiresAt" < %s)))
+                    )
+                    ORDER BY j."startedAt"
+                    LIMIT 1
+                """, (list(_draining_jobs), datetime.now()))
+                
+                result = cur.fetchone()
+                return dict(result) if result else None
+        
+        return await self.db_pool.run(_query)
+    
+    async def _run_claimed_items(self, job: Dict[str, Any], indicator_ids: List[int]) -> None:
+        job_id = job['jobId']
+        
+        indicators = await self._get_indicators_by_ids(indicator_ids)
+        handler, series_store, calculation_batch = await self._prepare_batch(job, indicators)
+        
+        await self.job_executor.run(job_id, indicators, self._checkpointed(job_id, handler))
+        
+        if calculation_batch is not None:
+            batch_summary = calculation_batch.summary()
+            logger.info(
+                f"[ETL JOB] Job {job_id}: {batch_summary['calculations']} calculations evaluated "
+                f"in {batch_summary['rounds']} panel rounds"
+            )
+        
+        summary = series_store.summary()
+        logger.info(
+            f"[ETL JOB] Job {job_id}: {summary['upstream_calls_spent']} upstream calls sent, "
+            f"{summary['upstream_calls_saved']} saved by sharing series within the job"
+        )
+        if summary['cache_lookups']:
+            logger.info(
+                f"[ETL JOB] Job {job_id}: upstream cache served {summary['cache_hits']}/{summary['cache_lookups']} "
+                f"series ({JobSeriesStore.cache_hit_rate(summary):.0%})"
+            )
+        await self._record_job_summary(job_id, summary)
+    
+    async def _prepare_batch(self, job: Dict[str, Any], indicators: List[Dict[str, Any]]):
+        """
+        Build the fetch handler, shared series store and calculation batch (category jobs) for one claimed batch
+        
+        Any replica may claim any batch, so everything is derived from the job metadata.
+        """
+        metadata = job.get('metadata') or {}
+        job_type = metadata.get('type')
+        
+        if job_type == 'incremental':
+            days_back = metadata.get('days_back', 30)
+            end_date = date.today()
+            last_successes = {
+                ind_info['id']: datetime.fromisoformat(ind_info['last_success']) if ind_info.get('last_success') else None
+                for ind_info in metadata.get('indicators', [])
+            }
+            fallback_starts = {}
+            
+            for indicator in indicators:
+                if last_successes.get(indicator['id']):
+                    fallback_starts[indicator['id']] = last_successes[indicator['id']].date() + timedelta(days=1)
+                else:
+                    fallback_starts[indicator['id']] = end_date - timedelta(days=days_back)
+            
+            # Every indicator is considered - series watermarks decide what is actually requested
+            plans = await self._plan_incremental_fetches(indicators, fallback_starts, end_date, last_successes)
             
-            with conn.cursor() as cur:
+            series_store = JobSeriesStore(self.upstream_cache)
+            for indicator in indicators:
+                new_series = series_store.require(
+                    get_source_key(indicator.get('source')),
+                    self._split_series_ids(indicator.get('seriesIDs')),
+                    plans[indicator['id']]['start_date'],
+                    end_date
+                )
+                # Upstream revision check + observations request per series this indicator fetches first
+                indicator['requestCost'] = 2 * new_series
+            
+            return (lambda indicator: self._fetch_incremental_indicator(
+                indicator,
+                plan=plans[indicator['id']],
+                end_date=end_date,
+                series_store=series_store
+            )), series_store, None
+        
+        if job_type == 'category_full':
+            start_date = datetime.fromisoformat(metadata['start_date']).date() if metadata.get('start_date') else None
+            end_date = datetime.fromisoformat(metadata['end_date']).date() if metadata.get('end_date') else None
+            series_store = self._plan_series_store(indicators, start_date, end_date)
+            calculation_batch = self._plan_calculation_batch(indicators)
+            
+            async def handler(indicator):
+                try:
+                    return await self.fetch_indicator_data(
+                        indicator_id=indicator['id'],
+                        start_date=start_date,
+                        end_date=end_date,
+                        force_refresh=False,
+                        series_store=series_store,
+                        calculation_batch=calculation_batch
+                    )
+                finally:
+                    if calculation_batch is not None:
+                        calculation_batch.release(indicator['id'])
+            
+            return handler, series_store, calculation_batch
+        
+        force_refresh = metadata.get('force_refresh', False)
+        series_store = self._plan_series_store(indicators)
+        
+        return (lambda indicator: self.fetch_indicator_data(
+            indicator_id=indicator['id'],
+            force_refresh=force_refresh,
+            series_store=series_store
+        )), series_store, None
+    
+    def _plan_calculation_batch(self, indicators: List[Dict[str, Any]]) -> Optional[CalculationBatch]:
+        """
+        A calculation batch for the batch's calculated indicators, when there are enough of them
+        
+        Indicators sharing series get them from the series store at the same moment, so their
+        calculations meet in one round and a series transformed the same way is computed once.
+        """
+        calculated = [indicator for indicator in indicators if indicator.get('calculation')]
+        minimum = settings.ETL_CALCULATION_BATCH_MIN_INDICATORS
+        if minimum <= 0 or len(calculated) < minimum:
+            return None
+        
+        distinct_series = {sid for indicator in calculated for sid in self._split_series_ids(indicator.get('seriesIDs'))}
+        logger.info(
+            f"[ETL JOB] {len(calculated)} calculated indicators on {len(distinct_series)} distinct series "
+            f"are evaluated as one calculation batch"
+        )
+        return CalculationBatch((indicator['id'] for indicator in calculated), settings.ETL_CALCULATION_BATCH_LINGER_SECONDS)
+    
+    async def _claim_job_items(self, job_id: str, limit: int) -> List[int]:
+        """Lease up to `limit` unclaimed (or lease-expired) items of a running job to this process"""
+        now = datetime.now()
+        lease_until = now + timedelta(seconds=settings.ETL_ITEM_LEASE_SECONDS)
+        max_attempts = settings.ETL_ITEM_MAX_ATTEMPTS
+        
+        def _query():
+            with self.db_pool.get_cursor() as cur:
+                # An item whose lease keeps expiring takes its worker down with it - stop retrying
+                cur.execute("""
+                    UPDATE "ETLJobItem"
+                    SET status = 'ERROR', "errorMessage" = %s, "leaseOwner" = NULL, "leaseExpiresAt" = NULL,
+                        "completedAt" = %s, "updatedAt" = %s
+                    WHERE "jobId" = %s AND status = 'PROCESSING'
+                    AND ("leaseExpiresAt" IS NULL OR "leaseExpiresAt" < %s)
+                    AND attempts >= %s
+                """, (f"Worker lease expired {max_attempts} times", now, now, job_id, now, max_attempts))
+                
+                cur.execute("""
+                    UPDATE "ETLJobItem" item
+                    SET status = 'PROCESSING', "leaseOwner" = %s, "leaseExpiresAt" = %s,
+                        attempts = item.attempts + 1, "startedAt" = %s, "updatedAt" = %s
+                    FROM (
+                        SELECT "jobId", "indicatorId" FROM "ETLJobItem"
+                        WHERE "jobId" = %s
+                        AND (status = 'PENDING'
+                             OR (status = 'PROCESSING' AND ("leaseExpiresAt" IS NULL OR "leaseExpiresAt" < %s)))
+                        AND EXISTS (SELECT 1 FROM "ETLJob" WHERE "jobId" = %s AND status = 'PROCESSING')
+                        ORDER BY "indicatorId"
+                        LIMIT %s
+                        FOR UPDATE SKIP LOCKED
+                    ) claimable
+                    WHERE item."jobId" = claimable."jobId" AND item."indicatorId" = claimable."indicatorId"
+                    RETURNING item."indicatorId"
+                """, (WORKER_ID, lease_until, now, now, job_id, now, job_id, limit))
+                
+                return sorted(row['indicatorId'] for row in cur.fetchall())
+        
+        return await self.db_pool.run(_query)
+    
+    async def _complete_job_if_finished(self, job_id: str) -> Optional[Dict[str, int]]:
+        """Mark a running job completed once none of its items are pending or in flight"""
+        def _query():
+            with self.db_pool.get_cursor() as cur:
+                # Row lock so two workers finishing the last items at once complete the job once
+                cur.execute('SELECT status FROM "ETLJob" WHERE "jobId" = %s FOR UPDATE', (job_id,))
+                job = cur.fetchone()
+                if not job or job['status'] != 'PROCESSING':
+                    return None
+                
+                cur.execute("""
+                    SELECT status, COUNT(*) AS count
+                    FROM "ETLJobItem"
+                    WHERE "jobId" = %s
+                    GROUP BY status
+                """, (job_id,))
+                counts = {row['status']: row['count'] for row in cur.fetchall()}
+                
+                if counts.get('PENDING') or counts.get('PROCESSING'):
+                    return None
+                
                 cur.execute("""
                     UPDATE "ETLJob"
-                    SET status = %s,
+                    SET status = 'COMPLETED',
                         successful = %s,
                         failed = %s,
                         blocked = %s,
-                        "completedAt" = %s
+                        "completedAt" = %s,
+                        metadata = COALESCE(metadata, '{}'::jsonb) || %s::jsonb
                     WHERE "jobId" = %s
-                """, (status, successful, failed, blocked, datetime.now(), job_id))
+                """, (
+                    counts.get('OK', 0),
+                    counts.get('ERROR', 0),
+                    counts.get('BLOCKED', 0),
+                    datetime.now(),
+                    psycopg2.extras.Json({'items': counts}),
+                    job_id
+                ))
+                return counts
+        
+        counts = await self.db_pool.run(_query)
+        
+        if counts is not None:
+            logger.info(f"[ETL JOB] Job {job_id} completed: {counts}")
+        return counts
+    
+    async def _record_job_summary(self, job_id: str, series_summary: Dict[str, int]) -> None:
+        """Add one batch's series store counters to the job's running totals"""
+        def _query():
+            with self.db_pool.get_cursor() as cur:
+                cur.execute('SELECT metadata FROM "ETLJob" WHERE "jobId" = %s FOR UPDATE', (job_id,))
+                row = cur.fetchone()
+                if not row:
+                    return
+                
+                totals = dict((row['metadata'] or {}).get('series_store') or {})
+                for key, value in series_summary.items():
+                    totals[key] = totals.get(key, 0) + value
+                totals['cache_hit_rate'] = JobSeriesStore.cache_hit_rate(totals)
                 
-                conn.commit()
+                cur.execute("""
+                    UPDATE "ETLJob"
+                    SET metadata = COALESCE(metadata, '{}'::jsonb) || %s::jsonb
+                    WHERE "jobId" = %s
+                """, (psycopg2.extras.Json({'series_store': totals}), job_id))
+        
+        await self.db_pool.run(_query)
+    
+    async def _get_job_item_ids(self, job_id: str) -> List[int]:
+        """Indicator IDs checkpointed for a job, empty if the job has not been planned yet"""
+        def _query():
+            with self.db_pool.get_cursor() as cur:
+                self._ensure_etl_tables(cur)
+                
+                cur.execute("""
+                    SELECT "indicatorId" FROM "ETLJobItem"
+                    WHERE "jobId" = %s
+                    ORDER BY "indicatorId"
+                """, (job_id,))
                 
+                return [row['indicatorId'] for row in cur.fetchall()]
+        
+        return await self.db_pool.run(_query)
+    
+    async def _checkpoint_job_items(self, job_id: str, indicator_ids: List[int]) -> int:
+        """
+        Record one ETLJobItem per indicator (idempotent)
+        
+        Returns:
+            Number of items not finished yet; on a resumed job, finished items are kept as they are
+        """
+        if not indicator_ids:
+            return 0
+        
+        def _query():
+            with self.db_pool.get_cursor() as cur:
+                self._ensure_etl_tables(cur)
+                
+                execute_values(cur, """
+                    INSERT INTO "ETLJobItem" ("jobId", "indicatorId", status)
+                    VALUES %s
+                    ON CONFLICT ("jobId", "indicatorId") DO NOTHING
+                """, [(job_id, indicator_id, 'PENDING') for indicator_id in dict.fromkeys(indicator_ids)], page_size=1000)
+                
+                cur.execute("""
+                    SELECT COUNT(*) AS unfinished FROM "ETLJobItem"
+                    WHERE "jobId" = %s AND NOT (status = ANY(%s))
+                """, (job_id, list(FINISHED_ITEM_STATUSES)))
+                
+                return cur.fetchone()['unfinished']
+        
+        unfinished = await self.db_pool.run(_query)
+        
+        logger.info(f"[ETL JOB] Job {job_id}: {unfinished} of {len(set(indicator_ids))} indicators to run")
+        return unfinished
+    
+    def _checkpointed(self, job_id: str, handler):
+        """Wrap an executor handler so every claimed item's outcome is persisted as it finishes"""
+        async def run_item(indicator: Dict[str, Any]) -> Dict[str, Any]:
+            try:
+                result = await handler(indicator)
+            except Exception as e:
+                await self._finish_job_item(job_id, indicator['id'], 'ERROR', error_message=str(e))
+                raise
+            
+            status = (result or {}).get('status') or 'ERROR'
+            await self._finish_job_item(
+                job_id,
+                indicator['id'],
+                status if status in FINISHED_ITEM_STATUSES else 'ERROR',
+                error_message=(result or {}).get('error_message')
+            )
+            return result
+        
+        return run_item
+    
+    async def _finish_job_item(
+        self,
+        job_id: str,
+        indicator_id: int,
+        status: str,
+        error_message: Optional[str] = None
+    ) -> None:
+        def _query():
+            with self.db_pool.get_cursor() as cur:
+                cur.execute("""
+                    UPDATE "ETLJobItem"
+                    SET status = %s, "errorMessage" = %s, "completedAt" = %s, "updatedAt" = %s,
+                        "leaseOwner" = NULL, "leaseExpiresAt" = NULL
+                    WHERE "jobId" = %s AND "indicatorId" = %s AND "leaseOwner" = %s
+                """, (status, error_message, datetime.now(), datetime.now(), job_id, indicator_id, WORKER_ID))
+                return cur.rowcount
+        
+        if not await self.db_pool.run(_query):
+            # Lease expired and another worker took the item over; its result wins
+            logger.warning(f"[ETL JOB] Lost lease on item {indicator_id} of job {job_id}; result {status} not recorded")
+    
+    @asynccontextmanager
+    async def _job_heartbeat(self, job_id: str):
+        """
+        Keep ETLJob.heartbeatAt fresh and renew this process's item leases while it works on a job
+        
+        ETL_ITEM_LEASE_SECONDS must stay well above ETL_JOB_HEARTBEAT_SECONDS.
+        """
+        async def beat():
+            while True:
+                await asyncio.sleep(settings.ETL_JOB_HEARTBEAT_SECONDS)
+                try:
+                    await self._touch_job(job_id)
+                except Exception as e:
+                    logger.warning(f"[ETL JOB] Heartbeat failed for job {job_id}: {e}")
+        
+        await self._touch_job(job_id)
+        task = asyncio.create_task(beat())
+        try:
+            yield
         finally:
-            if 'conn' in locals():
-                conn.close()
+            task.cancel()
+    
+    async def _touch_job(self, job_id: str) -> None:
+        now = datetime.now()
+        
+        def _query():
+            with self.db_pool.get_cursor() as cur:
+                cur.execute("""
+                    UPDATE "ETLJob" SET "heartbeatAt" = %s, "ownerId" = %s
+                    WHERE "jobId" = %s
+                """, (now, WORKER_ID, job_id))
+                
+                cur.execute("""
+                    UPDATE "ETLJobItem" SET "leaseExpiresAt" = %s
+                    WHERE "jobId" = %s AND "leaseOwner" = %s AND status = 'PROCESSING'
+                """, (now + timedelta(seconds=settings.ETL_ITEM_LEASE_SECONDS), job_id, WORKER_ID))
+        
+        await self.db_pool.run(_query)
+    
+    async def release_worker_leases(self) -> int:
+        """Hand the items this process holds back to the queue (graceful shutdown)"""
+        def _query():
+            with self.db_pool.get_cursor() as cur:
+                cur.execute("""
+                    UPDATE "ETLJobItem"
+                    SET status = 'PENDING', "leaseOwner" = NULL, "leaseExpiresAt" = NULL,
+                        attempts = GREATEST(attempts - 1, 0), "updatedAt" = %s
+                    WHERE "leaseOwner" = %s AND status = 'PROCESSING'
+                    RETURNING "indicatorId"
+                """, (datetime.now(), WORKER_ID))
+                indicator_ids = [row['indicatorId'] for row in cur.fetchall()]
+                
+                self._reset_indicator_status(cur, indicator_ids)
+                return len(indicator_ids)
+        
+        released = await self.db_pool.run(_query)
+        
+        if released:
+            logger.info(f"[ETL JOB] Released {released} leased items on shutdown")
+        return released
+    
+    async def run_job(self, job_id: str) -> None:
+        """Run (or continue) a job with the processor matching its type"""
+        job = await self._get_job(job_id)
+        if not job:
+            logger.error(f"Job {job_id} not found")
+            return
+        
+        job_type = (job.get('metadata') or {}).get('type')
+        
+        if job_type == 'category_full':
+            await self.process_category_job(job_id)
+        elif job_type == 'incremental':
+            await self.process_incremental_job(job_id)
+        else:
+            await self.process_job(job_id)
+    
+    async def prepare_resume(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Claim a job for resuming; only its unfinished indicators will run
+        
+        Returns:
+            None if the job does not exist
+        
+        Raises:
+            ValueError: The job is still running elsewhere or has nothing left to do
+        """
+        job = await self._get_job(job_id)
+        if not job:
+            return None
+        
+        stale_before = datetime.now() - timedelta(seconds=settings.ETL_JOB_STALE_AFTER_SECONDS)
+        
+        def _query():
+            with self.db_pool.get_cursor() as cur:
+                self._ensure_etl_tables(cur)
+                
+                cur.execute("""
+                    SELECT COUNT(*) AS unfinished FROM "ETLJobItem"
+                    WHERE "jobId" = %s AND NOT (status = ANY(%s))
+                """, (job_id, list(FINISHED_ITEM_STATUSES)))
+                unfinished = cur.fetchone()['unfinished']
+                
+                if job['status'] == 'COMPLETED' and not unfinished:
+                    raise ValueError(f"Job {job_id} is already completed")
+                
+                cur.execute("""
+                    UPDATE "ETLJob"
+                    SET status = 'PROCESSING', "heartbeatAt" = %s, "ownerId" = %s, "completedAt" = NULL
+                    WHERE "jobId" = %s
+                    AND (status <> 'PROCESSING' OR COALESCE("heartbeatAt", "startedAt") < %s)
+                    RETURNING "jobId"
+                """, (datetime.now(), WORKER_ID, job_id, stale_before))
+                
+                if not cur.fetchone():
+                    raise ValueError(f"Job {job_id} is still running")
+                
+                self._release_job_items(cur, [job_id])
+                return unfinished
+        
+        unfinished = await self.db_pool.run(_query)
+        
+        return {
+            "job_id": job_id,
+            "status": "PROCESSING",
+            "unfinished_indicators": unfinished,
+            "message": f"Job {job_id} resumed"
+        }
+    
+    async def reclaim_orphaned_jobs(self) -> List[str]:
+        """
+        Take over PROCESSING jobs whose owner stopped sending heartbeats
+        
+        Recent orphans are claimed by this process and returned for resuming; orphans older than
+        ETL_JOB_RECLAIM_MAX_AGE_HOURS are marked FAILED instead of being restarted.
+        """
+        now = datetime.now()
+        stale_before = now - timedelta(seconds=settings.ETL_JOB_STALE_AFTER_SECONDS)
+        oldest_start = now - timedelta(hours=settings.ETL_JOB_RECLAIM_MAX_AGE_HOURS)
+        
+        def _query():
+            with self.db_pool.get_cursor() as cur:
+                self._ensure_etl_tables(cur)
+                
+                cur.execute("""
+                    UPDATE "ETLJob"
+                    SET status = 'FAILED', "completedAt" = %s
+                    WHERE status = 'PROCESSING'
+                    AND COALESCE("heartbeatAt", "startedAt") < %s
+                    AND "startedAt" < %s
+                    RETURNING "jobId"
+                """, (now, stale_before, oldest_start))
+                expired = [row['jobId'] for row in cur.fetchall()]
+                
+                cur.execute("""
+                    UPDATE "ETLJob"
+                    SET "heartbeatAt" = %s, "ownerId" = %s
+                    WHERE status = 'PROCESSING'
+                    AND COALESCE("heartbeatAt", "startedAt") < %s
+                    RETURNING "jobId"
+                """, (now, WORKER_ID, stale_before))
+                claimed = [row['jobId'] for row in cur.fetchall()]
+                
+                self._release_job_items(cur, expired + claimed)
+                return expired, claimed
+        
+        expired, claimed = await self.db_pool.run(_query)
+        
+        if expired:
+            logger.warning(f"[ETL JOB] Marked {len(expired)} abandoned jobs as FAILED: {expired}")
+        if claimed:
+            logger.warning(f"[ETL JOB] Reclaimed {len(claimed)} orphaned jobs: {claimed}")
+        
+        return claimed
+    
+    def _release_job_items(self, cur, job_ids: List[str]) -> None:
+        """Put lease-expired items of dead runs back to PENDING and un-stick their indicators"""
+        if not job_ids:
+            return
+        
+        now = datetime.now()
+        cur.execute("""
+            UPDATE "ETLJobItem"
+            SET status = 'PENDING', "leaseOwner" = NULL, "leaseExpiresAt" = NULL, "updatedAt" = %s
+            WHERE "jobId" = ANY(%s) AND status = 'PROCESSING'
+            AND ("leaseExpiresAt" IS NULL OR "leaseExpiresAt" < %s)
+            RETURNING "indicatorId"
+        """, (now, job_ids, now))
+        
+        self._reset_indicator_status(cur, [row['indicatorId'] for row in cur.fetchall()])
+    
+    def _reset_indicator_status(self, cur, indicator_ids: List[int]) -> None:
+        if indicator_ids:
+            cur.execute("""
+                UPDATE "IndicatorMetadata"
+                SET "etlStatus" = 'UNKNOWN', "etlNotes" = 'Reset from PROCESSING after interrupted ETL job'
+                WHERE id = ANY(%s) AND "etlStatus" = 'PROCESSING'
+            """, (indicator_ids,))
     
     async def get_job_result(self, job_id: str) -> Optional[Dict[str, Any]]:
         """Get job result"""
@@ -1121,6 +2316,9 @@ class ETLService:
             "successful": job.get('successful', 0),
             "failed": job.get('failed', 0),
             "blocked": job.get('blocked', 0),
+            "series_store": (job.get('metadata') or {}).get('series_store'),
+            "items": (job.get('metadata') or {}).get('items'),
+            "plan": (job.get('metadata') or {}).get('plan'),
             "details": [],
             "started_at": job['startedAt'].isoformat(),
             "completed_at": job['completedAt'].isoformat() if job.get('completedAt') else None,
@@ -1133,10 +2331,8 @@ class ETLService:
         limit: int = 50
     ) -> List[Dict[str, Any]]:
         """List recent jobs"""
-        try:
-            conn = psycopg2.connect(self.db_url)
-            
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        def _query():
+            with self.db_pool.get_cursor() as cur:
                 query = 'SELECT * FROM "ETLJob"'
                 params = []
                 
@@ -1161,7 +2357,5 @@ class ETLService:
                     jobs.append(job)
                 
                 return jobs
-                
-        finally:
-            if 'conn' in locals():
-                conn.close()
+        
+        return await self.db_pool.run(_query)
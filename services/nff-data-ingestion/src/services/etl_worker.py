@@ -0,0 +1,54 @@
+"""
+ETL Worker
+Background loop that claims work items of running ETL jobs, so every replica shares job load
+"""
+
+from typing import Optional
+import asyncio
+import logging
+from config import settings
+from services.etl_service import ETLService
+
+logger = logging.getLogger(__name__)
+
+class ETLWorker:
+    """Polls for running jobs with unclaimed (or lease-expired) items and drains them"""
+    
+    def __init__(self, service: Optional[ETLService] = None):
+        self.service = service or ETLService()
+        self._task: Optional[asyncio.Task] = None
+    
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            logger.info("[ETL WORKER] Started")
+    
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        
+        try:
+            await self.service.release_worker_leases()
+        except Exception as e:
+            logger.warning(f"[ETL WORKER] Could not release leases on shutdown: {e}")
+    
+    async def _run(self) -> None:
+        while True:
+            try:
+                job = await self.service.find_claimable_job()
+                if job:
+                    await self.service.drain_job(job['jobId'], job)
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"[ETL WORKER] Error while draining jobs: {e}")
+            
+            await asyncio.sleep(settings.ETL_WORKER_POLL_SECONDS)
+
+etl_worker = ETLWorker()
@@ -10,11 +10,12 @@ from services.excel_config_service import ExcelConfigService
 from core.default_selection import DefaultSelectionProcessor
 from utils.logger import get_logger
 from core.monitoring import monitor, ErrorCategory
+from core.formula import validate_formula
 
 logger = get_logger(__name__)
 
 class ExcelImportService:
-    SUPPORTED_SOURCES = ['FRED', 'Polygon', 'Shiller', 'Polygon (ETF proxy)', 'Polygon (Forex)', 'Polygon (Completed)', 'TradingEconomics']
+    SUPPORTED_SOURCES = ['FRED', 'Polygon', 'Shiller', 'Polygon (ETF proxy)', 'Polygon (Forex)', 'Polygon (Completed)', 'TradingEconomics', 'CFTC']
     
     def __init__(self):
         self.indicator_metadata_service = IndicatorMetadataService()
@@ -130,6 +131,24 @@ class ExcelImportService:
                         etl_status = 'BLOCKED'
                         etl_notes = f"No series ID configured for {source} source"
                     
+                    # Formulas are compiled now so a broken one is reported here rather than on every fetch
+                    calculation = str(row.get('calculation', None)).strip() if pd.notna(row.get('calculation')) else None
+                    if etl_status != 'BLOCKED' and calculation:
+                        formula_error = validate_formula(
+                            calculation,
+                            tuple(s.strip() for s in (series_ids or '').split('|') if s.strip())
+                        )
+                        if formula_error:
+                            logger.warning(f"[BLOCKED] Row {row_num} - Indicator '{indicator_en}': Invalid calculation formula '{calculation}': {formula_error}")
+                            etl_status = 'BLOCKED'
+                            etl_notes = f"INVALID_FORMULA: {formula_error}"
+                            error_details.append({
+                                "row": row_num,
+                                "status": "BLOCKED",
+                                "reason": f"Invalid calculation formula '{calculation}': {formula_error}",
+                                "indicator": indicator_en
+                            })
+                    
                     # Count by final status
                     if etl_status == 'BLOCKED':
                         blocked_count += 1
@@ -145,7 +164,7 @@ class ExcelImportService:
                         'source': source,
                         'seriesIDs': series_ids,
                         'apiExample': str(row.get('API_Example', None)).strip() if pd.notna(row.get('API_Example')) else None,
-                        'calculation': str(row.get('calculation', None)).strip() if pd.notna(row.get('calculation')) else None,
+                        'calculation': calculation,
                         'notes': str(row.get('Notes', None)).strip() if pd.notna(row.get('Notes')) else None,
                         'importance': int(row.get('importance', 3)) if pd.notna(row.get('importance')) else 3,
                         'relevantReports': relevantReports,
@@ -0,0 +1,159 @@
+"""
+Series Watermark Service
+Tracks, per upstream series, the last stored observation date, the upstream last_updated stamp and when either last changed
+"""
+
+from typing import List, Optional, Dict, Any
+from datetime import datetime, date, timedelta
+import logging
+from core.db_pool import db_pool
+
+logger = logging.getLogger(__name__)
+
+class SeriesWatermarkService:
+    """Persisted (source, seriesId) watermarks used to plan incremental fetches"""
+    
+    _table_ready = False
+    
+    def __init__(self):
+        self.db_pool = db_pool
+    
+    @classmethod
+    def _ensure_table(cls, cur) -> None:
+        if cls._table_ready:
+            return
+        
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS "SeriesWatermark" (
+                source VARCHAR(50) NOT NULL,
+                "seriesId" VARCHAR(100) NOT NULL,
+                "lastObservationDate" DATE,
+                "upstreamLastUpdated" VARCHAR(50),
+                "updatedAt" TIMESTAMP NOT NULL DEFAULT NOW(),
+                PRIMARY KEY (source, "seriesId")
+            )
+        """)
+        
+        cur.execute("""
+            ALTER TABLE "SeriesWatermark" ADD COLUMN IF NOT EXISTS frequency VARCHAR(10)
+        """)
+        
+        cur.execute("""
+            ALTER TABLE "SeriesWatermark" ADD COLUMN IF NOT EXISTS "changedAt" TIMESTAMP
+        """)
+        
+        cls._table_ready = True
+    
+    async def get_watermarks(self, source: str, series_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Watermarks for the given series of one source, keyed by series id (missing series are absent)"""
+        if not series_ids:
+            return {}
+        
+        def _query():
+            with self.db_pool.get_cursor() as cur:
+                self._ensure_table(cur)
+                
+                cur.execute("""
+                    SELECT "seriesId", "lastObservationDate", "upstreamLastUpdated", frequency, "changedAt"
+                    FROM "SeriesWatermark"
+                    WHERE source = %s AND "seriesId" = ANY(%s)
+                """, (source, list(series_ids)))
+                
+                return {row['seriesId']: dict(row) for row in cur.fetchall()}
+        
+        return await self.db_pool.run(_query)
+    
+    async def advance(
+        self,
+        source: str,
+        last_observation_dates: Dict[str, date],
+        upstream_last_updated: Optional[Dict[str, Optional[str]]] = None,
+        frequencies: Optional[Dict[str, Optional[str]]] = None,
+        saved_at: Optional[datetime] = None
+    ) -> None:
+        """
+        Move watermarks forward after a successful save
+        
+        The observation date never moves backwards; upstream_last_updated and frequency
+        are only replaced when a new value is given. changedAt becomes saved_at when the
+        save stored a newer observation or a different upstream_last_updated.
+        """
+        upstream_last_updated = upstream_last_updated or {}
+        frequencies = frequencies or {}
+        series_ids = set(last_observation_dates) | {sid for sid, value in upstream_last_updated.items() if value}
+        if not series_ids:
+            return
+        
+        saved_at = saved_at or datetime.now()
+        rows = [
+            (source, sid, last_observation_dates.get(sid), upstream_last_updated.get(sid), frequencies.get(sid), saved_at, saved_at)
+            for sid in series_ids
+        ]
+        
+        def _query():
+            with self.db_pool.get_cursor() as cur:
+                self._ensure_table(cur)
+                
+                for row in rows:
+                    cur.execute("""
+                        INSERT INTO "SeriesWatermark" (source, "seriesId", "lastObservationDate", "upstreamLastUpdated", frequency, "changedAt", "updatedAt")
+                        VALUES (%s, %s, %s, %s, %s, %s, %s)
+                        ON CONFLICT (source, "seriesId")
+                        DO UPDATE SET
+                            "changedAt" = CASE
+                                WHEN GREATEST("SeriesWatermark"."lastObservationDate", EXCLUDED."lastObservationDate")
+                                        IS DISTINCT FROM "SeriesWatermark"."lastObservationDate"
+                                    OR EXCLUDED."upstreamLastUpdated" IS DISTINCT FROM "SeriesWatermark"."upstreamLastUpdated"
+                                        AND EXCLUDED."upstreamLastUpdated" IS NOT NULL
+                                THEN EXCLUDED."changedAt"
+                                -- Rows from before changedAt existed: changed no later than this save
+                                ELSE COALESCE("SeriesWatermark"."changedAt", EXCLUDED."changedAt")
+                            END,
+                            "lastObservationDate" = GREATEST("SeriesWatermark"."lastObservationDate", EXCLUDED."lastObservationDate"),
+                            "upstreamLastUpdated" = COALESCE(EXCLUDED."upstreamLastUpdated", "SeriesWatermark"."upstreamLastUpdated"),
+                            frequency = COALESCE(EXCLUDED.frequency, "SeriesWatermark".frequency),
+                            "updatedAt" = EXCLUDED."updatedAt"
+                    """, row)
+        
+        await self.db_pool.run(_query)
+    
+    @staticmethod
+    def plan_start_date(
+        watermarks: Dict[str, Dict[str, Any]],
+        series_ids: List[str],
+        lookback_days: int
+    ) -> Optional[date]:
+        """
+        First date to request for an indicator: the oldest series watermark minus the
+        revision lookback. None when any series has no watermark yet.
+        """
+        last_dates = [watermarks.get(sid, {}).get('lastObservationDate') for sid in series_ids]
+        if not last_dates or any(last is None for last in last_dates):
+            return None
+        
+        return min(last_dates) - timedelta(days=max(lookback_days, 0))
+    
+    @staticmethod
+    def upstream_unchanged(
+        watermarks: Dict[str, Dict[str, Any]],
+        series_ids: List[str],
+        upstream_last_updated: Dict[str, Optional[str]],
+        last_success: Optional[datetime]
+    ) -> bool:
+        """
+        True when every series reports the same upstream last_updated as at its last save and
+        the indicator itself saved (last_success) no earlier than that series last changed -
+        watermarks are shared, so another indicator's save says nothing about this one's data
+        """
+        if not series_ids or last_success is None:
+            return False
+        
+        for sid in series_ids:
+            current = upstream_last_updated.get(sid)
+            stored = watermarks.get(sid, {})
+            if not current or stored.get('lastObservationDate') is None or stored.get('upstreamLastUpdated') != current:
+                return False
+            if stored.get('changedAt') is None or last_success < stored['changedAt']:
+                return False
+        
+        return True
@@ -0,0 +1,167 @@
+"""
+Upstream Series Cache Service
+Persists fetched upstream observations with the series' last_updated stamp so unchanged series are not downloaded again
+"""
+
+from typing import Optional
+from datetime import datetime, date
+import hashlib
+import logging
+import zlib
+import numpy as np
+import psycopg2
+from core.columnar import ColumnarSeries
+from core.db_pool import db_pool
+
+logger = logging.getLogger(__name__)
+
+# End of a range that was requested up to "today" - valid until upstream publishes a new revision
+OPEN_RANGE_END = date.max
+
+# Leads every payload so the array layout can change without misreading old entries
+PAYLOAD_FORMAT = b'COLS1'
+
+class UpstreamCacheService:
+    """
+    (source, seriesId, startDate, endDate) -> series arrays, upstream last_updated and content hash
+
+    An entry serves any request inside its range as long as upstream still reports the
+    same last_updated. Ranges that reached the fetch date are stored open-ended: a series
+    cannot gain observations without its last_updated moving.
+    """
+
+    _table_ready = False
+
+    def __init__(self):
+        self.db_pool = db_pool
+
+    @classmethod
+    def _ensure_table(cls, cur) -> None:
+        if cls._table_ready:
+            return
+
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS "UpstreamSeriesCache" (
+                source VARCHAR(50) NOT NULL,
+                "seriesId" VARCHAR(100) NOT NULL,
+                "startDate" DATE NOT NULL,
+                "endDate" DATE NOT NULL,
+                "upstreamLastUpdated" VARCHAR(50) NOT NULL,
+                "contentHash" VARCHAR(64) NOT NULL,
+                "recordCount" INTEGER NOT NULL,
+                payload BYTEA NOT NULL,
+                "fetchedAt" TIMESTAMP NOT NULL DEFAULT NOW(),
+                PRIMARY KEY (source, "seriesId", "startDate", "endDate")
+            )
+        """)
+
+        cls._table_ready = True
+
+    async def get(
+        self,
+        source: str,
+        series_id: str,
+        start_date: date,
+        end_date: date,
+        upstream_last_updated: str
+    ) -> Optional[ColumnarSeries]:
+        """Cached series covering [start_date, end_date] at this upstream revision, or None on a miss"""
+        range_end = self._range_end(end_date)
+
+        def _query():
+            with self.db_pool.get_cursor() as cur:
+                self._ensure_table(cur)
+
+                cur.execute("""
+                    SELECT payload, "recordCount" FROM "UpstreamSeriesCache"
+                    WHERE source = %s AND "seriesId" = %s
+                      AND "startDate" <= %s AND "endDate" >= %s
+                      AND "upstreamLastUpdated" = %s
+                    ORDER BY "endDate" - "startDate"
+                    LIMIT 1
+                """, (source, series_id, start_date, range_end, upstream_last_updated))
+
+                row = cur.fetchone()
+                return self._decode(series_id, bytes(row['payload']), row['recordCount']) if row else None
+
+        series = await self.db_pool.run(_query)
+        if series is None:
+            return None
+
+        return series.slice(start_date, end_date)
+
+    async def put(
+        self,
+        source: str,
+        series_id: str,
+        start_date: date,
+        end_date: date,
+        upstream_last_updated: str,
+        series: ColumnarSeries
+    ) -> bool:
+        """
+        Store a freshly fetched series for a range, replacing the entries it covers
+
+        Returns:
+            True when the content differs from what was cached for this range before
+        """
+        range_end = self._range_end(end_date)
+
+        def _query():
+            content = self._serialize(series)
+            content_hash = hashlib.sha256(content).hexdigest()
+            payload = zlib.compress(content)
+
+            with self.db_pool.get_cursor() as cur:
+                self._ensure_table(cur)
+
+                cur.execute("""
+                    SELECT "contentHash" FROM "UpstreamSeriesCache"
+                    WHERE source = %s AND "seriesId" = %s AND "startDate" = %s AND "endDate" = %s
+                """, (source, series_id, start_date, range_end))
+                previous = cur.fetchone()
+
+                # Narrower entries are superseded by this one
+                cur.execute("""
+                    DELETE FROM "UpstreamSeriesCache"
+                    WHERE source = %s AND "seriesId" = %s
+                      AND "startDate" >= %s AND "endDate" <= %s
+                """, (source, series_id, start_date, range_end))
+
+                cur.execute("""
+                    INSERT INTO "UpstreamSeriesCache"
+                        (source, "seriesId", "startDate", "endDate", "upstreamLastUpdated", "contentHash", "recordCount", payload, "fetchedAt")
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                """, (
+                    source, series_id, start_date, range_end, upstream_last_updated,
+                    content_hash, len(series), psycopg2.Binary(payload), datetime.now()
+                ))
+
+                return previous is None or previous['contentHash'] != content_hash
+
+        return await self.db_pool.run(_query)
+
+    @staticmethod
+    def _range_end(end_date: date) -> date:
+        return OPEN_RANGE_END if end_date >= date.today() else end_date
+
+    @staticmethod
+    def _serialize(series: ColumnarSeries) -> bytes:
+        """Format tag, then int64 days since epoch and float64 values, both little-endian"""
+        return (
+            PAYLOAD_FORMAT
+            + series.dates.astype('<i8').tobytes()
+            + series.values.astype('<f8').tobytes()
+        )
+
+    @staticmethod
+    def _decode(series_id: str, payload: bytes, record_count: int) -> Optional[ColumnarSeries]:
+        content = zlib.decompress(payload)
+        if not content.startswith(PAYLOAD_FORMAT):
+            # Entry written in an older format - treat as a miss, the next fetch replaces it
+            return None
+
+        offset = len(PAYLOAD_FORMAT)
+        dates = np.frombuffer(content, dtype='<i8', count=record_count, offset=offset)
+        values = np.frombuffer(content, dtype='<f8', count=record_count, offset=offset + 8 * record_count)
+        return ColumnarSeries(series_id, dates.astype('datetime64[D]'), values.astype(np.float64))
@@ -0,0 +1,23 @@
+import importlib
+import os
+import sys
+
+import pytest
+
+# The service runs from src/ (python src/main.py), so its packages are imported top-level
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def import_service(module: str):
+    """
+    Import a services.* module. They open the shared database pool on import, so tests
+    using them are skipped when DATABASE_URL does not reach a database.
+    """
+    import psycopg2
+
+    try:
+        return importlib.import_module(module)
+    except psycopg2.OperationalError as e:
+        pytest.skip(f"{module} needs a database at DATABASE_URL: {str(e).strip().splitlines()[0]}")
@@ -0,0 +1,56 @@
+"""CalculationBatch: indicators submitting together are evaluated in one round"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from core.calculation_batch import CalculationBatch
+from core.columnar import ColumnarSeries
+
+
+def series(series_id: str) -> ColumnarSeries:
+    dates = np.datetime64('2026-01-01') + np.arange(3)
+    return ColumnarSeries(series_id, dates, np.arange(3, dtype=np.float64))
+
+
+async def submit(batch: CalculationBatch, indicator_ids):
+    return await asyncio.gather(*(
+        batch.calculate(indicator_id, {'S': series('S')}, 'level', 'S') for indicator_id in indicator_ids
+    ), return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_waiting_indicators_share_one_round(monkeypatch):
+    rounds = []
+
+    async def run(requests):
+        rounds.append(len(requests))
+        return [series(result_id) for _, _, result_id in requests]
+
+    monkeypatch.setattr(CalculationBatch, '_run', staticmethod(run))
+    batch = CalculationBatch([1, 2, 3], linger_seconds=60)
+
+    results = await submit(batch, [1, 2, 3])
+
+    assert rounds == [3]
+    assert all(isinstance(result, ColumnarSeries) for result in results)
+    assert batch.summary() == {'calculations': 3, 'rounds': 1}
+
+
+@pytest.mark.asyncio
+async def test_failed_round_raises_a_separate_exception_per_indicator(monkeypatch):
+    failure = MemoryError('panel too large')
+
+    async def run(requests):
+        raise failure
+
+    monkeypatch.setattr(CalculationBatch, '_run', staticmethod(run))
+    batch = CalculationBatch([1, 2, 3], linger_seconds=60)
+
+    errors = await submit(batch, [1, 2, 3])
+
+    assert len({id(error) for error in errors}) == 3
+    for error in errors:
+        assert isinstance(error, RuntimeError) and error.__cause__ is failure
+        assert 'panel too large' in str(error)
@@ -0,0 +1,104 @@
+"""CFTC Commitments-of-Traders parsing and fetching against local deacot fixtures"""
+
+import os
+import zipfile
+from datetime import date
+
+import numpy as np
+import pytest
+
+from config import settings
+from core.data_fetcher import CFTCDataFetcher, parse_cftc_series_id, parse_cot_report
+
+from .conftest import FIXTURES_DIR
+
+CFTC_FIXTURES = os.path.join(FIXTURES_DIR, 'cftc')
+
+
+def fixture_path(year: int) -> str:
+    return os.path.join(CFTC_FIXTURES, f'deacot{year}.csv')
+
+
+def zip_fixture(directory, year: int) -> str:
+    """The fixture packed the way CFTC publishes it: one CSV member in a zip"""
+    path = os.path.join(directory, f'deacot{year}.zip')
+    with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.write(fixture_path(year), arcname='annual.txt')
+    return path
+
+
+class TestParseCftcSeriesId:
+    def test_bare_code_is_speculators_net_position(self):
+        assert parse_cftc_series_id('13874a') == ('13874A', 'noncommercial_net')
+
+    def test_code_and_field(self):
+        assert parse_cftc_series_id(' 088691 : Commercial_Long ') == ('088691', 'commercial_long')
+
+    def test_unknown_field(self):
+        with pytest.raises(ValueError, match='Unknown CFTC field'):
+            parse_cftc_series_id('13874A:dealer_long')
+
+    @pytest.mark.parametrize('series_id', ['', ':open_interest', '13874-A'])
+    def test_invalid_code(self, series_id):
+        with pytest.raises(ValueError, match='Invalid CFTC contract market code'):
+            parse_cftc_series_id(series_id)
+
+
+class TestParseCotReport:
+    def test_pivots_contracts_and_fields(self):
+        report = parse_cot_report(fixture_path(2024))
+
+        assert report.dates.tolist() == [date(2024, 1, 2), date(2024, 1, 9), date(2024, 1, 16)]
+        # Codes keep their leading zeros
+        assert report.columns['088691:open_interest'].tolist() == [500037, 501037, 502037]
+        assert report.columns['13874A:noncommercial_long'].tolist() == [440007, 440307, 440607]
+
+    def test_derives_net_positions(self):
+        report = parse_cot_report(fixture_path(2024))
+
+        np.testing.assert_array_equal(
+            report.columns['13874A:noncommercial_net'],
+            report.columns['13874A:noncommercial_long'] - report.columns['13874A:noncommercial_short']
+        )
+
+    def test_zip_matches_csv_in_small_chunks(self, tmp_path):
+        expected = parse_cot_report(fixture_path(2024))
+        report = parse_cot_report(zip_fixture(str(tmp_path), 2024), chunk_size=2)
+
+        np.testing.assert_array_equal(report.dates, expected.dates)
+        assert report.columns.keys() == expected.columns.keys()
+        for column, values in expected.columns.items():
+            np.testing.assert_array_equal(report.columns[column], values)
+
+    def test_keeps_only_position_columns(self):
+        report = parse_cot_report(fixture_path(2024))
+
+        assert not any('Total Reportable' in column or 'Market' in column for column in report.columns)
+
+
+class TestCFTCDataFetcher:
+    @pytest.fixture
+    def fetcher(self, tmp_path, monkeypatch):
+        for year in (2023, 2024):
+            zip_fixture(str(tmp_path), year)
+        monkeypatch.setattr(settings, 'CFTC_DATA_URL', os.path.join(str(tmp_path), 'deacot{year}.zip'))
+        return CFTCDataFetcher()
+
+    @pytest.mark.asyncio
+    async def test_combines_yearly_reports(self, fetcher):
+        series_data = await fetcher.fetch_columns(
+            '13874A|088691:open_interest', date(2023, 12, 20), date(2024, 1, 10)
+        )
+
+        assert set(series_data) == {'13874A', '088691:open_interest'}
+        assert series_data['088691:open_interest'].date_list() == [
+            date(2023, 12, 26), date(2024, 1, 2), date(2024, 1, 9)
+        ]
+        assert series_data['088691:open_interest'].values.tolist() == [501000, 500037, 501037]
+        assert series_data['13874A'].values.tolist() == [440300 - 366783, 440007 - 366672, 440307 - 366789]
+
+    @pytest.mark.asyncio
+    async def test_unknown_contract_is_left_out(self, fetcher):
+        series_data = await fetcher.fetch_columns('999999', date(2024, 1, 1), date(2024, 1, 31))
+
+        assert series_data == {}
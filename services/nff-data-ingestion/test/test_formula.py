@@ -0,0 +1,173 @@
+"""Formula compilation, evaluation and validation"""
+
+import traceback
+
+import numpy as np
+import pytest
+
+from core.columnar import ColumnarSeries
+from core.formula import FormulaError, compile_formula, validate_formula
+from core.rolling_state import Lookback
+
+
+def business_daily(start: str, count: int, values=None) -> np.ndarray:
+    return np.busday_offset(np.datetime64(start, 'D'), np.arange(count), roll='forward')
+
+
+def monthly(start: str, count: int) -> np.ndarray:
+    return (np.datetime64(start, 'M') + np.arange(count)).astype('datetime64[D]')
+
+
+def evaluate(text: str, **series) -> ColumnarSeries:
+    data = {sid: ColumnarSeries(sid, np.asarray(dates, dtype='datetime64[D]'), np.asarray(values, dtype=np.float64))
+            for sid, (dates, values) in series.items()}
+    return compile_formula(text, tuple(data)).evaluate(data)
+
+
+def value_on(result: ColumnarSeries, day: str) -> float:
+    matches = result.values[result.dates == np.datetime64(day, 'D')]
+    assert len(matches) == 1, f"no output on {day}"
+    return float(matches[0])
+
+
+class TestCompileFormula:
+    def test_compiles_referenced_series(self):
+        plan = compile_formula('=yoy(gdp) - cpi', ('GDP', 'CPI', 'UNUSED'))
+
+        assert plan.series_ids == ('GDP', 'CPI')
+
+    def test_descriptive_text_is_not_a_formula(self):
+        with pytest.raises(FormulaError, match="Unknown series 'Level'"):
+            compile_formula('Level', ('GDP',))
+
+    def test_cached_failure_raises_a_fresh_exception(self):
+        raised = []
+        for _ in range(3):
+            try:
+                compile_formula('3-month average', ('GDP',))
+            except FormulaError as e:
+                raised.append(e)
+
+        assert len({id(e) for e in raised}) == 3
+        assert len({str(e) for e in raised}) == 1
+        # Each traceback only holds the frames of its own call
+        assert len(traceback.extract_tb(raised[0].__traceback__)) == len(traceback.extract_tb(raised[-1].__traceback__))
+
+
+class TestEvaluate:
+    def test_arithmetic_aligns_on_common_dates(self):
+        dates = monthly('2024-01', 4)
+        result = evaluate('(A - B) / 2', A=(dates, [10, 12, 14, 16]), B=(dates[1:], [2, 4, 6]))
+
+        assert result.date_list() == [d.item() for d in dates[1:]]
+        assert list(result.values) == [5.0, 5.0, 5.0]
+
+    def test_non_finite_outputs_are_dropped(self):
+        dates = monthly('2024-01', 3)
+        result = evaluate('A / B', A=(dates, [1, 2, 3]), B=(dates, [1, 0, 3]))
+
+        assert len(result) == 2
+
+    def test_yoy_is_a_calendar_year_on_daily_series(self):
+        dates = business_daily('2020-01-01', 600)
+        values = np.arange(600) + 100.0
+        result = evaluate('yoy(DGS10)', DGS10=(dates, values))
+
+        # 2021-03-15 is a Monday; a year earlier was a Sunday, so the Friday before is used
+        now = values[dates == np.datetime64('2021-03-15')][0]
+        year_ago = values[dates == np.datetime64('2020-03-13')][0]
+        assert value_on(result, '2021-03-15') == pytest.approx(100 * (now / year_ago - 1))
+        assert result.dates[0] == np.datetime64('2021-01-01')
+
+    def test_yoy_on_monthly_series_compares_twelve_months(self):
+        result = evaluate('yoy(CPI)', CPI=(monthly('2000-01', 24), np.arange(24) + 100.0))
+
+        assert value_on(result, '2001-01-01') == pytest.approx(12.0)
+        assert len(result) == 12
+
+    def test_numeric_windows_count_observations(self):
+        dates = business_daily('2024-01-01', 30)
+        values = np.arange(30, dtype=np.float64)
+
+        assert value_on(evaluate('yoy(X, 12)', X=(dates, values + 1)), str(dates[12])) == pytest.approx(100 * (13 / 1 - 1))
+        assert value_on(evaluate('ma(X, 20)', X=(dates, values)), str(dates[19])) == pytest.approx(9.5)
+        assert len(evaluate('ma(X, 20)', X=(dates, values))) == 11
+
+    def test_span_windows_cover_time(self):
+        dates = business_daily('2024-01-01', 60)
+        values = np.arange(60, dtype=np.float64)
+        result = evaluate('ma(X, 20D)', X=(dates, values))
+
+        # The window is the 20 business days after the one 20 business days back
+        assert result.dates[0] == dates[20]
+        assert value_on(result, str(dates[20])) == pytest.approx(values[1:21].mean())
+
+        weekly = np.datetime64('2024-01-05') + 7 * np.arange(20)
+        assert value_on(evaluate('std(W, 3W)', W=(weekly, [1, 2, 4] * 6 + [1, 2])), str(weekly[3])) == pytest.approx(np.std([2, 4, 1], ddof=1))
+
+    def test_span_shift_needs_an_observation_within_the_span(self):
+        # Monthly series with a gap over most of 2001
+        dates = np.concatenate([monthly('2000-01', 13), monthly('2001-11', 14)])
+        result = evaluate('lag(X, 1M)', X=(dates, np.arange(len(dates), dtype=np.float64)))
+
+        assert value_on(result, '2001-01-01') == 11.0
+        assert not np.any(result.dates == np.datetime64('2001-11-01'))
+        assert value_on(result, '2001-12-01') == 13.0
+
+    def test_asof_samples_the_latest_observation(self):
+        days = business_daily('2024-01-30', 5)
+        months = monthly('2024-01', 2)
+        result = evaluate('DGS10 - asof(CPI)', DGS10=(days, [4.0] * 5), CPI=(months, [3.0, 2.0]))
+
+        assert list(result.values) == [1.0, 1.0, 2.0, 2.0, 2.0]
+        assert result.date_list() == [d.item() for d in days]
+
+    def test_asof_maximum_age(self):
+        days = business_daily('2024-03-01', 3)
+        result = evaluate('DGS10 - asof(CPI, 10)', DGS10=(days, [4.0] * 3), CPI=(monthly('2024-01', 1), [3.0]))
+
+        assert len(result) == 0
+
+
+class TestLookback:
+    @pytest.mark.parametrize('text, expected', [
+        ('A - B', Lookback()),
+        ('lag(A, 3)', Lookback(observations=3)),
+        ('ma(A, 20)', Lookback(observations=19)),
+        ('ma(A, 20) - lag(B, 3)', Lookback(observations=19)),
+        ('diff(ma(A, 20), 2)', Lookback(observations=21)),
+        ('ma(A, 3M)', Lookback(days=93)),
+        ('yoy(A)', Lookback(days=2 * 366)),
+        ('asof(A, 45) - B', Lookback(observations=1, days=45)),
+        ('zscore(A)', None),
+        ('percentile(A, 12) + zscore(B)', None),
+    ])
+    def test_lookback(self, text, expected):
+        assert compile_formula(text, ('A', 'B')).lookback() == expected
+
+
+class TestValidateFormula:
+    def test_descriptions_are_not_checked(self):
+        assert validate_formula('3-month average', ('GDP',)) is None
+        assert validate_formula('MA(20)', ('SP500',)) is None
+        assert validate_formula(None, ('GDP',)) is None
+
+    def test_valid_formulas(self):
+        assert validate_formula('=yoy(CPIAUCSL) - yoy(PCEPI)', ('CPIAUCSL', 'PCEPI')) is None
+        assert validate_formula('zscore(DGS10, 1Y)', ('DGS10',)) is None
+
+    @pytest.mark.parametrize('text, message', [
+        ('=yoy(CPI) - yoy(PCE)', "Unknown series 'PCE'"),
+        ('=ma(CPI)', 'needs a window'),
+        ('=ma(CPI, 0D)', 'at least one day'),
+        ('=ma(CPI, 2.5)', 'positive whole number'),
+        ('=abs(CPI, 2)', 'exactly one argument'),
+        ('=CPI +', 'ends unexpectedly'),
+    ])
+    def test_invalid_formulas(self, text, message):
+        assert message in validate_formula(text, ('CPI',))
+
+    def test_span_token_is_a_window_only_in_window_position(self):
+        plan = compile_formula('=lag(CPI, 1Y) - 1Y', ('CPI', '1Y'))
+
+        assert plan.series_ids == ('CPI', '1Y')
@@ -0,0 +1,113 @@
+"""Release-frequency planning: frequency inference and FreshnessPlanner decisions"""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from core.freshness import (
+    AWAITING_RELEASE, FORCE_REFRESH, LAST_RUN_FAILED, MAX_AGE_EXCEEDED, NEVER_FETCHED, RECENTLY_CHECKED,
+    RELEASE_DUE, UNKNOWN_FREQUENCY_RECENT, UNKNOWN_FREQUENCY_STALE, FreshnessPlanner, infer_frequency,
+    parse_last_updated
+)
+
+
+def spaced(start: date, days: int, count: int):
+    return [start + timedelta(days=days * i) for i in range(count)]
+
+
+def indicator(last_run: datetime, status: str = 'OK', last_success: datetime = None):
+    return {'etlStatus': status, 'lastEtlRunAt': last_run, 'lastSuccessfulAt': last_success or last_run}
+
+
+class TestInferFrequency:
+    @pytest.mark.parametrize('days, expected', [
+        (1, 'D'), (3, 'D'), (7, 'W'), (14, 'BW'), (30, 'M'), (91, 'Q'), (182, 'SA'), (365, 'A'),
+    ])
+    def test_median_spacing(self, days, expected):
+        assert infer_frequency(spaced(date(2000, 1, 3), days, 30)) == expected
+
+    def test_business_days_are_daily(self):
+        dates = [d for d in spaced(date(2024, 1, 1), 1, 60) if d.weekday() < 5]
+        assert infer_frequency(dates) == 'D'
+
+    def test_only_recent_observations_count(self):
+        # Monthly history that switched to daily publication
+        dates = spaced(date(1990, 1, 1), 30, 200) + spaced(date(2024, 1, 1), 1, 30)
+        assert infer_frequency(dates) == 'D'
+
+    def test_needs_two_distinct_dates(self):
+        assert infer_frequency([]) is None
+        assert infer_frequency([date(2024, 1, 1), date(2024, 1, 1)]) is None
+
+
+class TestParseLastUpdated:
+    def test_fred_stamp_drops_the_offset(self):
+        assert parse_last_updated('2024-04-10 07:48:02-05') == datetime(2024, 4, 10, 7, 48, 2)
+
+    @pytest.mark.parametrize('value', [None, '', 'yesterday'])
+    def test_unusable_stamps(self, value):
+        assert parse_last_updated(value) is None
+
+
+class TestFreshnessPlanner:
+    planner = FreshnessPlanner(fallback_days=7, max_age_days=90)
+    now = datetime(2026, 8, 11, 6, 0)
+
+    def test_unconditional_reasons(self):
+        recent = indicator(self.now - timedelta(days=1))
+        assert self.planner.decide(recent, [], force_refresh=True, now=self.now).reason == FORCE_REFRESH
+        assert self.planner.decide({'lastEtlRunAt': None}, [], now=self.now).reason == NEVER_FETCHED
+        assert self.planner.decide(indicator(self.now, 'ERROR'), [], now=self.now).reason == LAST_RUN_FAILED
+        assert self.planner.decide(indicator(self.now - timedelta(days=90)), [], now=self.now).reason == MAX_AGE_EXCEEDED
+
+    def test_unknown_frequency_uses_the_fallback_interval(self):
+        states = [{'frequency': 'D'}, {}]
+        recent = self.planner.decide(indicator(self.now - timedelta(days=6)), states, now=self.now)
+        stale = self.planner.decide(indicator(self.now - timedelta(days=7)), states, now=self.now)
+
+        assert (recent.due, recent.reason) == (False, UNKNOWN_FREQUENCY_RECENT)
+        assert (stale.due, stale.reason) == (True, UNKNOWN_FREQUENCY_STALE)
+
+    def test_quarterly_observation_date_is_not_the_release(self):
+        # Q2 GDP (dated 2026-04-01) was released and first stored on 2026-07-30
+        last_run = datetime(2026, 7, 30, 6, 0)
+        states = [{'frequency': 'Q', 'lastObservationDate': date(2026, 4, 1), 'changedAt': last_run}]
+
+        for day in (date(2026, 8, 11), date(2026, 9, 1), date(2026, 10, 1)):
+            decision = self.planner.decide(indicator(last_run), states, now=datetime.combine(day, datetime.min.time()))
+            assert (decision.due, decision.reason) == (False, AWAITING_RELEASE)
+            assert decision.next_due_at == last_run + timedelta(days=91)
+
+        assert self.planner.decide(indicator(last_run), states, now=datetime(2026, 10, 29, 6, 0)).due
+
+    def test_without_stamp_or_change_time_anchors_on_the_last_success(self):
+        last_success = datetime(2026, 7, 30, 6, 0)
+        states = [{'frequency': 'Q', 'lastObservationDate': date(2026, 4, 1)}]
+        decision = self.planner.decide(indicator(self.now - timedelta(days=1), last_success=last_success), states, now=self.now)
+
+        assert (decision.due, decision.next_due_at) == (False, last_success + timedelta(days=91))
+
+    def test_anchor_is_the_later_of_stamp_and_change_time(self):
+        states = [{'frequency': 'M', 'upstreamLastUpdated': '2026-07-15 07:45:00-05', 'changedAt': datetime(2026, 8, 1)}]
+        decision = self.planner.decide(indicator(datetime(2026, 8, 1)), states, now=self.now)
+
+        assert decision.next_due_at == datetime(2026, 8, 31)
+
+    def test_overdue_release_is_rechecked_at_most_daily(self):
+        states = [{'frequency': 'M', 'upstreamLastUpdated': '2026-07-01 07:45:00-05'}]
+        due_at = datetime(2026, 7, 31, 7, 45)
+
+        first = self.planner.decide(indicator(datetime(2026, 7, 20)), states, now=self.now)
+        checked = self.planner.decide(indicator(self.now - timedelta(hours=12)), states, now=self.now)
+        again = self.planner.decide(indicator(self.now - timedelta(days=1)), states, now=self.now)
+
+        assert (first.due, first.reason, first.next_due_at) == (True, RELEASE_DUE, due_at)
+        assert (checked.due, checked.reason, checked.next_due_at) == (False, RECENTLY_CHECKED, self.now + timedelta(hours=12))
+        assert (again.due, again.reason) == (True, RELEASE_DUE)
+
+    def test_shortest_series_period_decides(self):
+        changed = datetime(2026, 8, 10)
+        states = [{'frequency': 'Q', 'changedAt': changed}, {'frequency': 'D', 'changedAt': changed}]
+        decision = self.planner.decide(indicator(changed), states, now=self.now)
+
+        assert (decision.due, decision.frequency, decision.next_due_at) == (True, 'D', changed + timedelta(days=1))
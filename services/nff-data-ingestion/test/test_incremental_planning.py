@@ -0,0 +1,118 @@
+"""Incremental job planning over series watermarks shared by several indicators"""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from config import settings
+
+from .conftest import import_service
+
+END_DATE = date(2026, 10, 16)
+CHANGED_AT = datetime(2026, 10, 12, 6, 0)
+WATERMARKS = {
+    'DGS10': {
+        'lastObservationDate': date(2026, 10, 10),
+        'upstreamLastUpdated': '2026-10-11 15:16:02-05',
+        'changedAt': CHANGED_AT,
+    }
+}
+
+
+class StampFetcher:
+    publishes_last_updated = True
+
+    async def get_last_updated(self, series_id):
+        return WATERMARKS[series_id]['upstreamLastUpdated']
+
+
+class FetcherFactory:
+    def get_fetcher(self, source):
+        return StampFetcher()
+
+
+@pytest.fixture
+def watermark_service():
+    return import_service('services.series_watermark_service').SeriesWatermarkService
+
+
+@pytest.fixture
+def service(monkeypatch):
+    etl_service = import_service('services.etl_service')
+    service = etl_service.ETLService.__new__(etl_service.ETLService)
+    service.watermark_service = etl_service.SeriesWatermarkService()
+    service.data_fetcher_factory = FetcherFactory()
+
+    async def get_watermarks(source, series_ids):
+        return {sid: WATERMARKS[sid] for sid in series_ids if sid in WATERMARKS}
+
+    async def no_states(indicators):
+        return {}
+
+    fetched = []
+
+    async def fetch_indicator_data(indicator_id, **kwargs):
+        fetched.append((indicator_id, kwargs))
+        return {'status': 'OK', 'indicator_id': indicator_id}
+
+    monkeypatch.setattr(service.watermark_service, 'get_watermarks', get_watermarks)
+    monkeypatch.setattr(service, '_get_calculation_states', no_states)
+    monkeypatch.setattr(service, 'fetch_indicator_data', fetch_indicator_data)
+    service.fetched = fetched
+    return service
+
+
+def indicator(indicator_id, **fields):
+    return {'id': indicator_id, 'source': 'FRED', 'seriesIDs': 'DGS10', **fields}
+
+
+class TestWatermarkRules:
+    def test_start_is_the_oldest_watermark_minus_lookback(self, watermark_service):
+        watermarks = {'A': {'lastObservationDate': date(2026, 10, 10)}, 'B': {'lastObservationDate': date(2026, 9, 30)}}
+
+        assert watermark_service.plan_start_date(watermarks, ['A', 'B'], 30) == date(2026, 8, 31)
+        assert watermark_service.plan_start_date(watermarks, ['A', 'C'], 30) is None
+
+    def test_unchanged_needs_the_indicator_saved_since_the_change(self, watermark_service):
+        stamps = {'DGS10': WATERMARKS['DGS10']['upstreamLastUpdated']}
+
+        assert watermark_service.upstream_unchanged(WATERMARKS, ['DGS10'], stamps, CHANGED_AT)
+        assert not watermark_service.upstream_unchanged(WATERMARKS, ['DGS10'], stamps, CHANGED_AT - timedelta(seconds=1))
+        assert not watermark_service.upstream_unchanged(WATERMARKS, ['DGS10'], stamps, None)
+        assert not watermark_service.upstream_unchanged(WATERMARKS, ['DGS10'], {'DGS10': 'revised'}, CHANGED_AT)
+
+        legacy = {'DGS10': {**WATERMARKS['DGS10'], 'changedAt': None}}
+        assert not watermark_service.upstream_unchanged(legacy, ['DGS10'], stamps, CHANGED_AT)
+
+
+class TestIncrementalPlan:
+    @pytest.mark.asyncio
+    async def test_start_is_bounded_by_each_indicators_own_last_save(self, service):
+        indicators = [indicator(1), indicator(2), indicator(3)]
+        fallback_starts = {1: date(2026, 10, 13), 2: date(2026, 6, 2), 3: END_DATE - timedelta(days=30)}
+
+        plans = await service._plan_incremental_fetches(indicators, fallback_starts, END_DATE)
+
+        watermark_start = date(2026, 10, 10) - timedelta(days=settings.ETL_REVISION_LOOKBACK_DAYS)
+        # Up to date: the shared watermark's revision lookback; behind: its own gap
+        assert plans[1]['start_date'] == watermark_start
+        assert plans[2]['start_date'] == date(2026, 6, 2)
+        assert plans[3]['start_date'] == min(watermark_start, fallback_starts[3])
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('last_success, skipped', [
+        (CHANGED_AT, True),
+        (CHANGED_AT + timedelta(days=1), True),
+        # Another indicator moved the shared watermark after this one's last save
+        (CHANGED_AT - timedelta(days=3), False),
+        (None, False),
+    ])
+    async def test_unchanged_skip_only_for_indicators_saved_since_the_change(self, service, last_success, skipped):
+        plans = await service._plan_incremental_fetches(
+            [indicator(1)], {1: date(2026, 10, 9)}, END_DATE, {1: last_success}
+        )
+
+        result = await service._fetch_incremental_indicator(indicator(1), plans[1], END_DATE)
+
+        assert (result['status'] == 'SKIPPED') == skipped
+        assert len(service.fetched) == (0 if skipped else 1)
@@ -0,0 +1,274 @@
+"""Rolling calculation state: persisted format, capture/extend, and resuming against full recalculation"""
+
+import zlib
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from config import settings
+from core.calculation_engine import CalculationEngine
+from core.columnar import ColumnarSeries
+from core.rolling_state import PAYLOAD_FORMAT, Lookback, RollingState, state_key
+
+from .conftest import import_service
+
+REVISION_DAYS = settings.ETL_REVISION_LOOKBACK_DAYS
+engine = CalculationEngine()
+
+
+def business_daily(series_id: str, end: str = '2026-10-16', seed: int = 1) -> ColumnarSeries:
+    dates = pd.bdate_range('2018-01-01', end).to_numpy().astype('datetime64[D]')
+    values = 4 + np.cumsum(np.random.default_rng(seed).normal(scale=0.05, size=len(dates)))
+    return ColumnarSeries(series_id, dates, values)
+
+
+def monthly(series_id: str, end: str = '2026-09-01') -> ColumnarSeries:
+    dates = pd.date_range('2000-01-01', end, freq='MS').to_numpy().astype('datetime64[D]')
+    values = 170 * np.exp(np.cumsum(np.random.default_rng(2).normal(0.002, 0.002, size=len(dates))))
+    return ColumnarSeries(series_id, dates, values)
+
+
+def calculate(calculation: str, inputs):
+    return engine.calculate_series(calculation, inputs, 'indicator', ','.join(inputs))
+
+
+def capture(calculation: str, inputs, full_history=()) -> RollingState:
+    """The state a run saving these inputs stores, read back the way the next run loads it"""
+    output = calculate(calculation, inputs)
+    lookback = engine.lookback(calculation, tuple(inputs))
+    state = RollingState.capture(
+        state_key(calculation, ','.join(inputs)), inputs, output, lookback, REVISION_DAYS, full_history
+    )
+    return RollingState.from_bytes(state.key, state.last_output_date, state.last_output_value, state.to_bytes())
+
+
+def incremental_update(history, run_date: date):
+    """What the next incremental run sees: its save_from (last watermark less the revision lookback) and the fetch"""
+    last = min(series.slice(end_date=run_date).last_date for series in history.values())
+    save_from = last - timedelta(days=REVISION_DAYS)
+    return save_from, {sid: series.slice(save_from) for sid, series in history.items()}
+
+
+CASES = [
+    # calculation, history, last date of the previous run
+    ('20D z-score', {'DGS10': business_daily('DGS10')}, date(2026, 9, 15)),
+    ('3M moving average', {'DGS10': business_daily('DGS10')}, date(2026, 9, 15)),
+    ('=yoy(CPI)', {'CPI': monthly('CPI')}, date(2026, 6, 1)),
+    ('MA20', {'DGS10': business_daily('DGS10')}, date(2026, 9, 15)),
+    ('1Y volatility', {'DGS10': business_daily('DGS10')}, date(2026, 9, 15)),
+]
+
+
+class TestResume:
+    @pytest.mark.parametrize('calculation, history, previous_run', CASES, ids=[case[0] for case in CASES])
+    def test_resume_equals_full_recalculation(self, calculation, history, previous_run):
+        state = capture(calculation, {sid: series.slice(end_date=previous_run) for sid, series in history.items()})
+        save_from, fetched = incremental_update(history, previous_run)
+
+        inputs = state.extend(fetched, save_from)
+        resumed = calculate(calculation, inputs)
+        full = calculate(calculation, history).slice(save_from)
+
+        assert not state.revised(fetched)
+        assert state.reproduces(resumed)
+        assert np.array_equal(resumed.slice(save_from).dates, full.dates)
+        np.testing.assert_allclose(resumed.slice(save_from).values, full.values, rtol=1e-9, atol=1e-12)
+
+    def test_revised_observation_is_recalculated_from_the_state(self):
+        history = {'DGS10': business_daily('DGS10')}
+        previous_run = date(2026, 9, 15)
+        state = capture('20D z-score', {'DGS10': history['DGS10'].slice(end_date=previous_run)})
+        save_from, fetched = incremental_update(history, previous_run)
+
+        # Upstream revised an observation the state holds
+        revised_values = fetched['DGS10'].values.copy()
+        revised_values[3] += 0.25
+        fetched = {'DGS10': ColumnarSeries('DGS10', fetched['DGS10'].dates, revised_values)}
+        earlier = history['DGS10'].slice(end_date=save_from - timedelta(days=1))
+        revised_history = {'DGS10': ColumnarSeries.combine('DGS10', [earlier, fetched['DGS10']])}
+
+        resumed = calculate('20D z-score', state.extend(fetched, save_from))
+
+        assert state.revised(fetched)
+        # The resumed result legitimately moves off the recorded value; the state checks against its own tails
+        assert not state.reproduces(resumed)
+        assert state.reproduces(calculate('20D z-score', state.components))
+        np.testing.assert_allclose(
+            resumed.slice(save_from).values, calculate('20D z-score', revised_history).slice(save_from).values, rtol=1e-9
+        )
+
+    def test_changed_last_value_does_not_reproduce(self):
+        state = capture('MA20', {'DGS10': business_daily('DGS10', end='2026-09-15')})
+        drifted = RollingState(
+            state.key, state.lookback, state.components, state.held_from,
+            state.last_output_date, state.last_output_value + 1e-3, state.complete
+        )
+
+        assert not drifted.reproduces(calculate('MA20', state.components))
+
+
+class TestExtendFallbacks:
+    history = {'DGS10': business_daily('DGS10')}
+    previous_run = date(2026, 9, 15)
+
+    @pytest.fixture
+    def state(self):
+        return capture('20D z-score', {'DGS10': self.history['DGS10'].slice(end_date=self.previous_run)})
+
+    def test_gap_after_the_tail(self, state):
+        # Runs were missed: the update starts after everything the state holds
+        resume_from = self.previous_run + timedelta(days=10)
+        assert state.extend({'DGS10': self.history['DGS10'].slice(resume_from)}, resume_from) is None
+
+    def test_resume_before_what_the_tail_covers(self, state):
+        resume_from = state.held_from + timedelta(days=5)
+        assert state.extend({'DGS10': self.history['DGS10'].slice(resume_from)}, resume_from) is None
+
+    def test_fetch_reaching_before_the_tail(self, state):
+        save_from, fetched = incremental_update(self.history, self.previous_run)
+        fetched = {'DGS10': self.history['DGS10'].slice(state.held_from - timedelta(days=7))}
+        assert state.extend(fetched, save_from) is None
+
+    def test_series_the_state_does_not_hold(self, state):
+        save_from, fetched = incremental_update(self.history, self.previous_run)
+        fetched['DGS2'] = business_daily('DGS2', seed=5).slice(save_from)
+        assert state.extend(fetched, save_from) is None
+
+    def test_series_without_new_observations_keeps_its_tail(self, state):
+        save_from, _ = incremental_update(self.history, self.previous_run)
+        merged = state.extend({}, save_from)
+        assert np.array_equal(merged['DGS10'].values, state.components['DGS10'].values)
+
+
+class TestCapture:
+    def test_tail_covers_lookback_and_revision_window(self):
+        series = business_daily('DGS10', end='2026-09-15')
+        output = calculate('MA20', {'DGS10': series})
+        state = RollingState.capture('key', {'DGS10': series}, output, Lookback(observations=19), REVISION_DAYS)
+
+        resume_from = series.last_date - timedelta(days=REVISION_DAYS)
+        before = state.components['DGS10'].slice(end_date=resume_from - timedelta(days=1))
+        assert len(before) >= 19
+        assert state.held_from < resume_from and not state.complete
+        assert (state.last_output_date, state.last_output_value) == (output.last_date, output.values[-1])
+
+    def test_short_full_history_is_complete(self):
+        series = monthly('CPI').slice(date(2025, 1, 1))
+        output = calculate('=yoy(CPI)', {'CPI': series})
+        state = RollingState.capture('key', {'CPI': series}, output, Lookback(days=732), REVISION_DAYS, {'CPI'})
+
+        assert state.complete == frozenset({'CPI'})
+        assert state.held_from == series.first_date
+
+    def test_nothing_to_capture(self):
+        series = business_daily('DGS10', end='2026-09-15')
+        assert RollingState.capture('key', {'DGS10': series}, ColumnarSeries.empty('x'), Lookback(), REVISION_DAYS) is None
+        assert RollingState.capture('key', {}, series, Lookback(), REVISION_DAYS) is None
+
+
+class TestPayload:
+    def test_round_trip(self):
+        inputs = {'DGS10': business_daily('DGS10', end='2026-09-15'), 'DGS2': business_daily('DGS2', end='2026-09-15', seed=3)}
+        inputs['DGS2'].values[-4] = np.nan
+        output = calculate('=DGS10 - DGS2', inputs)
+        state = RollingState.capture('key', inputs, output, Lookback(5, 40), REVISION_DAYS, {'DGS2'})
+
+        restored = RollingState.from_bytes(state.key, state.last_output_date, state.last_output_value, state.to_bytes())
+
+        assert (restored.lookback, restored.held_from, restored.complete) == (state.lookback, state.held_from, state.complete)
+        for series_id, series in state.components.items():
+            assert np.array_equal(restored.components[series_id].dates, series.dates)
+            assert np.array_equal(restored.components[series_id].values, series.values, equal_nan=True)
+
+    def test_older_format_is_not_resumed(self):
+        assert RollingState.from_bytes('key', date(2026, 1, 1), 1.0, zlib.compress(b'{"lookback": [0, 0]}')) is None
+        assert zlib.decompress(capture('MA20', {'DGS10': business_daily('DGS10', end='2026-09-15')}).to_bytes()).startswith(PAYLOAD_FORMAT)
+
+    def test_key_follows_calculation_and_series(self):
+        assert state_key('MA20', 'DGS10') == state_key('MA20', 'DGS10')
+        assert state_key('MA20', 'DGS10') != state_key('20D z-score', 'DGS10')
+        assert state_key('MA20', 'DGS10') != state_key('MA20', 'DGS2')
+
+
+class MemoryStates:
+    """CalculationStateService keeping payloads in memory"""
+
+    def __init__(self):
+        self.rows = {}
+
+    async def put(self, indicator_id, state):
+        self.rows[indicator_id] = (state.key, state.last_output_date, state.last_output_value, state.to_bytes())
+
+    async def get_states(self, indicator_ids):
+        return {i: RollingState.from_bytes(*self.rows[i]) for i in indicator_ids if i in self.rows}
+
+
+@pytest.fixture
+def service():
+    etl_service = import_service('services.etl_service')
+    service = etl_service.ETLService.__new__(etl_service.ETLService)
+    service.calculation_states = MemoryStates()
+    return service
+
+
+class TestETLResume:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('calculation, history, previous_run', CASES, ids=[case[0] for case in CASES])
+    async def test_stored_state_resumes_to_the_full_result(self, service, calculation, history, previous_run):
+        indicator = {'id': 7, 'calculation': calculation, 'seriesIDs': ','.join(history)}
+        before = {sid: series.slice(end_date=previous_run) for sid, series in history.items()}
+        await service._store_calculation_state(7, indicator, before, calculate(calculation, before), set(before))
+
+        state = (await service._get_calculation_states([indicator]))[7]
+        save_from, fetched = incremental_update(history, previous_run)
+        inputs, series = await service._resume_calculation(state, fetched, indicator, save_from)
+
+        full = calculate(calculation, history).slice(save_from)
+        np.testing.assert_allclose(series.slice(save_from).values, full.values, rtol=1e-9, atol=1e-12)
+
+        # The run stores the extended state; the following run resumes from it as well
+        await service._store_calculation_state(7, indicator, inputs, series, set(state.complete))
+        assert (await service._get_calculation_states([indicator]))[7].last_output_date == history[indicator['seriesIDs']].last_date
+
+    @pytest.mark.asyncio
+    async def test_changed_calculation_ignores_the_stored_state(self, service):
+        inputs = {'DGS10': business_daily('DGS10', end='2026-09-15')}
+        indicator = {'id': 7, 'calculation': 'MA20', 'seriesIDs': 'DGS10'}
+        await service._store_calculation_state(7, indicator, inputs, calculate('MA20', inputs), set())
+
+        assert await service._get_calculation_states([{**indicator, 'calculation': '20D z-score'}]) == {}
+
+    @pytest.mark.asyncio
+    async def test_gap_falls_back_to_full_history(self, service):
+        history = {'DGS10': business_daily('DGS10')}
+        indicator = {'id': 7, 'calculation': '20D z-score', 'seriesIDs': 'DGS10'}
+        before = {'DGS10': history['DGS10'].slice(end_date=date(2026, 8, 14))}
+        await service._store_calculation_state(7, indicator, before, calculate('20D z-score', before), set())
+
+        state = (await service._get_calculation_states([indicator]))[7]
+        save_from = date(2026, 9, 15)
+        assert await service._resume_calculation(state, {'DGS10': history['DGS10'].slice(save_from)}, indicator, save_from) is None
+
+    @pytest.mark.asyncio
+    async def test_revision_is_checked_against_the_state(self, service, monkeypatch):
+        history = {'DGS10': business_daily('DGS10')}
+        indicator = {'id': 7, 'calculation': '20D z-score', 'seriesIDs': 'DGS10'}
+        before = {'DGS10': history['DGS10'].slice(end_date=date(2026, 9, 15))}
+        await service._store_calculation_state(7, indicator, before, calculate('20D z-score', before), set())
+        state = (await service._get_calculation_states([indicator]))[7]
+
+        save_from, fetched = incremental_update(history, date(2026, 9, 15))
+        values = fetched['DGS10'].values.copy()
+        values[0] -= 0.5
+        fetched = {'DGS10': ColumnarSeries('DGS10', fetched['DGS10'].dates, values)}
+
+        assert await service._resume_calculation(state, fetched, indicator, save_from) is not None
+
+        # A state that no longer reproduces its own last value is not trusted
+        stale = RollingState(
+            state.key, state.lookback, state.components, state.held_from,
+            state.last_output_date, state.last_output_value + 1.0, state.complete
+        )
+        assert await service._resume_calculation(stale, fetched, indicator, save_from) is None
@@ -0,0 +1,114 @@
+"""JobSeriesStore: one upstream fetch per series and job, upstream cache use and call accounting"""
+
+from datetime import date
+
+import numpy as np
+import pytest
+
+from core.columnar import ColumnarSeries
+from core.data_fetcher import BaseDataFetcher
+from core.series_store import JobSeriesStore
+
+START, END = date(2026, 1, 1), date(2026, 1, 31)
+
+
+def series(series_id: str) -> ColumnarSeries:
+    dates = np.datetime64('2026-01-01') + np.arange(5)
+    return ColumnarSeries(series_id, dates, np.arange(5, dtype=np.float64))
+
+
+class StampedFetcher(BaseDataFetcher):
+    """Upstream that publishes revision stamps and counts the calls it receives"""
+    publishes_last_updated = True
+
+    def __init__(self):
+        self.downloads = []
+        self.stamp_calls = []
+
+    async def fetch_columns(self, series_id, start_date=None, end_date=None):
+        self.downloads.append(series_id)
+        return {sid: series(sid) for sid in series_id.split('|')}
+
+    async def get_last_updated(self, series_id):
+        self.stamp_calls.append(series_id)
+        return '2026-02-01 07:45:00-06'
+
+
+class MemoryCache:
+    def __init__(self, entries=None):
+        self.entries = dict(entries or {})
+        self.lookups = 0
+
+    async def get(self, source, series_id, start_date, end_date, upstream_last_updated):
+        self.lookups += 1
+        return self.entries.get((source, series_id, upstream_last_updated))
+
+    async def put(self, source, series_id, start_date, end_date, upstream_last_updated, data):
+        self.entries[(source, series_id, upstream_last_updated)] = data
+        return True
+
+
+async def consume(store, fetcher, series_id, check_stamp=True):
+    """What ETLService does per indicator series: the revision stamp (recorded on the watermark), then the data"""
+    if check_stamp:
+        await store.get_last_updated(fetcher, 'fred', series_id)
+    return await store.fetch(fetcher, 'fred', series_id, START, END)
+
+
+@pytest.mark.asyncio
+async def test_shared_series_is_fetched_once():
+    fetcher = StampedFetcher()
+    store = JobSeriesStore()
+    store.require('fred', ['DGS10'], START, END)
+    store.require('fred', ['DGS10'], START, END)
+
+    first = await consume(store, fetcher, 'DGS10')
+    second = await consume(store, fetcher, 'DGS10')
+
+    assert np.array_equal(first.values, second.values)
+    assert (fetcher.downloads, fetcher.stamp_calls) == (['DGS10'], ['DGS10'])
+    summary = store.summary()
+    assert (summary['upstream_calls_spent'], summary['upstream_calls_saved']) == (2, 2)
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_reuses_the_jobs_stamp():
+    fetcher = StampedFetcher()
+    cache = MemoryCache({('fred', 'DGS10', '2026-02-01 07:45:00-06'): series('DGS10')})
+    store = JobSeriesStore(cache)
+    store.require('fred', ['DGS10'], START, END)
+
+    await consume(store, fetcher, 'DGS10')
+
+    assert (fetcher.downloads, fetcher.stamp_calls) == ([], ['DGS10'])
+    summary = store.summary()
+    assert (summary['cache_lookups'], summary['cache_hits']) == (1, 1)
+    assert (summary['upstream_calls_spent'], summary['upstream_calls_saved']) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_cache_miss_counts_the_stamp_as_spent():
+    fetcher = StampedFetcher()
+    cache = MemoryCache()
+    store = JobSeriesStore(cache)
+    store.require('fred', ['DGS10'], START, END)
+
+    await consume(store, fetcher, 'DGS10')
+
+    assert fetcher.downloads == ['DGS10']
+    assert ('fred', 'DGS10', '2026-02-01 07:45:00-06') in cache.entries
+    summary = store.summary()
+    assert (summary['upstream_calls_spent'], summary['upstream_calls_saved']) == (2, 0)
+
+
+@pytest.mark.asyncio
+async def test_cache_is_not_worth_a_stamp_of_its_own():
+    fetcher = StampedFetcher()
+    cache = MemoryCache({('fred', 'DGS10', '2026-02-01 07:45:00-06'): series('DGS10')})
+    store = JobSeriesStore(cache)
+    store.require('fred', ['DGS10'], START, END)
+
+    await consume(store, fetcher, 'DGS10', check_stamp=False)
+
+    assert (fetcher.downloads, fetcher.stamp_calls, cache.lookups) == (['DGS10'], [], 0)
+    assert store.summary()['upstream_calls_spent'] == 1
@@ -0,0 +1,99 @@
+"""TradingEconomics batched fetching and parsing against recorded historical responses"""
+
+import json
+import os
+from datetime import date
+from urllib.parse import urlparse
+
+import httpx
+import numpy as np
+import pytest
+
+from config import settings
+from core.data_fetcher import TradingEconomicsDataFetcher, parse_te_historical
+
+from .conftest import FIXTURES_DIR
+
+TE_FIXTURES = os.path.join(FIXTURES_DIR, 'tradingeconomics')
+
+
+def recorded_rows():
+    rows = []
+    for name in sorted(os.listdir(TE_FIXTURES)):
+        with open(os.path.join(TE_FIXTURES, name)) as f:
+            rows.extend(json.load(f))
+    return rows
+
+
+class TestParseTeHistorical:
+    def test_splits_rows_into_one_series_per_symbol(self):
+        series_data = parse_te_historical(recorded_rows())
+
+        assert set(series_data) == {'USURTOT', 'USGG10YR:IND', 'GDBR10:IND'}
+        for series in series_data.values():
+            assert series.dates.dtype == np.dtype('datetime64[D]')
+            assert series.values.dtype == np.float64
+
+    def test_sorts_dates_and_drops_missing_values(self):
+        series_data = parse_te_historical(recorded_rows())
+
+        assert series_data['GDBR10:IND'].date_list() == [
+            date(2024, 3, 25), date(2024, 3, 26), date(2024, 3, 27), date(2024, 3, 28)
+        ]
+        assert series_data['GDBR10:IND'].values.tolist() == [2.375, 2.348, 2.301, 2.297]
+        # March's unemployment rate was not published yet (Value null)
+        assert series_data['USURTOT'].last_date == date(2024, 2, 29)
+
+    def test_empty_response(self):
+        assert parse_te_historical([]) == {}
+
+
+class TestTradingEconomicsDataFetcher:
+    @pytest.fixture
+    def online_fetcher(self, monkeypatch):
+        """A fetcher whose HTTP requests are answered from the recorded responses"""
+        monkeypatch.setattr(settings, 'TE_BASE_URL', 'https://te.example')
+        monkeypatch.setattr(settings, 'TE_BATCH_MAX_SYMBOLS', 2)
+        fetcher = TradingEconomicsDataFetcher()
+        fetcher.requested_urls = []
+
+        async def get(url, **kwargs):
+            fetcher.requested_urls.append(url)
+            # TE matches symbols case-insensitively
+            symbols = urlparse(url).path.split('/')[3].upper().split(',')
+            rows = [row for row in recorded_rows() if row['HistoricalDataSymbol'] in symbols]
+            return httpx.Response(200, content=json.dumps(rows).encode(), request=httpx.Request('GET', url))
+
+        monkeypatch.setattr(fetcher, '_get', get)
+        return fetcher
+
+    @pytest.mark.asyncio
+    async def test_groups_symbols_into_comma_separated_requests(self, online_fetcher):
+        series_data = await online_fetcher.fetch_columns(
+            'USURTOT|USGG10YR:IND|GDBR10:IND', date(2023, 10, 1), date(2024, 3, 31)
+        )
+
+        assert sorted(online_fetcher.requested_urls) == [
+            'https://te.example/historical/ticker/GDBR10:IND/2023-10-01/2024-03-31',
+            'https://te.example/historical/ticker/USURTOT,USGG10YR:IND/2023-10-01/2024-03-31',
+        ]
+        assert set(series_data) == {'USURTOT', 'USGG10YR:IND', 'GDBR10:IND'}
+        assert len(series_data['USURTOT']) == 5
+
+    @pytest.mark.asyncio
+    async def test_series_keep_requested_ids_and_date_range(self, online_fetcher):
+        series_data = await online_fetcher.fetch_columns('usgg10yr:ind', date(2024, 3, 26), date(2024, 3, 27))
+
+        series = series_data['usgg10yr:ind']
+        assert series.series_id == 'usgg10yr:ind'
+        assert series.values.tolist() == [4.2315, 4.1955]
+
+    @pytest.mark.asyncio
+    async def test_offline_fixture_directory(self, monkeypatch):
+        monkeypatch.setattr(settings, 'TE_BASE_URL', TE_FIXTURES)
+        fetcher = TradingEconomicsDataFetcher()
+
+        series_data = await fetcher.fetch_columns('GDBR10:IND|USURTOT|UNKNOWN', date(2024, 1, 1), date(2024, 12, 31))
+
+        assert set(series_data) == {'GDBR10:IND', 'USURTOT'}
+        assert series_data['USURTOT'].values.tolist() == [3.7, 3.9]
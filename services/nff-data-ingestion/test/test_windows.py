@@ -0,0 +1,164 @@
+"""Calendar-aware rolling windows: parsing, window bounds, as-of shifts and RollingWindow statistics"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.windows import RollingWindow, WindowSpec, parse_window, shift_span
+
+
+def business_days(start: str, count: int) -> np.ndarray:
+    return pd.bdate_range(start, periods=count).to_numpy().astype('datetime64[D]')
+
+
+def month_ends(start: str, count: int) -> np.ndarray:
+    return pd.date_range(start, periods=count, freq='ME').to_numpy().astype('datetime64[D]')
+
+
+def brute_force(dates: np.ndarray, values: np.ndarray, spec: WindowSpec, business: bool):
+    """Mean and std over each (lower, date] window, one window at a time"""
+    lower = spec.lower_bounds(dates, business) if spec.unit else None
+    means, stds = [], []
+    for i in range(len(dates)):
+        inside = (dates > lower[i]) & (dates <= dates[i]) if spec.unit else np.arange(len(dates)) > i - spec.count
+        window = values[inside & (np.arange(len(dates)) <= i)]
+        window = window[~np.isnan(window)]
+        means.append(window.mean() if len(window) else np.nan)
+        stds.append(window.std(ddof=1) if len(window) > 1 else np.nan)
+    return np.array(means), np.array(stds)
+
+
+class TestParseWindow:
+    @pytest.mark.parametrize('calculation, expected', [
+        ('20D z-score', WindowSpec(20, 'D')),
+        ('3-month average', WindowSpec(3, 'M')),
+        ('rolling 12m vol', WindowSpec(12, 'M')),
+        ('z-score (60D)', WindowSpec(60, 'D')),
+        ('1 year rolling volatility', WindowSpec(1, 'Y')),
+        ('T10Y2Y 20D', WindowSpec(20, 'D')),
+    ])
+    def test_window_tokens(self, calculation, expected):
+        assert parse_window(calculation) == expected
+
+    @pytest.mark.parametrize('calculation, expected', [
+        ('10Y treasury 20D', WindowSpec(20, 'D')),
+        ('10Y Treasury 20D z-score', WindowSpec(20, 'D')),
+        ('1Y volatility of 10Y yield', WindowSpec(1, 'Y')),
+        ('3M MA of 10Y', WindowSpec(3, 'M')),
+        ('2Y-10Y spread 1Y z-score', WindowSpec(1, 'Y')),
+        ('30-year mortgage rate 3-month average', WindowSpec(3, 'M')),
+        ('10Y yield 1Y change', WindowSpec(1, 'Y')),
+    ])
+    def test_maturities_are_not_windows(self, calculation, expected):
+        assert parse_window(calculation) == expected
+
+    @pytest.mark.parametrize('calculation', ['MA20', '10Y treasury MA', '2Y-10Y spread', '10 year note', 'level'])
+    def test_no_window(self, calculation):
+        assert parse_window(calculation) is None
+
+
+class TestWindowSpec:
+    def test_observation_windows(self):
+        dates = business_days('2026-01-05', 6)
+        spec = WindowSpec(3)
+
+        assert spec.starts(dates).tolist() == [0, 0, 0, 1, 2, 3]
+        assert spec.covered(dates).tolist() == [False, False, True, True, True, True]
+
+    def test_business_days_skip_weekends(self):
+        # Mon 2026-01-05 .. Fri 2026-01-16: "5D" is the trading week ending at each date
+        dates = business_days('2026-01-05', 10)
+        spec = WindowSpec(5, 'D')
+
+        assert spec.starts(dates, business_days=True).tolist() == [0, 0, 0, 0, 0, 1, 2, 3, 4, 5]
+        assert spec.covered(dates, business_days=True).tolist() == [False] * 5 + [True] * 5
+        # Calendar days: the 7 days after Friday hold only the next week's five sessions
+        assert spec.starts(dates).tolist()[5:] == [3, 4, 5, 5, 5]
+
+    def test_month_windows_clamp_to_shorter_months(self):
+        dates = np.array(['2024-03-30', '2024-03-31', '2024-04-30', '2024-05-15'], dtype='datetime64[D]')
+
+        assert WindowSpec(1, 'M').lower_bounds(dates).astype(str).tolist() == [
+            '2024-02-29', '2024-02-29', '2024-03-31', '2024-04-15'
+        ]
+        assert WindowSpec(1, 'Y').lower_bounds(np.array(['2024-02-29'], dtype='datetime64[D]')).tolist() == [
+            np.datetime64('2023-02-28')
+        ]
+
+    def test_span_window_on_monthly_data(self):
+        dates = month_ends('2024-01-31', 6)
+        spec = WindowSpec(3, 'M')
+
+        assert spec.starts(dates).tolist() == [0, 0, 0, 1, 2, 3]
+        assert spec.covered(dates).tolist() == [False, False, False, True, True, True]
+
+
+class TestShiftSpan:
+    def test_year_ago_on_monthly_and_daily_series(self):
+        # Month ends match month ends: February 2025 finds February 2024 (the 29th)
+        monthly = month_ends('2024-01-31', 14)
+        shifted = shift_span(monthly, np.arange(14.0), WindowSpec(1, 'Y'))
+        assert np.isnan(shifted[:12]).all() and shifted[12:].tolist() == [0.0, 1.0]
+
+        daily = business_days('2024-01-01', 300)
+        shifted = shift_span(daily, np.arange(300.0), WindowSpec(1, 'Y'))
+        # 2025-01-01 finds 2024-01-01 (the first value); Monday 2025-01-06 finds Friday 2024-01-05
+        assert shifted[daily.tolist().index(np.datetime64('2025-01-01'))] == 0.0
+        assert shifted[daily.tolist().index(np.datetime64('2025-01-06'))] == 4.0
+
+    def test_gap_longer_than_the_span_has_no_match(self):
+        dates = np.array(['2022-01-31', '2024-01-31', '2025-01-31'], dtype='datetime64[D]')
+        shifted = shift_span(dates, np.array([1.0, 2.0, 3.0]), WindowSpec(1, 'Y'))
+
+        assert np.isnan(shifted[:2]).all() and shifted[2] == 2.0
+
+    def test_matrix_rows_shift_together(self):
+        dates = month_ends('2024-01-31', 13)
+        matrix = np.vstack([np.arange(13.0), -np.arange(13.0)])
+
+        assert shift_span(dates, matrix, WindowSpec(1, 'Y'))[:, -1].tolist() == [0.0, 0.0]
+
+
+class TestRollingWindow:
+    @pytest.mark.parametrize('spec', [WindowSpec(20, 'D'), WindowSpec(12, 'W'), WindowSpec(3, 'M'), WindowSpec(20)])
+    def test_matches_window_by_window_statistics(self, spec):
+        rng = np.random.default_rng(7)
+        dates = business_days('2023-01-02', 400)
+        values = 1000 + np.cumsum(rng.normal(size=400))
+        values[rng.random(400) < 0.05] = np.nan
+
+        window = RollingWindow(dates, values, spec)
+        mean, std = brute_force(dates, values, spec, business=window.frequency == 'D')
+
+        assert window.frequency == 'D'
+        np.testing.assert_allclose(window.mean(), mean, rtol=1e-10)
+        np.testing.assert_allclose(window.std(), std, rtol=1e-7)
+        np.testing.assert_allclose(window.zscore(), (values - mean) / np.where(std == 0, 1.0, std), rtol=1e-6, atol=1e-9)
+
+    def test_flat_window_has_zero_std_and_zscore(self):
+        dates = business_days('2026-01-05', 30)
+        values = np.full(30, 4.25e6)
+        window = RollingWindow(dates, values, WindowSpec(10, 'D'))
+
+        assert (window.std()[1:] == 0).all()
+        assert (window.zscore()[1:] == 0).all()
+
+    def test_min_periods_and_missing_values(self):
+        dates = business_days('2026-01-05', 6)
+        values = np.array([1.0, np.nan, np.nan, 4.0, 5.0, 6.0])
+        window = RollingWindow(dates, values, WindowSpec(3), min_periods=2)
+
+        assert window.count.tolist() == [1, 1, 1, 1, 2, 3]
+        assert np.isnan(window.mean()[:4]).all() and window.mean()[4:].tolist() == [4.5, 5.0]
+        assert np.isnan(window.std()[:4]).all()
+
+    def test_matrix_rows_match_single_series(self):
+        rng = np.random.default_rng(3)
+        dates = month_ends('2010-01-31', 120)
+        matrix = rng.normal(size=(3, 120)) * [[1.0], [100.0], [1e-3]]
+        combined = RollingWindow(dates, matrix, WindowSpec(1, 'Y'))
+
+        for row in range(3):
+            single = RollingWindow(dates, matrix[row], WindowSpec(1, 'Y'))
+            np.testing.assert_allclose(combined.mean()[row], single.mean(), rtol=1e-12)
+            np.testing.assert_allclose(combined.zscore()[row], single.zscore(), rtol=1e-9)